@@ -1,604 +1,4136 @@
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import time
+
+# Seconds spent in each startup phase, see startup_summary()
+STARTUP_TIMINGS = {}
+_startup_mark = time.perf_counter()
+
 import asyncio
+import importlib.util
 import nest_asyncio
-import streamlit as st
-import psutil, signal
-import shutil
+import signal
 import sys
 
-# eportLab Imports
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+# Playwright is imported when a browser is first launched (see
+# playwright_errors), NumPy by the player table and analytics, ReportLab by
+# render_pdf and Streamlit by main()
 
 # Other Imports
-from collections import defaultdict
+from collections import defaultdict, deque
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import dataclasses
+import gzip
+import hashlib
+from dataclasses import dataclass, field
 from datetime import datetime
+import json
+import multiprocessing
 import os
-import platform
+import queue
+import random
 import re
-import requests
+import sqlite3
 import subprocess
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+import uuid
+from xml.sax.saxutils import escape
+
+
+
+def lazy_import(name: str):
+    """Return a module that is only loaded on first attribute access."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+psutil = lazy_import("psutil")
+
+
+class PlaywrightErrors:
+    """
+    Playwright's public exception classes, imported on first use: loading
+    playwright.async_api is most of the script's import time. An `except`
+    clause only evaluates its class when an exception reaches it.
+    """
+
+    @property
+    def Error(self):
+        from playwright.async_api import Error
+        return Error
+
+    @property
+    def TimeoutError(self):
+        from playwright.async_api import TimeoutError
+        return TimeoutError
+
+
+playwright_errors = PlaywrightErrors()
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Whether an exception is asyncio's or Playwright's timeout."""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    # Nothing can have raised Playwright's before it was loaded
+    return "playwright.async_api" in sys.modules and isinstance(error, playwright_errors.TimeoutError)
+
+
+def __getattr__(name: str):
+    # Module attributes for callers that name the classes directly
+    if name == "PlaywrightError":
+        return playwright_errors.Error
+    if name == "PlaywrightTimeoutError":
+        return playwright_errors.TimeoutError
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def startup_phase(name: str, started: float):
+    STARTUP_TIMINGS[name] = time.perf_counter() - started
+
+
+def startup_summary() -> str:
+    return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in STARTUP_TIMINGS.items())
+
+
+startup_phase("imports", _startup_mark)
+_startup_mark = time.perf_counter()
 
 # Apply nested asyncio
 nest_asyncio.apply()
 
-from playwright.async_api import async_playwright
+# Fix for Windows + Playwright async subprocesses
+if sys.platform.startswith("win"):
+    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+
+# --- Browser install ---
+# Set once Chromium is known to be installed. It lives in the environment
+# because Streamlit re-executes this script with fresh globals on every
+# interaction, and shard worker processes inherit it.
+CHROMIUM_CHECKED_ENV = "TOURNAMENT_ANALYZER_CHROMIUM_OK"
+_chromium_lock = threading.Lock()
+
+
+def playwright_browsers_path() -> str:
+    """Where Playwright keeps its browsers, honouring PLAYWRIGHT_BROWSERS_PATH as Playwright does."""
+    configured = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if configured == "0":
+        import playwright
+        return os.path.join(os.path.dirname(playwright.__file__), "driver", "package", ".local-browsers")
+    if configured:
+        return os.path.expanduser(configured)
+    if sys.platform.startswith("win"):
+        return os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "ms-playwright")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/ms-playwright")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "ms-playwright")
+
+
+def ensure_chromium():
+    """Install Playwright's Chromium if it is missing; checked once per process, before the first launch."""
+    if os.environ.get(CHROMIUM_CHECKED_ENV):
+        return
+    with _chromium_lock:
+        if os.environ.get(CHROMIUM_CHECKED_ENV):
+            return
+        started = time.perf_counter()
+        path = playwright_browsers_path()
+        if not (os.path.isdir(path) and any(name.startswith("chromium") for name in os.listdir(path))):
+            print(f"Chromium not found in {path}; installing it")
+            result = subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=False)
+            if result.returncode != 0:
+                # Left unset so the next launch tries the install again
+                print(f"Installing Chromium failed (exit code {result.returncode})")
+                startup_phase("browser check", started)
+                return
+        os.environ[CHROMIUM_CHECKED_ENV] = "1"
+        startup_phase("browser check", started)
+
+
+# --- Sites ---
+# Overridable so the benchmarks can point the scraper at a local fixture server
+USTA_BASE_URL = os.environ.get("USTA_BASE_URL", "https://playtennis.usta.com").rstrip("/")
+RECRUITING_BASE_URL = os.environ.get("RECRUITING_BASE_URL", "https://www.tennisrecruiting.net").rstrip("/")
+
+
+def usta_url(link: str) -> str:
+    """Absolute URL for a USTA link that may be site-relative."""
+    if link and link.startswith("/"):
+        return USTA_BASE_URL + link
+    return link
+
+
+# --- Output ---
+REPORT_DIR = os.environ.get("TOURNAMENT_REPORT_DIR", os.path.join(os.path.expanduser("~"), "Downloads"))
+
+
+# --- Browser pool configuration ---
+BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", "3"))
+BROWSER_CONTEXT_MAX_USES = int(os.environ.get("BROWSER_CONTEXT_MAX_USES", "20"))
+BROWSER_HEALTH_TIMEOUT = 5
+
+BROWSER_LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-infobars",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--single-process",
+    "--disable-software-rasterizer",
+    "--window-size=1920,1080",
+    "--start-maximized",
+    "--ignore-certificate-errors",
+    "--disable-extensions",
+]
+
+BROWSER_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/115.0.0.0 Safari/537.36"
+    ),
+    "java_script_enabled": True,
+    "device_scale_factor": 1,
+    "is_mobile": False,
+    "has_touch": False,
+}
+
+# Hide Playwrightautomation fingerprints
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['en-US','en']});
+    window.chrome = { runtime: {} };
+"""
+
+
+# --- Request routing ---
+BROWSER_ROUTE_PROFILE = os.environ.get("BROWSER_ROUTE_PROFILE", "profile_text")
+
+# Third-party hosts that never carry data we read
+ROUTE_TRACKER_PATTERNS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "adservice.google", "amazon-adsystem.com", "facebook.net",
+    "connect.facebook.com", "hotjar.com", "quantserve.com", "scorecardresearch.com",
+    "nr-data.net", "newrelic.com", "optimizely.com", "segment.io", "segment.com",
+    "clarity.ms", "bing.com/bat", "youtube.com", "vimeo.com",
+]
+
+# Each profile lists resource types to abort, and whether tracker scripts are
+# stubbed (answered with an empty body so page JS that awaits them still runs)
+ROUTE_PROFILES = {
+    "full": {
+        "abort_types": set(),
+        "stub_trackers": False,
+        "first_party_scripts_only": False,
+    },
+    # USTA pages: we only read text nodes; stylesheets stay because the
+    # Vaadin grids lay out rows from CSS
+    "profile_text": {
+        "abort_types": {"image", "media", "font", "texttrack", "manifest"},
+        "stub_trackers": True,
+        "first_party_scripts_only": False,
+    },
+    # tennisrecruiting.net search: we only need the rating <img src>, which is
+    # in the DOM whether or not the image is downloaded
+    "rating_image_src": {
+        "abort_types": {"image", "media", "font", "texttrack", "manifest"},
+        "stub_trackers": True,
+        "first_party_scripts_only": True,
+    },
+}
+
+# Rough transfer sizes used to estimate bytes saved by aborted requests. A
+# blocked request never gets a response, so there is no Content-Length to count
+ROUTE_ESTIMATED_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 35_000,
+    "script": 60_000,
+    "stylesheet": 20_000,
+    "texttrack": 5_000,
+    "manifest": 2_000,
+}
+ROUTE_DEFAULT_ESTIMATED_BYTES = 5_000
+
+
+def _registrable_host(url: str) -> str:
+    host = urlsplit(url).hostname or ""
+    return ".".join(host.split(".")[-2:])
+
+
+def route_action(profile: str, resource_type: str, url: str, page_url: str = "") -> str:
+    """Decide what to do with a request: "continue", "abort" or "stub"."""
+    rules = ROUTE_PROFILES.get(profile, ROUTE_PROFILES["full"])
+    if resource_type in rules["abort_types"]:
+        return "abort"
+    if rules["stub_trackers"] and any(pattern in url for pattern in ROUTE_TRACKER_PATTERNS):
+        return "stub" if resource_type in ("script", "xhr", "fetch") else "abort"
+    if (
+        rules["first_party_scripts_only"]
+        and resource_type == "script"
+        and page_url
+        and _registrable_host(url) != _registrable_host(page_url)
+    ):
+        return "stub"
+    return "continue"
+
+
+class RouteStats:
+    """Per-run counters of requests the routing layer did not let through."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.continued = 0
+        self.aborted = 0
+        self.stubbed = 0
+        self.bytes_saved_estimate = 0
+        self.saved_by_type = defaultdict(int)
+
+    def record(self, action: str, resource_type: str):
+        if action == "continue":
+            self.continued += 1
+            return
+        if action == "abort":
+            self.aborted += 1
+        else:
+            self.stubbed += 1
+        self.saved_by_type[resource_type] += 1
+        self.bytes_saved_estimate += ROUTE_ESTIMATED_BYTES.get(resource_type, ROUTE_DEFAULT_ESTIMATED_BYTES)
+
+    def summary(self) -> str:
+        saved = self.aborted + self.stubbed
+        total = saved + self.continued
+        pct = round(100 * saved / total, 1) if total else 0.0
+        return (
+            f"{saved} of {total} requests saved ({pct}%: {self.aborted} aborted, {self.stubbed} stubbed), "
+            f"~{self.bytes_saved_estimate / 1_000_000:.1f} MB not downloaded (estimated from typical sizes per type)"
+        )
+
+
+route_stats = RouteStats()
+
+
+async def install_routing(context, page, profile: str = BROWSER_ROUTE_PROFILE):
+    """
+    Route every request of a context through the profile rules.
+
+    Attaches page.set_route_profile(name) so a leased page can switch
+    profile (e.g. from USTA text to the recruiting rating image).
+    """
+    state = {"profile": profile}
+
+    async def handle(route):
+        request = route.request
+        try:
+            page_url = page.url if not page.is_closed() else ""
+        except Exception:
+            page_url = ""
+        action = route_action(state["profile"], request.resource_type, request.url, page_url)
+        route_stats.record(action, request.resource_type)
+        try:
+            if action == "abort":
+                await route.abort("blockedbyclient")
+            elif action == "stub":
+                await route.fulfill(status=200, content_type="application/javascript", body="")
+            else:
+                await route.continue_()
+        except Exception:
+            # The page went away while the request was in flight
+            pass
+
+    def set_route_profile(name: str):
+        if name not in ROUTE_PROFILES:
+            raise ValueError(f"Unknown route profile: {name}")
+        state["profile"] = name
+
+    await context.route("**/*", handle)
+    page.set_route_profile = set_route_profile
+
+
+# --- Stage tracing ---
+TRACE_MAX_SPANS = 200000
+
+
+def _percentile(values: list, fraction: float):
+    """Nearest-rank percentile of an already sorted list."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Tracer:
+    """
+    Timed spans around pipeline stages: browser launches, navigations,
+    readiness waits, per-attempt profile and recruiting scrapes, sorting
+    and the PDF build.
+
+    Each span carries its tags (player, url, attempt, ...) and an outcome,
+    "ok" unless the stage sets one or raises. Spans are summarised per stage
+    for the run report and exported in the Chrome trace format, which
+    chrome://tracing and Perfetto open directly.
+    """
+
+    def __init__(self, max_spans: int = TRACE_MAX_SPANS):
+        self.max_spans = max_spans
+        self.reset()
+
+    def reset(self):
+        self.spans = []
+        self.dropped = 0
+        self._tracks = {}
+
+    def _track(self):
+        # One trace row per asyncio task, so concurrent players don't overlap
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = (threading.get_ident(), id(task))
+        return self._tracks.setdefault(key, len(self._tracks) + 1)
+
+    def _add(self, record: dict):
+        if len(self.spans) < self.max_spans:
+            self.spans.append(record)
+        else:
+            self.dropped += 1
+
+    @contextlib.contextmanager
+    def span(self, name: str, /, **tags):
+        """
+        Time the enclosed block as one span.
+
+        Yields:
+            The span's tags dict; set "outcome" (or anything else) on it to
+            record how the stage ended
+        """
+        record = {"name": name, "tags": tags, "start": time.time(), "pid": os.getpid(), "track": self._track()}
+        start = time.perf_counter()
+        try:
+            yield tags
+        except BaseException as e:
+            if is_timeout(e):
+                tags.setdefault("outcome", "timeout")
+            else:
+                tags.setdefault("outcome", "error" if isinstance(e, Exception) else "cancelled")
+                tags.setdefault("error", type(e).__name__)
+            raise
+        finally:
+            record["duration"] = time.perf_counter() - start
+            tags.setdefault("outcome", "ok")
+            self._add(record)
+
+    def merge(self, spans: list):
+        """Add spans recorded by another process (e.g. a shard worker)."""
+        for record in spans:
+            self._add(record)
+
+    def stats(self):
+        """Per-stage rows (count, total, p50, p95, max, retries, timeouts, errors), slowest total first."""
+        by_name = defaultdict(list)
+        for record in self.spans:
+            by_name[record["name"]].append(record)
+        rows = []
+        for name, records in by_name.items():
+            durations = sorted(record["duration"] for record in records)
+            outcomes = [record["tags"].get("outcome") for record in records]
+            rows.append({
+                "stage": name,
+                "count": len(records),
+                "total_s": round(sum(durations), 2),
+                "p50_s": round(_percentile(durations, 0.50), 3),
+                "p95_s": round(_percentile(durations, 0.95), 3),
+                "max_s": round(durations[-1], 3),
+                "retries": sum(1 for record in records if (record["tags"].get("attempt") or 1) > 1),
+                "timeouts": outcomes.count("timeout"),
+                "errors": outcomes.count("error"),
+            })
+        return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+    def summary(self) -> str:
+        lines = [
+            f"{row['stage']}: {row['count']} spans, total {row['total_s']:.1f}s, p50 {row['p50_s']:.2f}s, "
+            f"p95 {row['p95_s']:.2f}s, max {row['max_s']:.2f}s, {row['retries']} retries, "
+            f"{row['timeouts']} timeouts, {row['errors']} errors"
+            for row in self.stats()
+        ]
+        if self.dropped:
+            lines.append(f"({self.dropped} spans beyond {self.max_spans} were not kept)")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """The spans as a Chrome trace event document."""
+        epoch = min((record["start"] for record in self.spans), default=0)
+        events = [{
+            "name": record["name"],
+            "cat": record["name"].split(".")[0],
+            "ph": "X",
+            "ts": round((record["start"] - epoch) * 1e6),
+            "dur": round(record["duration"] * 1e6),
+            "pid": record["pid"],
+            "tid": record["track"],
+            "args": record["tags"],
+        } for record in self.spans]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str):
+        """Write chrome_trace() to a JSON file and return its path."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        return path
+
+
+tracer = Tracer()
+
+
+# --- Host scheduling ---
+# Sustained navigations per second and burst, per host (scheme and port included)
+HOST_RATE_PER_SEC = float(os.environ.get("HOST_RATE_PER_SEC", "4"))
+HOST_BURST = 8
+RECRUITING_RATE_PER_SEC = float(os.environ.get("RECRUITING_RATE_PER_SEC", "1"))
+RECRUITING_BURST = 2
+# Navigation attempts per goto before the error (or error page) is handed back
+HOST_MAX_ATTEMPTS = 3
+HOST_BACKOFF_BASE = 1.0
+HOST_BACKOFF_MAX = 30.0
+# Consecutive failures that open a host's circuit, and how long it stays open
+HOST_BREAKER_FAILURES = 5
+HOST_BREAKER_COOLDOWN = 60.0
+HOST_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HostUnavailable(Exception):
+    """Raised instead of navigating while an optional host's circuit is open."""
+
+
+def backoff_delay(attempt: int, base: float = HOST_BACKOFF_BASE, cap: float = HOST_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given 1-based attempt."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class HostState:
+    """Token bucket, pause and circuit breaker of one host."""
+
+    def __init__(self, rate: float, burst: int, optional: bool):
+        self.rate = max(rate, 0.01)
+        self.burst = max(1, burst)
+        # Optional hosts (recruiting data) are skipped while open instead of waited for
+        self.optional = optional
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.failures = 0
+        self.open_until = 0.0
+        self.paused_until = 0.0
+        self.stats = defaultdict(int)
+        self.stats["throttle_wait"] = 0.0
+
+
+class HostScheduler:
+    """
+    Every navigation goes through here, per host - a configured base URL
+    (RECRUITING_BASE_URL) when the URL falls under it, else its origin:
+
+    - a token bucket spaces requests (HOST_RATE_PER_SEC, RECRUITING_RATE_PER_SEC);
+    - timeouts, network errors and 429/5xx responses are retried with
+      jittered exponential backoff, honouring Retry-After;
+    - HOST_BREAKER_FAILURES consecutive failures open the host's circuit for
+      HOST_BREAKER_COOLDOWN. Callers wait it out for USTA; optional hosts
+      raise HostUnavailable so their data is skipped and flagged instead.
+    """
+
+    def __init__(self):
+        self._hosts = {}
+        self._limits = {RECRUITING_BASE_URL: (RECRUITING_RATE_PER_SEC, RECRUITING_BURST, True)}
+
+    def key(self, url: str):
+        """The base URL or scheme://host:port whose limits apply to a URL."""
+        parts = urlsplit(url)
+        if not parts.netloc:
+            return None
+        for base in self._limits:
+            if url == base or url.startswith((base + "/", base + "?")):
+                return base
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def host(self, url: str):
+        name = self.key(url)
+        if not name:
+            return None
+        if name not in self._hosts:
+            rate, burst, optional = self._limits.get(name, (HOST_RATE_PER_SEC, HOST_BURST, False))
+            self._hosts[name] = HostState(rate, burst, optional)
+        return self._hosts[name]
+
+    def available(self, url: str) -> bool:
+        """False while an optional host's circuit is open."""
+        state = self.host(url)
+        return state is None or not (state.optional and state.open_until > time.monotonic())
+
+    async def acquire(self, url: str):
+        """Wait for the host's circuit, pause and rate limit before one navigation."""
+        state = self.host(url)
+        if state is None:
+            return
+        while True:
+            now = time.monotonic()
+            if state.open_until > now:
+                if state.optional:
+                    state.stats["skipped"] += 1
+                    raise HostUnavailable(self.key(url))
+                await asyncio.sleep(state.open_until - now)
+                continue
+            if state.paused_until > now:
+                await asyncio.sleep(state.paused_until - now)
+                continue
+            state.tokens = min(state.burst, state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+            if state.tokens >= 1:
+                state.tokens -= 1
+                state.stats["requests"] += 1
+                return
+            wait = (1 - state.tokens) / state.rate
+            state.stats["throttled"] += 1
+            state.stats["throttle_wait"] += wait
+            await asyncio.sleep(wait)
+
+    def record(self, url: str, ok: bool, retry_after: float = None):
+        """Feed one outcome (navigation or page readiness) into the host's breaker."""
+        state = self.host(url)
+        if state is None:
+            return
+        if ok:
+            state.failures = 0
+            return
+        state.failures += 1
+        state.stats["failures"] += 1
+        if retry_after:
+            state.paused_until = max(state.paused_until, time.monotonic() + retry_after)
+        if state.failures >= HOST_BREAKER_FAILURES and state.open_until <= time.monotonic():
+            state.open_until = time.monotonic() + HOST_BREAKER_COOLDOWN
+            state.stats["breaker_opens"] += 1
+            print(f"{self.key(url)}: {state.failures} failures in a row, pausing for {HOST_BREAKER_COOLDOWN:.0f}s")
+
+    async def navigate(self, goto, url: str, **kwargs):
+        """Run goto(url) under the host's limits, retrying failed attempts with backoff."""
+        state = self.host(url)
+        if state is None:
+            return await goto(url, **kwargs)
+        for attempt in range(1, HOST_MAX_ATTEMPTS + 1):
+            await self.acquire(url)
+            retry_after = None
+            with tracer.span("goto", url=url, attempt=attempt) as span:
+                try:
+                    response = await goto(url, **kwargs)
+                except playwright_errors.Error as e:
+                    if attempt == HOST_MAX_ATTEMPTS:
+                        self.record(url, ok=False)
+                        raise
+                    # Swallowed for the retry, so record it as the span would have
+                    span["outcome"] = "timeout" if is_timeout(e) else "error"
+                    span["error"] = type(e).__name__
+                    response = None
+                else:
+                    status = response.status if response is not None else 200
+                    if status not in HOST_RETRY_STATUSES:
+                        self.record(url, ok=True)
+                        return response
+                    span["outcome"] = f"http {status}"
+                    state.stats[f"http_{status}"] += 1
+                    try:
+                        retry_after = float(response.headers.get("retry-after", ""))
+                    except ValueError:
+                        retry_after = None
+            self.record(url, ok=False, retry_after=retry_after)
+            if attempt == HOST_MAX_ATTEMPTS:
+                return response
+            state.stats["retries"] += 1
+            await asyncio.sleep(backoff_delay(attempt))
+
+    def reset_stats(self):
+        for state in self._hosts.values():
+            state.stats.clear()
+            state.stats["throttle_wait"] = 0.0
+
+    def summary(self) -> str:
+        lines = []
+        for name, state in sorted(self._hosts.items()):
+            stats = state.stats
+            statuses = ", ".join(f"{count} {key[5:]}" for key, count in sorted(stats.items()) if key.startswith("http_"))
+            lines.append(
+                f"{name}: {stats['requests']} requests, {stats['throttled']} throttled "
+                f"({stats['throttle_wait']:.1f}s waiting), {stats['retries']} retries, {stats['failures']} failures"
+                + (f" ({statuses})" if statuses else "")
+                + f", {stats['breaker_opens']} circuit opens, {stats['skipped']} skipped"
+            )
+        return "\n".join(lines)
+
+
+host_scheduler = HostScheduler()
+
+
+# --- Page readiness ---
+READINESS_SETTLE_MS = int(os.environ.get("READINESS_SETTLE_MS", "1500"))
+READINESS_FIELD_TIMEOUT = 2000
+
+# Counts in-flight fetch/XHR calls so readiness checks know when the page's
+# own data loading has gone quiet
+NETWORK_TRACKER_INIT_SCRIPT = """
+(() => {
+    const net = window.__taNet = {pending: 0, last: performance.now()};
+    const done = () => { net.pending = Math.max(0, net.pending - 1); net.last = performance.now(); };
+    const origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function(...args) {
+            net.pending++;
+            return origFetch.apply(this, args).finally(done);
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function(...args) {
+        net.pending++;
+        this.addEventListener('loadend', done, {once: true});
+        return origSend.apply(this, args);
+    };
+})();
+"""
+
+# Resolves to "ready" once every `ready` selector matches, or "absent" as soon
+# as an `absent` selector matches or the page has finished loading with no DOM
+# mutations and no fetch/XHR in flight for settleMs
+READINESS_PROBE = """
+({ready, absent, settleMs}) => {
+    const find = (sel) => sel.startsWith('xpath=')
+        ? document.evaluate(sel.slice(6), document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(sel);
+    if (ready.length && ready.every(find)) return 'ready';
+    if (absent.some(find)) return 'absent';
+    if (!window.__taObserver) {
+        window.__taLastMutation = performance.now();
+        window.__taObserver = new MutationObserver(() => { window.__taLastMutation = performance.now(); });
+        window.__taObserver.observe(document, {subtree: true, childList: true, characterData: true});
+    }
+    const now = performance.now();
+    const net = window.__taNet || {pending: 0, last: 0};
+    if (document.readyState === 'complete'
+            && now - window.__taLastMutation > settleMs
+            && net.pending === 0 && now - net.last > settleMs) {
+        return 'absent';
+    }
+    return false;
+}
+"""
+
+USTA_WTN_XPATH = "/html/body/div[5]/div/div[2]/div/div/div[3]/div/div/div[2]/div/div/div[2]/div/div[3]/div/div/div/div[2]/div/form/div[3]/div/div/div/div[1]/div/div[2]/div[1]/div/p"
+USTA_PLAYER_NAME_XPATH = "//*[@id='container-cdeaf649fc']/div/div[1]/div[1]/div/div/span/h3"
+TOURNAMENT_NAME_XPATH = "//*[@id='tournaments']/div/div/div/div[1]/div/div[1]/h1"
+TOURNAMENT_LEVEL_XPATH = "/html/body/div[4]/div/div/div[2]/div[3]/div[1]/div[2]/div[2]/div/div/div[1]/div/div/div[1]/h6"
+RECRUITING_RATING_XPATH = "//*[@id='CenterColumn']/table[1]/tbody/tr/td[2]/table/tbody/tr[4]/td/img"
+
+def empty_state(*phrases):
+    """XPath selectors for an element whose own text contains any of the phrases, ignoring case."""
+    lower = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return [f"xpath=//body//*[not(self::script or self::style)][text()[contains({lower}, '{phrase}')]]"
+            for phrase in phrases]
+
+
+# What "loaded" means for each page type we scrape. `absent` lists the
+# page's own empty-state markers, which end the wait at once; pages that
+# have no empty state (they either load or fail) leave it out
+READINESS_SPECS = {
+    "tournament_overview": {
+        "ready": [f"xpath={TOURNAMENT_NAME_XPATH}", f"xpath={TOURNAMENT_LEVEL_XPATH}", "._H6_1iwqn_128"],
+        "timeout": 20000,
+    },
+    "tournament_events": {
+        "ready": ["._H6_1iwqn_128", "._link_19t7t_285"],
+        "absent": empty_state("no events"),
+        "timeout": 20000,
+    },
+    "tournament_event": {
+        "ready": ["._bodyXSmall_1iwqn_137"],
+        "timeout": 20000,
+    },
+    "tournament_players": {
+        "ready": ["._alignLeft_1nqit_268"],
+        "absent": empty_state("no players", "no entrants", "no results"),
+        "timeout": 20000,
+    },
+    "usta_profile": {
+        "ready": [f"xpath={USTA_PLAYER_NAME_XPATH}", ".readonly-text__content", f"xpath={USTA_WTN_XPATH}"],
+        "timeout": 20000,
+    },
+    "usta_rankings": {
+        "ready": [".v-grid-cell__content"],
+        "absent": empty_state("no rankings", "no items", "no results"),
+        "timeout": 10000,
+    },
+    "usta_standings": {
+        "ready": ["td, [role='gridcell'], .v-grid-cell__content"],
+        "absent": empty_state("no results", "no players", "no items"),
+        "timeout": 20000,
+    },
+    "recruiting_search": {
+        "ready": [f"xpath={RECRUITING_RATING_XPATH}"],
+        # A list of same-name players, or nobody at all
+        "absent": ['a[href*="player.asp?id="]'] + empty_state("no players", "no matches"),
+        "timeout": 10000,
+    },
+}
+
+
+class WaitStats:
+    """How long readiness waits took, per page type and outcome."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.samples = defaultdict(list)
+
+    def record(self, kind: str, outcome: str, elapsed: float):
+        self.samples[kind].append((outcome, elapsed))
+
+    def summary(self) -> str:
+        lines = []
+        for kind, samples in sorted(self.samples.items()):
+            durations = sorted(elapsed for _, elapsed in samples)
+            outcomes = defaultdict(int)
+            for outcome, _ in samples:
+                outcomes[outcome] += 1
+            outcome_text = ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+            lines.append(
+                f"{kind}: {len(samples)} waits, p50 {durations[len(durations) // 2]:.2f}s, "
+                f"max {durations[-1]:.2f}s ({outcome_text})"
+            )
+        return "\n".join(lines)
+
+
+wait_stats = WaitStats()
+
+
+async def wait_ready(page, kind: str, timeout: int = None) -> str:
+    """
+    Wait until a page of the given READINESS_SPECS type is usable.
+
+    Returns:
+        "ready" when the expected elements are present, "absent" when the
+        page settled without them, or "timeout"
+    """
+    spec = READINESS_SPECS[kind]
+    timeout = spec["timeout"] if timeout is None else timeout
+    start = time.perf_counter()
+    with tracer.span("wait." + kind, url=page.url) as span:
+        try:
+            handle = await page.wait_for_function(
+                READINESS_PROBE,
+                arg={"ready": spec["ready"], "absent": spec.get("absent", []), "settleMs": READINESS_SETTLE_MS},
+                timeout=timeout,
+                polling=100,
+            )
+            outcome = await handle.json_value()
+        except playwright_errors.TimeoutError:
+            outcome = "timeout"
+        span["outcome"] = outcome
+    wait_stats.record(kind, outcome, time.perf_counter() - start)
+    return outcome
+
+
+async def new_page(browser, route_profile: str = BROWSER_ROUTE_PROFILE):
+    """
+    Open a fresh context + page on an existing browser.
+
+    Args:
+        browser: Playwright Browser to open the context on
+        route_profile (str): Initial ROUTE_PROFILES entry for the context
+
+    Returns:
+        (context, page) with page.set_route_profile attached
+    """
+    context = await browser.new_context(**BROWSER_CONTEXT_OPTIONS)
+    page = await context.new_page()
+    await page.add_init_script(STEALTH_INIT_SCRIPT)
+    await page.add_init_script(NETWORK_TRACKER_INIT_SCRIPT)
+    await install_routing(context, page, route_profile)
+
+    # Every navigation, wherever it is issued from, goes through the host
+    # scheduler and is traced as a goto span per attempt
+    navigate = page.goto
+
+    async def scheduled_goto(url: str, **kwargs):
+        return await host_scheduler.navigate(navigate, url, **kwargs)
+
+    page.goto = scheduled_goto
+
+    return context, page
+
+
+# --- Memory governor ---
+MB = 1024 * 1024
+# 0 means MEMORY_CEILING_PERCENT of the container (cgroup) or host memory
+MEMORY_CEILING_MB = float(os.environ.get("MEMORY_CEILING_MB", "0"))
+MEMORY_CEILING_PERCENT = 85
+# New scrape tasks wait while usage is above this share of the ceiling
+MEMORY_THROTTLE_FRACTION = 0.9
+# 0 means half the ceiling
+BROWSER_RECYCLE_MB = float(os.environ.get("BROWSER_RECYCLE_MB", "0"))
+MEMORY_SAMPLE_INTERVAL = 1.0
+# Tags every Chromium we launch with "<owner pid>.<launch id>" so leftovers can be found
+BROWSER_OWNER_FLAG = "--tournament-analyzer-owner="
+
+
+def memory_limit_bytes():
+    """The container's cgroup memory limit, or total host memory when there is none."""
+    limit = psutil.virtual_memory().total
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit():
+            limit = min(limit, int(value))
+    return limit
+
+
+def browser_owner_marker(proc):
+    """The owner marker of a Chromium main process we launched, else None."""
+    try:
+        for arg in proc.cmdline():
+            if arg.startswith(BROWSER_OWNER_FLAG):
+                return arg[len(BROWSER_OWNER_FLAG):]
+    except psutil.Error:
+        pass
+    return None
+
+
+class MemoryGovernor:
+    """
+    Watches the RSS of this process and its Chromium children.
+
+    Scrape tasks are held back while usage is near the ceiling, browsers
+    whose process tree grows past the recycle threshold are replaced by
+    their pool, and Chromium processes whose owner is gone are killed.
+    """
+
+    def __init__(self, ceiling_mb: float = MEMORY_CEILING_MB, recycle_mb: float = BROWSER_RECYCLE_MB):
+        limit = memory_limit_bytes()
+        self.ceiling = ceiling_mb * MB if ceiling_mb > 0 else limit * MEMORY_CEILING_PERCENT / 100
+        self.recycle_at = recycle_mb * MB if recycle_mb > 0 else self.ceiling / 2
+        self.usage = 0
+        self.browsers = {}
+        self._process = psutil.Process()
+        self._sampled_at = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.peak = self.usage
+        # orphans_killed: left by analyzer processes that exited; own_killed:
+        # this process's launches that outlived their pool or run
+        self.stats = {"deferred": 0, "recycles": 0, "orphans_killed": 0, "own_killed": 0}
+
+    def sample(self, force: bool = False):
+        """Total RSS in bytes of this process tree; re-read at most once per MEMORY_SAMPLE_INTERVAL."""
+        now = time.monotonic()
+        if not force and now - self._sampled_at < MEMORY_SAMPLE_INTERVAL:
+            return self.usage
+        self._sampled_at = now
+        try:
+            procs = [self._process] + self._process.children(recursive=True)
+        except psutil.Error:
+            procs = [self._process]
+        rss = {}
+        for proc in procs:
+            try:
+                rss[proc.pid] = proc.memory_info().rss
+            except psutil.Error:
+                pass
+        browsers = {}
+        for proc in procs:
+            marker = browser_owner_marker(proc) if proc is not self._process else None
+            if marker is None:
+                continue
+            try:
+                tree = [proc] + proc.children(recursive=True)
+            except psutil.Error:
+                continue
+            browsers[marker] = sum(rss.get(child.pid, 0) for child in tree)
+        self.usage = sum(rss.values())
+        self.browsers = browsers
+        self.peak = max(self.peak, self.usage)
+        return self.usage
+
+    def under_pressure(self) -> bool:
+        """Whether usage is within MEMORY_THROTTLE_FRACTION of the ceiling."""
+        return self.sample() >= self.ceiling * MEMORY_THROTTLE_FRACTION
+
+    def admit(self, in_flight: int) -> bool:
+        """Whether another scrape task may start; the first one always may."""
+        if in_flight == 0 or not self.under_pressure():
+            return True
+        self.stats["deferred"] += 1
+        return False
+
+    def browser_bloated(self, marker: str) -> bool:
+        self.sample()
+        return self.browsers.get(marker, 0) > self.recycle_at
+
+    def _kill(self, procs: list, stat: str):
+        victims = []
+        for proc in procs:
+            try:
+                victims += [proc] + proc.children(recursive=True)
+            except psutil.Error:
+                pass
+        for proc in victims:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(victims, timeout=3)
+        self.stats[stat] += len(procs)
+        return len(procs)
+
+    def kill_orphans(self, include_own: bool = False):
+        """
+        Kill Chromium processes whose launching analyzer process has exited,
+        and with include_own every one this process launched.
+        """
+        own = os.getpid()
+        orphans, own_browsers = [], []
+        for proc in psutil.process_iter():
+            marker = browser_owner_marker(proc)
+            if marker is None:
+                continue
+            try:
+                owner = int(marker.split(".")[0])
+            except ValueError:
+                continue
+            if owner == own and include_own:
+                own_browsers.append(proc)
+            elif owner != own and not psutil.pid_exists(owner):
+                orphans.append(proc)
+        return self._kill(orphans, "orphans_killed") + self._kill(own_browsers, "own_killed")
+
+    def kill_browsers(self, markers):
+        """Kill any of the given launches that outlived their pool."""
+        markers = set(markers)
+        if not markers:
+            return 0
+        try:
+            procs = self._process.children(recursive=True)
+        except psutil.Error:
+            return 0
+        return self._kill([proc for proc in procs if browser_owner_marker(proc) in markers], "own_killed")
+
+    def summary(self) -> str:
+        return (
+            f"peak {self.peak / MB:.0f} MB of {self.ceiling / MB:.0f} MB ceiling, "
+            f"{self.stats['deferred']} task starts deferred, {self.stats['recycles']} browser recycles, "
+            f"{self.stats['orphans_killed']} orphaned browsers killed, "
+            f"{self.stats['own_killed']} of its own leftover browsers killed"
+        )
+
+
+_memory_governor = None
+
+
+def get_memory_governor():
+    """Return the process-wide MemoryGovernor."""
+    global _memory_governor
+    if _memory_governor is None:
+        _memory_governor = MemoryGovernor()
+    return _memory_governor
+
+
+class _PoolSlot:
+    """A pooled context/page pair and how many leases it has served."""
+
+    def __init__(self, browser, context, page):
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.broken = False
+
+
+class BrowserPool:
+    """
+    One long-lived Chromium that hands out reusable contexts/pages.
+
+    At most `size` pages are leased at once, plus the pages reserved for each
+    named lane in `reserved`, which only leases of that lane can use (so
+    recruiting lookups never wait behind USTA scrapes). A context is replaced after
+    `max_uses` leases, after a lease that raised, or when it fails its health
+    check; the browser itself is relaunched if it disconnects, and replaced
+    (after its open leases finish) once the memory governor finds it bloated.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_uses: int = BROWSER_CONTEXT_MAX_USES,
+                 reserved: dict = None):
+        self.size = max(1, int(size))
+        self.reserved = {lane: max(1, int(count)) for lane, count in (reserved or {}).items()}
+        self.max_uses = max(1, int(max_uses))
+        self.launches = 0
+        self.recycles = 0
+        self.contexts_created = 0
+        self.contexts_retired = 0
+        self._playwright = None
+        self._browser = None
+        self._marker = None
+        self._markers = []
+        self._draining = []
+        self._active = defaultdict(int)
+        self._idle = []
+        self._slots = asyncio.Semaphore(self.size)
+        self._lanes = {lane: asyncio.Semaphore(count) for lane, count in self.reserved.items()}
+        self._lock = asyncio.Lock()
+        self._closed = False
+        self._loop = None
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool is closed")
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+
+                await asyncio.get_event_loop().run_in_executor(None, ensure_chromium)
+                self._playwright = await async_playwright().start()
+            # Contexts of a dead browser are unusable
+            self._idle = []
+            marker = f"{os.getpid()}.{id(self)}.{self.launches + 1}"
+            with tracer.span("browser.launch", launch=self.launches + 1):
+                self._browser = await self._playwright.chromium.launch(
+                    headless=True, args=BROWSER_LAUNCH_ARGS + [BROWSER_OWNER_FLAG + marker]
+                )
+            self._marker = marker
+            self._markers.append(marker)
+            self.launches += 1
+            return self._browser
+
+    async def _healthy(self, slot):
+        if slot.broken or slot.browser is not self._browser or not slot.browser.is_connected():
+            return False
+        if slot.page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(slot.page.evaluate("1"), timeout=BROWSER_HEALTH_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def _retire(self, slot):
+        self.contexts_retired += 1
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
+
+    async def recycle(self):
+        """Replace the browser: new leases get a fresh one, the old closes when idle."""
+        async with self._lock:
+            old = self._browser
+            if old is None:
+                return
+            self._browser = None
+            self._draining.append(old)
+            self.recycles += 1
+        get_memory_governor().stats["recycles"] += 1
+        idle = [slot for slot in self._idle if slot.browser is old]
+        self._idle = [slot for slot in self._idle if slot.browser is not old]
+        for slot in idle:
+            await self._retire(slot)
+        await self._close_drained()
+
+    async def _close_drained(self):
+        for browser in list(self._draining):
+            if self._active[browser]:
+                continue
+            self._draining.remove(browser)
+            self._active.pop(browser, None)
+            try:
+                await browser.close()
+            except Exception:
+                pass
+
+    async def _acquire_slot(self):
+        browser = await self._ensure_browser()
+        while self._idle:
+            slot = self._idle.pop()
+            if await self._healthy(slot):
+                return slot
+            await self._retire(slot)
+        with tracer.span("browser.context"):
+            context, page = await new_page(browser)
+        self.contexts_created += 1
+        return _PoolSlot(browser, context, page)
+
+    async def _release_slot(self, slot):
+        slot.uses += 1
+        if self._closed or slot.broken or slot.uses >= self.max_uses or slot.browser is not self._browser:
+            await self._retire(slot)
+            return
+        try:
+            # Drop the previous page's DOM/JS heap before the next lease
+            await slot.page.goto("about:blank")
+        except Exception:
+            await self._retire(slot)
+            return
+        self._idle.append(slot)
+
+    @contextlib.asynccontextmanager
+    async def lease(self, route_profile: str = BROWSER_ROUTE_PROFILE, lane: str = None):
+        """Lease a page for the duration of the block, from a reserved lane if given."""
+        slots = self._lanes[lane] if lane else self._slots
+        with tracer.span("pool.wait", profile=route_profile, lane=lane):
+            await slots.acquire()
+        slot = None
+        try:
+            slot = await self._acquire_slot()
+            self._active[slot.browser] += 1
+            slot.page.set_route_profile(route_profile)
+            yield slot.page
+        except BaseException:
+            if slot is not None:
+                slot.broken = True
+            raise
+        finally:
+            if slot is not None:
+                self._active[slot.browser] -= 1
+                await self._release_slot(slot)
+                if self._draining:
+                    await self._close_drained()
+                elif self._marker and get_memory_governor().browser_bloated(self._marker):
+                    await self.recycle()
+            slots.release()
+
+    async def close(self):
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for slot in idle:
+            await self._retire(slot)
+        for browser in [self._browser] + self._draining:
+            try:
+                if browser is not None:
+                    await browser.close()
+            except Exception:
+                pass
+        try:
+            if self._playwright is not None:
+                await self._playwright.stop()
+        except Exception:
+            pass
+        self._browser = None
+        self._draining = []
+        self._playwright = None
+        # A browser that ignored close() (or lost its driver) must not linger
+        get_memory_governor().kill_browsers(self._markers)
+
+
+_browser_pool = None
+
+
+def _discard_pool(pool):
+    """Close a pool that is being replaced, on the loop its browser belongs to."""
+    if pool._closed:
+        return
+    loop = pool._loop
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(pool.close(), loop)
+        return
+    if loop is not None and not loop.is_closed():
+        with contextlib.suppress(RuntimeError):
+            loop.run_until_complete(pool.close())
+            return
+    # Its loop cannot run any more, so only the browser processes can be reaped
+    pool._closed = True
+    get_memory_governor().kill_browsers(pool._markers)
+
+
+def get_browser_pool():
+    """Return the shared BrowserPool for the running event loop, creating it on first use."""
+    global _browser_pool
+    loop = asyncio.get_event_loop()
+    if _browser_pool is None or _browser_pool._closed or _browser_pool._loop is not loop:
+        if _browser_pool is None:
+            # Browsers left behind by analyzer processes that crashed
+            get_memory_governor().kill_orphans()
+        else:
+            _discard_pool(_browser_pool)
+        _browser_pool = BrowserPool(reserved={"recruiting": RECRUITING_CONCURRENCY})
+        _browser_pool._loop = loop
+    return _browser_pool
+
+
+async def close_browser_pool():
+    global _browser_pool
+    if _browser_pool is not None:
+        await _browser_pool.close()
+        _browser_pool = None
+
+
+RECRUITING_SEARCH_URL = RECRUITING_BASE_URL + "/player.asp"
+RECRUITING_YEAR_XPATH = "//*[@id='CenterColumn']/table[1]/tbody/tr/td[2]/table/tbody/tr[3]/td[2]/div[3]"
+RECRUITING_GRADES = ["Graduate", "Senior", "Junior", "Sophomore", "Freshman",
+                     "8th Grader", "7th Grader", "6th Grader"]
+
+# Star image file names on tennisrecruiting.net, best first
+RECRUITING_STAR_LABELS = [
+    ("6star", "Blue Chip"), ("5star", "5 Star"), ("4star", "4 Star"), ("3star", "3 Star"),
+    ("2star", "2 Star"), ("1star", "1 Star"), ("0star", "0 Star"),
+]
+
+RECRUITING_EXTRACT_SCRIPT = """
+({ratingXpath, yearXpath}) => {
+    const byXpath = (xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const rating = byXpath(ratingXpath);
+    const year = byXpath(yearXpath);
+    // Same element Playwright's text=.xx picks: the first leaf containing ".xx"
+    const utr = Array.from(document.querySelectorAll('body *')).find(
+        (el) => el.children.length === 0 && el.textContent.toLowerCase().includes('.xx'));
+    return {
+        rating: rating ? rating.getAttribute('src') : null,
+        year: year ? year.innerText : null,
+        utr: utr ? utr.innerText : null,
+        url: location.href,
+    };
+}
+"""
+
+RECRUITING_CANDIDATES_SCRIPT = """
+() => Array.from(document.querySelectorAll('a[href*="player.asp?id="]'), (a) => ({
+    name: a.innerText.trim(),
+    href: a.href,
+    row: (a.closest('tr') || a.parentElement).innerText,
+}))
+"""
+
+
+def recruiting_star_label(src):
+    """Map a rating image URL to its star label."""
+    for marker, label in RECRUITING_STAR_LABELS:
+        if src and marker in src:
+            return label
+    return "Unknown"
+
+
+def parse_recruiting_class(year_text):
+    if not year_text:
+        return "Unknown"
+    for grade in RECRUITING_GRADES:
+        if grade in year_text:
+            return grade + "?" if "Provisional" in year_text else grade
+    return "Unknown"
+
+
+def recruiting_search_name(name: str) -> str:
+    """Entrant lists may show "Last, First"; the search expects "First Last"."""
+    if name and "," in name:
+        last, first = name.split(",", 1)
+        name = f"{first.strip()} {last.strip()}"
+    return " ".join((name or "").split())
+
+
+def choose_recruiting_candidate(candidates: list, name: str, location: str = None):
+    """Pick the search result row that best matches the player's name and location."""
+    wanted = recruiting_search_name(name).lower()
+    named = [c for c in candidates if recruiting_search_name(c["name"]).lower() == wanted] or candidates
+    if not named:
+        return None
+    tokens = [t.strip().lower() for t in re.split(r"[,|]", location or "") if t.strip()]
+    if tokens:
+        return max(named, key=lambda c: sum(token in c["row"].lower() for token in tokens))
+    return named[0]
+
+
+def parse_recruiting_page(raw: dict):
+    return {
+        "Recruiting": recruiting_star_label(raw.get("rating")),
+        "UTR": (raw.get("utr") or "0.xx").strip(),
+        "Class": parse_recruiting_class(raw.get("year")),
+        "profile": raw.get("url"),
+    }
+
+
+async def read_recruiting_profile(page):
+    raw = await page.evaluate(
+        RECRUITING_EXTRACT_SCRIPT, {"ratingXpath": RECRUITING_RATING_XPATH, "yearXpath": RECRUITING_YEAR_XPATH}
+    )
+    # Keyed by the page URL, which is the profile recorded in RecruitingIndex
+    await capture_snapshot(page, "recruiting_profile", raw["url"])
+    return parse_recruiting_page(raw)
+
+
+async def scrape_recruiting(name, page, max_retries: int = 3):
+    """
+    Search tennisrecruiting.net for a player by name on the given page.
+
+    Returns:
+        {"player": fields dict} when the search lands on a player page,
+        {"candidates": [...]} when several players match, {} when none do,
+        or None when the search never loaded
+    """
+    for attempt in range(max_retries):
+        with tracer.span("recruiting.attempt", name=name, attempt=attempt + 1) as span:
+            try:
+                await page.goto(RECRUITING_SEARCH_URL, wait_until="domcontentloaded")
+
+                await page.fill("input[name=f_playername]", recruiting_search_name(name))
+                # Submitting the form navigates too, so it takes a token like a goto
+                await host_scheduler.acquire(RECRUITING_SEARCH_URL)
+                async with page.expect_navigation(wait_until="domcontentloaded"):
+                    await page.keyboard.press("Enter")
+            except playwright_errors.Error as e:
+                # An error page has no search box; start the search over
+                span["outcome"] = "timeout" if is_timeout(e) else "error"
+                span["error"] = type(e).__name__
+                host_scheduler.record(RECRUITING_SEARCH_URL, ok=False)
+                await asyncio.sleep(backoff_delay(attempt + 1))
+                continue
+
+            outcome = span["outcome"] = await wait_ready(page, "recruiting_search")
+            host_scheduler.record(RECRUITING_SEARCH_URL, ok=outcome != "timeout")
+            if outcome == "ready":
+                return {"player": await read_recruiting_profile(page)}
+            if outcome == "absent":
+                # The result page settled: a list of matches or nobody at all
+                candidates = await page.evaluate(RECRUITING_CANDIDATES_SCRIPT)
+                return {"candidates": candidates} if candidates else {}
+        await asyncio.sleep(backoff_delay(attempt + 1))
+
+    return None
+
+
+async def scrape_recruiting_profile(url, page):
+    """Read a tennisrecruiting.net player page directly."""
+    await page.goto(url, wait_until="domcontentloaded")
+    if await wait_ready(page, "recruiting_search") == "timeout":
+        raise playwright_errors.TimeoutError(f"Recruiting profile did not load: {url}")
+    return await read_recruiting_profile(page)
+
+
+async def scrape_usta(player_link, age_group, max_retries: int = 2):
+    """
+    Read a USTA profile. Navigation retries happen in the host scheduler;
+    a profile that loads but never renders gets one more try on a fresh
+    context after a backoff.
+
+    Returns:
+        (values, status): the legacy string values, and the parse status of
+        each ProfileExtraction field (empty when the profile never loaded)
+    """
+    retries = 0
+    while retries < max_retries:
+        retries += 1
+
+        try:
+            with tracer.span("usta.attempt", player=player_link, attempt=retries) as span:
+                async with get_browser_pool().lease() as page:
+                    await page.goto(usta_url(player_link), wait_until="domcontentloaded")
+                    loaded = await wait_ready(page, "usta_profile") != "timeout"
+                    host_scheduler.record(usta_url(player_link), ok=loaded)
+                    if not loaded:
+                        raise playwright_errors.TimeoutError(f"Profile did not load: {player_link}")
+
+                    profile = await extract_profile(page, player_link, age_group)
+                missing = [field_name for field_name, status in profile.status.items() if status != FIELD_OK]
+                if missing:
+                    span["missing"] = ",".join(missing)
+
+            return profile.as_strings(), profile.status
+
+        except Exception:
+            if retries >= max_retries:
+                return ["Unknown", "Unknown", "Unknown", "40.00", "0", "20,000"], {}
+            await asyncio.sleep(backoff_delay(retries))
+
+
+# --- Bulk DOM extraction ---
+EXTRACT_ELEMENTS_SCRIPT = """
+({selector, linkSelector}) => Array.from(document.querySelectorAll(selector), (el) => {
+    const link = el.matches(linkSelector) ? el : el.querySelector(linkSelector);
+    return {text: el.innerText, href: link ? link.getAttribute('href') : null};
+})
+"""
+
+
+async def extract_elements(page, selector: str, link_selector: str = "a"):
+    """
+    Read every element matching a selector in one in-page evaluation.
+
+    Returns:
+        list of {"text": innerText, "href": href of the element or its first
+        link_selector descendant, or None}, in document order
+    """
+    return await page.evaluate(EXTRACT_ELEMENTS_SCRIPT, {"selector": selector, "linkSelector": link_selector})
+
+
+def group_rows(values: list, width: int):
+    """Split a flat list of grid cells into rows of `width` cells, dropping a ragged tail."""
+    return [values[i:i + width] for i in range(0, len(values) - width + 1, width)]
+
+
+async def extract_entrants(page, age_group: str = None):
+    """
+    Read the tournament players list in one evaluation.
+
+    Each entrant is a linked name cell followed by its events cell.
+
+    Returns:
+        list of {"name", "events", "profile"} rows, optionally only those
+        entered in age_group
+    """
+    cells = await extract_elements(page, "._alignLeft_1nqit_268")
+    entrants = []
+    for name_cell, events_cell in zip(cells, cells[1:]):
+        if not name_cell["href"]:
+            continue
+        if age_group and age_group not in events_cell["text"]:
+            continue
+        entrants.append({
+            "name": name_cell["text"].strip(),
+            "events": events_cell["text"].strip(),
+            "profile": name_cell["href"],
+        })
+    return entrants
+
+
+# --- USTA profile extraction ---
+PROFILE_EXTRACT_SCRIPT = """
+({nameXpath, wtnXpath}) => {
+    const byXpath = (xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const name = byXpath(nameXpath);
+    const wtn = byXpath(wtnXpath);
+    return {
+        name: name ? name.textContent : null,
+        readonly: Array.from(document.querySelectorAll('.readonly-text__content'), (el) => el.innerText),
+        wtn: wtn ? wtn.innerText : null,
+    };
+}
+"""
+
+RANKINGS_EXTRACT_SCRIPT = """
+() => ({
+    cells: Array.from(document.querySelectorAll('.v-grid-cell__content'), (el) => el.innerText),
+    links: Array.from(document.querySelectorAll('.v-grid-cell__content a'), (a) => ({text: a.innerText, href: a.getAttribute('href')})),
+})
+"""
+
+FIELD_OK = "ok"
+FIELD_MISSING = "missing"
+FIELD_UNPARSED = "unparsed"
+# The page holding the field did not load; worth retrying soon
+FIELD_UNAVAILABLE = "unavailable"
+
+
+@dataclass
+class ProfileExtraction:
+    """Typed fields read from a USTA profile plus a parse status per field."""
+
+    name: Optional[str] = None
+    location: Optional[str] = None
+    district: Optional[str] = None
+    wtn: Optional[float] = None
+    points: Optional[int] = None
+    rank: Optional[int] = None
+    status: dict = field(default_factory=dict)
+
+    def as_strings(self):
+        """The legacy string values scrape_usta returns, with its fallbacks."""
+        return [
+            self.name if self.name else "Unknown Player",
+            self.location if self.location else "Unknown",
+            self.district if self.district else "Unknown",
+            f"{self.wtn:.2f}" if self.wtn is not None else "40.00",
+            str(self.points) if self.points is not None else "0",
+            str(self.rank) if self.rank is not None else "20,000",
+        ]
+
+
+def parse_int(text):
+    """Parse "1,234" style integers; None when there is no number."""
+    if text is None:
+        return None
+    digits = text.replace(",", "").strip()
+    return int(digits) if digits.isdigit() else None
+
+
+def parse_profile_fields(raw: dict, result: ProfileExtraction = None):
+    """Fill name/location/district/WTN from PROFILE_EXTRACT_SCRIPT output."""
+    result = result or ProfileExtraction()
+
+    name = (raw.get("name") or "").strip()
+    result.name = name or None
+    result.status["name"] = FIELD_OK if name else FIELD_MISSING
+
+    readonly = raw.get("readonly") or []
+    details = readonly[1] if len(readonly) > 1 else None
+    if details is None:
+        result.status["location"] = result.status["district"] = FIELD_MISSING
+    else:
+        try:
+            result.location = details.split('|')[1].split('Section:')[0].strip("\n")
+            result.status["location"] = FIELD_OK
+        except IndexError:
+            result.status["location"] = FIELD_UNPARSED
+        try:
+            result.district = details.split("|")[2].split(": ")[1]
+            result.status["district"] = FIELD_OK
+        except IndexError:
+            result.status["district"] = FIELD_UNPARSED
+
+    wtn = raw.get("wtn")
+    if wtn is None:
+        result.status["wtn"] = FIELD_MISSING
+    else:
+        try:
+            result.wtn = float(wtn.strip())
+            result.status["wtn"] = FIELD_OK
+        except ValueError:
+            result.status["wtn"] = FIELD_UNPARSED
+
+    return result
+
+
+def parse_rankings_cells(cells: list, age_group: str, result: ProfileExtraction = None):
+    """Fill points/rank from the rankings grid row of the age group's national standings."""
+    result = result or ProfileExtraction()
+    result.status["points"] = result.status["rank"] = FIELD_MISSING
+    list_name = standings_list_name(age_group)
+    if not list_name:
+        return result
+
+    for row in group_rows(cells, 5):
+        if list_name in row[0]:
+            result.points = parse_int(row[1])
+            result.rank = parse_int(row[2])
+            result.status["points"] = FIELD_OK if result.points is not None else FIELD_UNPARSED
+            result.status["rank"] = FIELD_OK if result.rank is not None else FIELD_UNPARSED
+    return result
+
+
+async def extract_profile(page, player_link: str, age_group: str):
+    """
+    Read a USTA profile with one evaluation on the profile tab and one on
+    the rankings tab. The page must already show the profile tab.
+    """
+    raw = await page.evaluate(
+        PROFILE_EXTRACT_SCRIPT, {"nameXpath": USTA_PLAYER_NAME_XPATH, "wtnXpath": USTA_WTN_XPATH}
+    )
+    await capture_snapshot(page, "usta_profile", player_link)
+    result = parse_profile_fields(raw)
+
+    standings = get_standings_index()
+    joined = standings.lookup(age_group, player_link, result.name, result.location)
+    if joined is not None:
+        result.points, result.rank = joined
+        result.status["points"] = result.status["rank"] = FIELD_OK
+        return result
+
+    standings.stats["fallbacks"] += 1
+    await page.goto(usta_url(player_link) + "&tab=rankings", wait_until="domcontentloaded")
+    if await wait_ready(page, "usta_rankings") == "ready":
+        grid = await page.evaluate(RANKINGS_EXTRACT_SCRIPT)
+        await capture_snapshot(page, "usta_rankings", player_link, age_group=age_group)
+        parse_rankings_cells(grid["cells"], age_group, result)
+        list_name = standings_list_name(age_group)
+        for link in grid["links"]:
+            if list_name and list_name in link["text"]:
+                standings.note_source(age_group, link["href"])
+    else:
+        result.status["points"] = result.status["rank"] = FIELD_UNAVAILABLE
+    return result
+
+
+# --- Player profile cache ---
+CACHE_DIR = os.environ.get(
+    "TOURNAMENT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "tournament-analyzer")
+)
+PLAYER_CACHE_PATH = os.path.join(CACHE_DIR, "players.sqlite3")
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# WTN and standings move weekly; identity and recruiting data rarely change
+PLAYER_FIELD_TTLS = {
+    "Name": 30 * DAY,
+    "Location": 30 * DAY,
+    "District": 30 * DAY,
+    "Class": 30 * DAY,
+    "WTN": 3 * DAY,
+    "Points": 3 * DAY,
+    "Ranking": 3 * DAY,
+    "Recruiting": 14 * DAY,
+    "UTR": 14 * DAY,
+}
+
+# Fallback values shown when a field could not be scraped or does not exist
+PLAYER_FIELD_PLACEHOLDERS = {
+    "Name": {"Unknown", "Unknown Player"},
+    "Location": {"Unknown"},
+    "District": {"Unknown"},
+    "Class": {"Unknown"},
+    "WTN": {"40.00"},
+    "Points": {"0"},
+    "Ranking": {"20,000", "20000"},
+    "Recruiting": {"Unknown", "Unavailable"},
+    "UTR": {"0.xx"},
+}
+# Fields whose lookup failed transiently are cached for a short time only, so
+# they are retried on the next run; a confirmed "no value" keeps the field TTL
+PLAYER_PLACEHOLDER_TTL = 12 * HOUR
+# ProfileExtraction status key of each USTA field
+USTA_FIELD_STATUS = {
+    "Name": "name", "Location": "location", "District": "district",
+    "WTN": "wtn", "Points": "points", "Ranking": "rank",
+}
+RECRUITING_FIELDS = ("Recruiting", "Class", "UTR")
+# What scrape_player returns when a profile could not be read at all
+UNKNOWN_PLAYER = {
+    "Name": "Unknown",
+    "Profile": "",
+    "Location": "Unknown",
+    "District": "Unknown",
+    "WTN": "40.00",
+    "Points": "0",
+    "Ranking": "20,000",
+    "Recruiting": "Unknown",
+    "Class": "Unknown",
+    "UTR": "0.xx",
+}
+
+
+def failed_player(name: str = None, profile: str = None):
+    """A player whose profile could not be scraped, under the entrant-list name so the report shows who is missing."""
+    return {**UNKNOWN_PLAYER, "Name": name or UNKNOWN_PLAYER["Name"], "Profile": profile or "", "Failed": True}
+
+
+class PlayerCache:
+    """
+    SQLite cache of scraped player fields keyed by USTA profile URL.
+
+    Every field is stored with its own TTL (see PLAYER_FIELD_TTLS), so a
+    record can be partly fresh. get() only returns a record when every field
+    is fresh; stats counts hits, misses (never seen) and stale records.
+    """
+
+    def __init__(self, path: str = PLAYER_CACHE_PATH, field_ttls: dict = None):
+        self.path = path
+        self.field_ttls = dict(PLAYER_FIELD_TTLS)
+        if field_ttls:
+            self.field_ttls.update(field_ttls)
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "writes": 0}
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS player_fields (
+                profile TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                ttl REAL NOT NULL,
+                PRIMARY KEY (profile, field)
+            )
+            """
+        )
+        self._db.commit()
+
+    def lookup(self, profile: str, now: float = None):
+        """Return (fresh_fields, stale_field_names) for a profile URL."""
+        now = time.time() if now is None else now
+        rows = self._db.execute(
+            "SELECT field, value, fetched_at, ttl FROM player_fields WHERE profile = ?", (profile,)
+        ).fetchall()
+        fresh = {}
+        for name, value, fetched_at, ttl in rows:
+            if now - fetched_at < ttl:
+                fresh[name] = value
+        stale = {name for name in self.field_ttls if name not in fresh}
+        return fresh, stale
+
+    def get(self, profile: str):
+        """Return the cached player dict if every field is fresh, else None."""
+        fresh, stale = self.lookup(profile)
+        if not stale:
+            self.stats["hits"] += 1
+            return {"Profile": profile, **fresh}
+        # A record whose fields have all expired is stale, not a miss
+        known = fresh or self._db.execute(
+            "SELECT 1 FROM player_fields WHERE profile = ? LIMIT 1", (profile,)
+        ).fetchone()
+        self.stats["stale" if known else "misses"] += 1
+        return None
+
+    def entries(self, profile: str):
+        """{field: (value, fetched_at)} of every stored field of a profile."""
+        rows = self._db.execute(
+            "SELECT field, value, fetched_at FROM player_fields WHERE profile = ?", (profile,)
+        ).fetchall()
+        return {name: (value, fetched_at) for name, value, fetched_at in rows}
+
+    def peek(self, profile: str):
+        """Every stored field of a profile, fresh or stale, without counting a lookup."""
+        return dict(self._db.execute("SELECT field, value FROM player_fields WHERE profile = ?", (profile,)).fetchall())
+
+    def put(self, profile: str, player: dict, now: float = None, transient=()):
+        """
+        Store the scraped fields of a player dict.
+
+        Fields named in `transient` hold fallbacks for a failed lookup and
+        are kept for PLAYER_PLACEHOLDER_TTL at most.
+        """
+        if not profile or player.get("Failed") or player.get("Name") in PLAYER_FIELD_PLACEHOLDERS["Name"]:
+            # The whole scrape failed; caching it would only hide the player
+            return
+        now = time.time() if now is None else now
+        rows = []
+        for name, ttl in self.field_ttls.items():
+            if name not in player:
+                continue
+            if name in transient:
+                ttl = min(ttl, PLAYER_PLACEHOLDER_TTL)
+            rows.append((profile, name, str(player[name]), now, ttl))
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO player_fields (profile, field, value, fetched_at, ttl) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        self.stats["writes"] += 1
+
+    def reset_stats(self):
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def summary(self) -> str:
+        total = self.stats["hits"] + self.stats["misses"] + self.stats["stale"]
+        rate = round(100 * self.stats["hits"] / total, 1) if total else 0.0
+        return (
+            f"{self.stats['hits']} hits, {self.stats['misses']} misses, "
+            f"{self.stats['stale']} stale ({rate}% hit rate)"
+        )
+
+    def close(self):
+        self._db.close()
+
+
+_player_cache = None
+
+
+def get_player_cache():
+    """Return the process-wide PlayerCache."""
+    global _player_cache
+    if _player_cache is None:
+        _player_cache = PlayerCache()
+    return _player_cache
+
+
+async def scrape_player(player_link, age_group, force_refresh: bool = False, name: str = None,
+                        check_cache: bool = True):
+    """
+    Scrape one player, reusing whatever cached fields are still fresh: the
+    USTA profile and the recruiting lookup are each only redone when one of
+    their fields is stale.
+    """
+    cache = get_player_cache()
+    fresh = {}
+    if not force_refresh:
+        if check_cache:
+            cached = cache.get(player_link)
+            if cached is not None:
+                return cached
+        fresh, _ = cache.lookup(player_link)
+    usta_fresh = all(key in fresh for key in USTA_FIELD_STATUS)
+    recruiting_fresh = all(key in fresh for key in RECRUITING_FIELDS)
+    if usta_fresh and recruiting_fresh:
+        return {"Profile": player_link, **fresh}
+
+    with tracer.span("player", player=player_link, name=name) as span:
+        if usta_fresh or recruiting_fresh:
+            span["partial"] = "recruiting" if usta_fresh else "usta"
+        # With the entrant-list name the recruiting lookup starts right away and
+        # only waits for the USTA location if the name is ambiguous
+        recruiting = get_recruiting_index()
+        location = asyncio.get_event_loop().create_future()
+        recruiting_task = None
+        if name and not recruiting_fresh:
+            recruiting_task = asyncio.ensure_future(recruiting.lookup(name, location, force_refresh))
+
+        try:
+            if usta_fresh:
+                player_info, status = [fresh[key] for key in USTA_FIELD_STATUS], None
+            else:
+                player_info, status = await scrape_usta(player_link, age_group)
+            location.set_result(player_info[1])
+            if recruiting_fresh:
+                recruiting_info = {key: fresh[key] for key in RECRUITING_FIELDS}
+            else:
+                if recruiting_task is None and player_info[0] not in PLAYER_FIELD_PLACEHOLDERS["Name"]:
+                    recruiting_task = asyncio.ensure_future(
+                        recruiting.lookup(player_info[0], player_info[1], force_refresh)
+                    )
+                try:
+                    recruiting_info = await recruiting_task if recruiting_task else dict(RECRUITING_FALLBACK)
+                except Exception:
+                    recruiting_info = dict(RECRUITING_FALLBACK)
+
+            player = {
+                "Name": player_info[0],
+                "Profile": player_link,
+                "Location": player_info[1],
+                "District": player_info[2],
+                "WTN": player_info[3],
+                "Points": player_info[4],
+                "Ranking": player_info[5],
+                "Recruiting": recruiting_info["Recruiting"],
+                "Class": recruiting_info["Class"],
+                "UTR": recruiting_info["UTR"],
+            }
+            if not usta_fresh and not status:
+                # scrape_usta gave up on the profile
+                span["outcome"] = "failed"
+                player.update(Name=name or player["Name"], Failed=True)
+
+            # Only what was scraped now is written back, so fresh fields keep their age
+            scraped, transient = {}, set()
+            if not usta_fresh:
+                scraped.update((key, player[key]) for key in USTA_FIELD_STATUS)
+                transient.update(
+                    key for key, status_key in USTA_FIELD_STATUS.items()
+                    if status.get(status_key) not in (FIELD_OK, FIELD_MISSING)
+                )
+            if not recruiting_fresh:
+                scraped.update((key, player[key]) for key in RECRUITING_FIELDS)
+                if recruiting_info.get("transient"):
+                    transient.update(RECRUITING_FIELDS)
+            cache.put(player_link, scraped, transient=transient)
+            return player
+        except asyncio.CancelledError:
+            if recruiting_task is not None:
+                recruiting_task.cancel()
+            raise
+        except Exception:
+            span["outcome"] = "failed"
+            if recruiting_task is not None:
+                recruiting_task.cancel()
+            return failed_player(name, player_link)
+
+
+# --- Page snapshots ---
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "snapshots")
+# Save the rendered HTML of every parsed page so parsers can be re-run offline.
+# Off by default: each snapshot costs a page.content() round trip, gzip and a write
+SNAPSHOT_PAGES = os.environ.get("SNAPSHOT_PAGES", "0").lower() not in ("0", "false", "no")
+# Snapshots kept per page; older ones are dropped with their blobs
+SNAPSHOT_KEEP = 3
+SNAPSHOT_PARSE_CHUNK = 64
+BLOCK_TAGS = {"address", "article", "br", "dd", "div", "dl", "dt", "footer", "form", "h1", "h2", "h3", "h4",
+              "h5", "h6", "header", "li", "ol", "p", "section", "table", "tbody", "td", "th", "tr", "ul"}
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of rendered pages.
+
+    Each page's HTML is gzipped into objects/<sha256[:2]>/<sha256>.html.gz,
+    so identical pages are stored once, and an SQLite index maps
+    (kind, key) - e.g. ("usta_profile", profile link) - to its latest
+    SNAPSHOT_KEEP snapshots with the URL and context they were taken with.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_DIR, keep: int = SNAPSHOT_KEEP):
+        self.path = path
+        self.keep = keep
+        os.makedirs(os.path.join(path, "objects"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(path, "index.sqlite3"), check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._db:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    url TEXT,
+                    meta TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (kind, key, digest)
+                )
+                """
+            )
+        self.stats = {"written": 0, "deduplicated": 0}
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.path, "objects", digest[:2], digest + ".html.gz")
+
+    def put(self, kind: str, key: str, html: str, url: str = None, meta: dict = None) -> str:
+        """Store one page and return its digest."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            self.stats["deduplicated"] += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp, "wb", compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self.stats["written"] += 1
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, digest, url, json.dumps(meta or {}), time.time()),
+            )
+            expired = self._db.execute(
+                "SELECT digest FROM snapshots WHERE kind = ? AND key = ? ORDER BY fetched_at DESC LIMIT -1 OFFSET ?",
+                (kind, key, self.keep),
+            ).fetchall()
+            for (old,) in expired:
+                self._db.execute("DELETE FROM snapshots WHERE kind = ? AND key = ? AND digest = ?", (kind, key, old))
+                if not self._db.execute("SELECT 1 FROM snapshots WHERE digest = ?", (old,)).fetchone():
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(self.blob_path(old))
+        return digest
+
+    def read(self, digest: str) -> str:
+        with gzip.open(self.blob_path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def latest(self, kind: str):
+        """[(key, digest, url, meta, fetched_at)] of the newest snapshot of every page of a kind."""
+        rows = self._db.execute(
+            """
+            SELECT key, digest, url, meta, fetched_at FROM snapshots s
+            WHERE kind = ? AND fetched_at = (
+                SELECT MAX(fetched_at) FROM snapshots WHERE kind = s.kind AND key = s.key
+            )
+            """,
+            (kind,),
+        ).fetchall()
+        return [(key, digest, url, json.loads(meta), fetched_at) for key, digest, url, meta, fetched_at in rows]
+
+    def summary(self) -> str:
+        count, pages = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT kind || key) FROM snapshots").fetchone()
+        return f"{pages} pages, {count} snapshots ({self.stats['written']} written, {self.stats['deduplicated']} unchanged)"
+
+
+_snapshot_store = None
+
+
+def get_snapshot_store():
+    """Return the process-wide SnapshotStore."""
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = SnapshotStore()
+    return _snapshot_store
+
+
+async def capture_snapshot(page, kind: str, key: str, **meta):
+    """
+    Save the page's rendered HTML under (kind, key). Compression and disk
+    writes run off the event loop; a failed snapshot never fails the scrape.
+    """
+    if not SNAPSHOT_PAGES:
+        return None
+    try:
+        with tracer.span("snapshot", kind=kind):
+            html = await page.content()
+            return await asyncio.get_event_loop().run_in_executor(
+                None, get_snapshot_store().put, kind, key, html, page.url, meta
+            )
+    except (playwright_errors.Error, OSError, sqlite3.Error) as e:
+        print(f"Snapshot of {key} failed: {e}")
+        return None
+
+
+# Offline parsers: lxml over a stored snapshot, producing the same raw dicts
+# the in-browser extraction scripts return so the shared parse_* functions apply
+def css_class_xpath(name: str) -> str:
+    return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+
+
+def inner_text(element) -> str:
+    """Approximate innerText: text with a line break around block elements."""
+    parts = []
+
+    def walk(node):
+        block = isinstance(node.tag, str) and node.tag in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if isinstance(node.tag, str) and node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+
+    walk(element)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def first_by_xpath(doc, xpath: str):
+    found = doc.xpath(xpath)
+    return found[0] if found else None
+
+
+def parse_profile_snapshot(doc, url: str, meta: dict):
+    name = first_by_xpath(doc, USTA_PLAYER_NAME_XPATH)
+    wtn = first_by_xpath(doc, USTA_WTN_XPATH)
+    raw = {
+        "name": name.text_content() if name is not None else None,
+        "readonly": [inner_text(el) for el in doc.xpath(css_class_xpath("readonly-text__content"))],
+        "wtn": inner_text(wtn) if wtn is not None else None,
+    }
+    return dataclasses.asdict(parse_profile_fields(raw))
+
+
+def parse_rankings_snapshot(doc, url: str, meta: dict):
+    cells = [inner_text(el) for el in doc.xpath(css_class_xpath("v-grid-cell__content"))]
+    return dataclasses.asdict(parse_rankings_cells(cells, meta.get("age_group", "")))
+
+
+def parse_recruiting_snapshot(doc, url: str, meta: dict):
+    rating = first_by_xpath(doc, RECRUITING_RATING_XPATH)
+    year = first_by_xpath(doc, RECRUITING_YEAR_XPATH)
+    # Same element RECRUITING_EXTRACT_SCRIPT picks: the first leaf containing ".xx"
+    utr = next((el for el in doc.iter() if isinstance(el.tag, str) and len(el) == 0
+                and ".xx" in el.text_content().lower()), None)
+    return parse_recruiting_page({
+        "rating": rating.get("src") if rating is not None else None,
+        "year": inner_text(year) if year is not None else None,
+        "utr": inner_text(utr) if utr is not None else None,
+        "url": url,
+    })
+
+
+def parse_event_snapshot(doc, url: str, meta: dict):
+    texts = [inner_text(el) for el in doc.xpath(css_class_xpath("_bodyXSmall_1iwqn_137"))]
+    draw_size, sort_type, selection = parse_event_details(texts)
+    return {"draw_size": draw_size, "sort_type": sort_type, "selection": selection}
+
+
+SNAPSHOT_PARSERS = {
+    "usta_profile": parse_profile_snapshot,
+    "usta_rankings": parse_rankings_snapshot,
+    "recruiting_profile": parse_recruiting_snapshot,
+    "usta_event": parse_event_snapshot,
+}
+
+
+def parse_snapshots(kind: str, snapshots: list, store_path: str = SNAPSHOT_DIR):
+    """
+    Parse [(key, digest, url, meta, fetched_at)] snapshots of one kind.
+
+    Runs in worker processes (see reparse_snapshots), so it opens the blobs
+    by path rather than through the process-wide store.
+
+    Returns:
+        [(key, parsed dict or None)]
+    """
+    import lxml.html
+
+    store = SnapshotStore(store_path)
+    parse = SNAPSHOT_PARSERS[kind]
+    results = []
+    for key, digest, url, meta, _ in snapshots:
+        try:
+            results.append((key, parse(lxml.html.fromstring(store.read(digest)), url, meta)))
+        except Exception as e:
+            # A missing blob, an empty or malformed page (lxml's ParserError)
+            # or a page the parser does not recognise only fails this snapshot
+            print(f"Could not parse {kind} snapshot of {key}: {e}")
+            results.append((key, None))
+    return results
+
+
+def reparse_snapshots(kinds=tuple(SNAPSHOT_PARSERS), workers: int = None):
+    """
+    Re-derive records from the latest snapshot of every page, without a
+    browser, across worker processes.
+
+    Returns:
+        ({kind: {key: (parsed dict, url, meta, fetched_at)}}, {kind: snapshots that failed to parse})
+    """
+    try:
+        import lxml.html  # noqa: F401
+    except ImportError:
+        print("lxml is not installed; install it to reparse snapshots")
+        return {}, {}
+
+    store = get_snapshot_store()
+    latest = {kind: store.latest(kind) for kind in kinds}
+    snapshots = {
+        kind: {key: (url, meta, fetched_at) for key, _, url, meta, fetched_at in rows} for kind, rows in latest.items()
+    }
+    tasks = [
+        (kind, rows[start:start + SNAPSHOT_PARSE_CHUNK])
+        for kind, rows in latest.items()
+        for start in range(0, len(rows), SNAPSHOT_PARSE_CHUNK)
+    ]
+    parsed = {kind: {} for kind in kinds}
+    failed = {kind: 0 for kind in kinds}
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        parse = spawnable(parse_snapshots)
+        futures = {pool.submit(parse, kind, chunk, store.path): kind for kind, chunk in tasks}
+        for future in concurrent.futures.as_completed(futures):
+            kind = futures[future]
+            for key, result in future.result():
+                if result is None:
+                    failed[kind] += 1
+                else:
+                    parsed[kind][key] = (result, *snapshots[kind][key])
+    return parsed, failed
+
+
+def apply_reparsed(parsed: dict):
+    """
+    Write reparsed snapshots back into the caches: tournament events,
+    recruiting results and player records. Fields a snapshot could not
+    parse keep their cached values, and player fields are only rewritten
+    when the reparse changed them, stamped with the snapshot's time.
+
+    Returns:
+        {"events", "recruiting", "players"}: records updated
+    """
+    counts = {"events": 0, "recruiting": 0, "players": 0}
+    directory = get_tournament_directory()
+    for event_url, (fields, url, meta, fetched_at) in parsed.get("usta_event", {}).items():
+        if fields["draw_size"] != UNKNOWN_DRAW_SIZE and directory.update_event(meta.get("tournament"), meta.get("age_group"), **fields):
+            counts["events"] += 1
+
+    recruiting = get_recruiting_index()
+    recruiting_pages = parsed.get("recruiting_profile", {})
+    for profile_url, (fields, url, meta, fetched_at) in recruiting_pages.items():
+        if fields["Recruiting"] != "Unknown" or fields["UTR"] != "0.xx":
+            counts["recruiting"] += recruiting.refresh_profile(profile_url, fields)
+
+    cache = get_player_cache()
+    rankings = parsed.get("usta_rankings", {})
+    for player_link, (fields, url, meta, fetched_at) in parsed.get("usta_profile", {}).items():
+        # {field: (value, snapshot time)} read from this player's snapshots
+        reparsed = {}
+        for field_name, key in (("name", "Name"), ("location", "Location"), ("district", "District")):
+            if fields["status"].get(field_name) == FIELD_OK:
+                reparsed[key] = (fields[field_name], fetched_at)
+        if fields["status"].get("wtn") == FIELD_OK:
+            reparsed["WTN"] = (f"{fields['wtn']:.2f}", fetched_at)
+        ranked = rankings.get(player_link)
+        if ranked is not None and ranked[0]["status"].get("points") == FIELD_OK:
+            reparsed["Points"] = (str(ranked[0]["points"]), ranked[3])
+            reparsed["Ranking"] = (str(ranked[0]["rank"]), ranked[3])
+
+        stored = cache.entries(player_link)
+        name = reparsed.get("Name", stored.get("Name", ("",)))[0]
+        location = reparsed.get("Location", stored.get("Location", ("",)))[0]
+        found = recruiting.cached(name, location)
+        if found is not None and found["profile"] in recruiting_pages:
+            page_time = recruiting_pages[found["profile"]][3]
+            reparsed.update((key, (found[key], page_time)) for key in RECRUITING_FIELDS)
+
+        # Only fields whose value changed, and never over a newer cached value
+        changed = {
+            key: (value, at) for key, (value, at) in reparsed.items()
+            if key not in stored or (stored[key][0] != value and stored[key][1] <= at)
+        }
+        if not changed:
+            continue
+        for at in sorted({at for _, at in changed.values()}):
+            cache.put(player_link, {key: value for key, (value, when) in changed.items() if when == at}, now=at)
+        counts["players"] += 1
+    return counts
+
+
+# --- National standings ---
+STANDINGS_DB_PATH = os.path.join(CACHE_DIR, "standings.sqlite3")
+STANDINGS_TTL = PLAYER_FIELD_TTLS["Points"]
+STANDINGS_MAX_SCROLLS = 200
+# Jobs analysed within this window share one fetch of a list
+STANDINGS_RELOAD_AFTER = HOUR
+STANDINGS_FLAT_ROW_WIDTH = 5
+
+# Rows with their cell texts and profile link. Grids that only expose flat
+# .v-grid-cell__content nodes come back in "flat" instead.
+STANDINGS_ROWS_SCRIPT = """
+() => {
+    const profileHref = (el) => {
+        const link = el.querySelector('a[href*="uaid"]');
+        return link ? link.getAttribute('href') : null;
+    };
+    const rows = Array.from(document.querySelectorAll('tr, [role="row"]'), (row) => ({
+        cells: Array.from(row.querySelectorAll('th, td, [role="columnheader"], [role="gridcell"]'), (c) => c.innerText.trim()),
+        href: profileHref(row),
+    })).filter((row) => row.cells.length);
+    const flat = rows.length ? [] : Array.from(document.querySelectorAll('.v-grid-cell__content'), (c) => ({
+        text: c.innerText.trim(),
+        href: profileHref(c),
+    }));
+    return {rows, flat};
+}
+"""
+
+STANDINGS_LAST_CELL_CHANGED = """
+(previous) => {
+    const cells = document.querySelectorAll('td, [role="gridcell"], .v-grid-cell__content');
+    return cells.length > 0 && cells[cells.length - 1].innerText !== previous;
+}
+"""
+
+STANDINGS_SCROLL_SCRIPT = """
+() => {
+    const grid = document.querySelector('vaadin-grid, [role="grid"], table');
+    if (grid && grid.scrollBy) grid.scrollBy(0, grid.clientHeight || 600);
+    window.scrollBy(0, window.innerHeight);
+    const cells = document.querySelectorAll('td, [role="gridcell"], .v-grid-cell__content');
+    return cells.length ? cells[cells.length - 1].innerText : null;
+}
+"""
+
+
+def standings_list_name(age_group: str):
+    """The rankings-tab row label of an age group's national standings list."""
+    try:
+        return age_group.split(" ")[1] + " National Standings List"
+    except IndexError:
+        return None
+
+
+def standings_list_key(age_group: str):
+    """StandingsIndex key of an age group's list, e.g. "Girls 14s National Standings List"."""
+    if not standings_list_name(age_group):
+        return None
+    return " ".join(age_group.split()) + " National Standings List"
+
+
+def player_key(player_link: str = None, name: str = None, location: str = None):
+    """
+    Stable key for joining standings rows: the USTA uaid, else the name with
+    the city. A bare name is not a key, since namesakes would share points.
+    """
+    match = re.search(r"uaid=(\d+)", player_link or "")
+    if match:
+        return "uaid:" + match.group(1)
+    if not name or name in PLAYER_FIELD_PLACEHOLDERS["Name"] or location in PLAYER_FIELD_PLACEHOLDERS["Location"]:
+        return None
+    city = _normalize_key((location or "").split(",")[0])
+    if city:
+        return f"name:{_normalize_key(name)}|{city}"
+    return None
+
+
+def parse_standings_rows(raw: dict):
+    """
+    Turn STANDINGS_ROWS_SCRIPT output into {player_key: (points, rank)}.
+
+    Columns are located from the header row; without a header that names
+    rank and points the rows are not trusted and nothing is returned. Rows
+    without a profile link are only kept when the list has a city column.
+    """
+    rows = [(row["cells"], row["href"]) for row in raw.get("rows", [])]
+    if not rows and raw.get("flat"):
+        flat = raw["flat"]
+        for chunk in group_rows(flat, STANDINGS_FLAT_ROW_WIDTH):
+            href = next((cell["href"] for cell in chunk if cell["href"]), None)
+            rows.append(([cell["text"] for cell in chunk], href))
+
+    columns = None
+    table = {}
+    for cells, href in rows:
+        lowered = [cell.lower() for cell in cells]
+        if columns is None:
+            rank_col = next((i for i, cell in enumerate(lowered) if "rank" in cell), None)
+            points_col = next((i for i, cell in enumerate(lowered) if "point" in cell), None)
+            name_col = next((i for i, cell in enumerate(lowered) if "name" in cell or "player" in cell), None)
+            city_col = next((i for i, cell in enumerate(lowered) if "city" in cell or "location" in cell), None)
+            if rank_col is not None and points_col is not None:
+                columns = (rank_col, points_col, name_col, city_col)
+            continue
+        rank_col, points_col, name_col, city_col = columns
+        if max(rank_col, points_col) >= len(cells):
+            continue
+        name = cells[name_col] if name_col is not None and name_col < len(cells) else None
+        city = cells[city_col] if city_col is not None and city_col < len(cells) else None
+        rank = parse_int(cells[rank_col])
+        points = parse_int(cells[points_col])
+        if rank is None or points is None:
+            continue
+        for key in {player_key(href), player_key(None, name, city)} - {None}:
+            # Indexed by name and city too, so entrants whose link lacks a uaid still join
+            table.setdefault(key, (points, rank))
+    return table
+
+
+class StandingsIndex:
+    """
+    National standings lists indexed by player, fetched once per list and run.
+
+    The list URL is learned the first time a player's rankings tab links to
+    it (note_source) and remembered on disk, so later runs load the whole
+    list up front and players only fall back to their own rankings tab when
+    they are missing from it. Lists are keyed by the full age group, since the
+    Boys and Girls lists of an age share one rankings-tab label.
+    """
+
+    def __init__(self, path: str = STANDINGS_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS standings_sources (list_name TEXT PRIMARY KEY, url TEXT NOT NULL)"
+            )
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS standings (
+                    list_name TEXT NOT NULL,
+                    player_key TEXT NOT NULL,
+                    points INTEGER NOT NULL,
+                    rank INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (list_name, player_key)
+                )
+                """
+            )
+        self._tables = {}
+        self._loaded_at = {}
+        self._loading = {}
+        self.stats = {"lists_fetched": 0, "joined": 0, "fallbacks": 0}
+
+    def reset_stats(self):
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def _is_current(self, list_key: str):
+        return list_key in self._tables and time.time() - self._loaded_at[list_key] < STANDINGS_RELOAD_AFTER
+
+    def source(self, list_key: str):
+        row = self._db.execute("SELECT url FROM standings_sources WHERE list_name = ?", (list_key,)).fetchone()
+        return row[0] if row else None
+
+    def note_source(self, age_group: str, url: str):
+        """Remember the age group's list URL seen on a rankings tab and start loading it."""
+        list_key = standings_list_key(age_group)
+        if not list_key or not url:
+            return
+        url = usta_url(url)
+        if self.source(list_key) != url:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO standings_sources (list_name, url) VALUES (?, ?)", (list_key, url)
+                )
+        if not self._is_current(list_key) and list_key not in self._loading:
+            self._loading[list_key] = asyncio.ensure_future(self._load(list_key, url))
+
+    async def prepare(self, age_group: str):
+        """Load the age group's standings list for this run if its URL is known."""
+        list_key = standings_list_key(age_group)
+        if not list_key or self._is_current(list_key):
+            return
+        if list_key not in self._loading:
+            # Another run or worker process fetched it moments ago
+            recent = self._load_from_disk(list_key, max_age=STANDINGS_RELOAD_AFTER)
+            if recent:
+                self._tables[list_key] = recent
+                self._loaded_at[list_key] = time.time()
+                return
+            url = self.source(list_key)
+            if not url:
+                return
+            self._loading[list_key] = asyncio.ensure_future(self._load(list_key, url))
+        await self._loading[list_key]
+
+    async def _load(self, list_key: str, url: str):
+        try:
+            table = await self._fetch(url)
+        except Exception as e:
+            print(f"Standings list {list_key} could not be fetched: {e}")
+            table = {}
+        if table:
+            now = time.time()
+            with self._db:
+                self._db.execute("DELETE FROM standings WHERE list_name = ?", (list_key,))
+                self._db.executemany(
+                    "INSERT INTO standings (list_name, player_key, points, rank, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    [(list_key, key, points, rank, now) for key, (points, rank) in table.items()],
+                )
+            self.stats["lists_fetched"] += 1
+        else:
+            table = self._load_from_disk(list_key)
+        self._tables[list_key] = table
+        self._loaded_at[list_key] = time.time()
+        self._loading.pop(list_key, None)
+
+    def _load_from_disk(self, list_key: str, max_age: float = STANDINGS_TTL):
+        rows = self._db.execute(
+            "SELECT player_key, points, rank FROM standings WHERE list_name = ? AND fetched_at > ?",
+            (list_key, time.time() - max_age),
+        ).fetchall()
+        return {key: (points, rank) for key, points, rank in rows}
+
+    async def _fetch(self, url: str):
+        with tracer.span("standings.fetch", url=url) as span:
+            table = await self._fetch_rows(url)
+            span["players"] = len(table)
+        return table
+
+    async def _fetch_rows(self, url: str):
+        table = {}
+        async with get_browser_pool().lease() as page:
+            await page.goto(url, wait_until="domcontentloaded")
+            if await wait_ready(page, "usta_standings") != "ready":
+                return table
+            # Virtualised grids only render what is on screen: scroll and
+            # collect until a scroll brings in no new players
+            for _ in range(STANDINGS_MAX_SCROLLS):
+                before = len(table)
+                table.update(parse_standings_rows(await page.evaluate(STANDINGS_ROWS_SCRIPT)))
+                if table and len(table) == before:
+                    break
+                last_cell = await page.evaluate(STANDINGS_SCROLL_SCRIPT)
+                try:
+                    await page.wait_for_function(
+                        STANDINGS_LAST_CELL_CHANGED, arg=last_cell, timeout=READINESS_SETTLE_MS
+                    )
+                except playwright_errors.TimeoutError:
+                    table.update(parse_standings_rows(await page.evaluate(STANDINGS_ROWS_SCRIPT)))
+                    break
+        return table
+
+    def lookup(self, age_group: str, player_link: str, name: str = None, location: str = None, count: bool = True):
+        """
+        Return (points, rank) from a loaded list, or None to fall back to the
+        rankings tab. Matches on the uaid, else on name and city.
+        """
+        table = self._tables.get(standings_list_key(age_group))
+        if not table:
+            return None
+        for key in (player_key(player_link), player_key(None, name, location)):
+            if key and key in table:
+                if count:
+                    self.stats["joined"] += 1
+                return table[key]
+        return None
+
+    def summary(self) -> str:
+        return (
+            f"{self.stats['lists_fetched']} lists fetched, {self.stats['joined']} players joined, "
+            f"{self.stats['fallbacks']} rankings-tab fallbacks"
+        )
+
+
+_standings_index = None
+
+
+def get_standings_index():
+    """Return the process-wide StandingsIndex."""
+    global _standings_index
+    if _standings_index is None:
+        _standings_index = StandingsIndex()
+    return _standings_index
+
+
+# --- Recruiting lookups ---
+RECRUITING_DB_PATH = os.path.join(CACHE_DIR, "recruiting.sqlite3")
+RECRUITING_TTL = PLAYER_FIELD_TTLS["Recruiting"]
+RECRUITING_CONCURRENCY = int(os.environ.get("RECRUITING_CONCURRENCY", "2"))
+# A search that confirmed nobody by that name plays on tennisrecruiting.net
+RECRUITING_NOT_FOUND = {"Recruiting": "Unknown", "UTR": "0.xx", "Class": "Unknown", "profile": None}
+# A lookup that failed; retried on the next run rather than cached for long
+RECRUITING_FALLBACK = {**RECRUITING_NOT_FOUND, "transient": True}
+# Shown (and not cached) when tennisrecruiting.net's circuit is open
+RECRUITING_UNAVAILABLE = {"Recruiting": "Unavailable", "UTR": "0.xx", "Class": "Unknown", "profile": None,
+                          "transient": True}
+
+
+def _normalize_key(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", (text or "").lower()).split())
+
+
+class RecruitingIndex:
+    """
+    Cached, deduplicated tennisrecruiting.net lookups.
+
+    Results are kept on disk keyed by name + location. Concurrent lookups of
+    the same name share one search, and of the same player page one fetch.
+    Lookups run in the browser pool's reserved "recruiting" lane of
+    RECRUITING_CONCURRENCY pages, which alone bounds them, so they overlap
+    with USTA profile scrapes. The location may be passed as an awaitable;
+    it is only awaited when the search returns several players.
+    """
+
+    def __init__(self, path: str = RECRUITING_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS recruiting (
+                    name_key TEXT NOT NULL,
+                    location_key TEXT NOT NULL,
+                    profile TEXT,
+                    rating TEXT NOT NULL,
+                    utr TEXT NOT NULL,
+                    class TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    ttl REAL NOT NULL,
+                    PRIMARY KEY (name_key, location_key)
+                )
+                """
+            )
+        self._inflight = {}
+        self.stats = {"hits": 0, "misses": 0, "searches": 0, "profile_fetches": 0, "shared": 0, "unavailable": 0}
+
+    def reset_stats(self):
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def cached(self, name: str, location: str = None):
+        """The unexpired stored result for a player name (and location), without counting a lookup."""
+        location_key = _normalize_key(location) if location is not None else None
+        return self._cached(_normalize_key(recruiting_search_name(name)), location_key)
+
+    def _cached(self, name_key: str, location_key: str = None):
+        now = time.time()
+        rows = [
+            row for row in self._db.execute(
+                "SELECT location_key, profile, rating, utr, class, fetched_at, ttl FROM recruiting WHERE name_key = ?",
+                (name_key,),
+            ).fetchall()
+            if now - row[5] < row[6]
+        ]
+        match = None
+        if location_key is not None:
+            match = next((row for row in rows if row[0] == location_key), None)
+        if match is None and len({row[1] for row in rows}) == 1:
+            # Only one player by that name has ever been seen
+            match = rows[0]
+        if match is None:
+            return None
+        return {"Recruiting": match[2], "UTR": match[3], "Class": match[4], "profile": match[1]}
+
+    def _store(self, name_key: str, location_key: str, result: dict):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO recruiting VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (name_key, location_key, result.get("profile"), result["Recruiting"],
+                 result["UTR"], result["Class"], time.time(), RECRUITING_TTL),
+            )
+
+    def refresh_profile(self, profile: str, result: dict) -> int:
+        """Overwrite the stored fields of every lookup that resolved to this player page."""
+        with self._db:
+            return self._db.execute(
+                "UPDATE recruiting SET rating = ?, utr = ?, class = ? WHERE profile = ?",
+                (result["Recruiting"], result["UTR"], result["Class"], profile),
+            ).rowcount
+
+    async def _single_flight(self, key, fetch):
+        if key in self._inflight:
+            self.stats["shared"] += 1
+            return await asyncio.shield(self._inflight[key])
+        future = asyncio.ensure_future(fetch())
+        self._inflight[key] = future
+        try:
+            # Shielded so a cancelled caller does not cancel the waiters it shares with
+            return await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _in_lane(self, fetch, *args):
+        async with get_browser_pool().lease(route_profile="rating_image_src", lane="recruiting") as page:
+            return await fetch(*args, page)
+
+    async def lookup(self, name: str, location=None, force_refresh: bool = False):
+        """
+        Return {"Recruiting", "UTR", "Class", "profile"} for a player.
+
+        Args:
+            name (str): Player name as shown by USTA or the entrant list
+            location: Location string, or an awaitable resolving to one
+            force_refresh (bool): Ignore cached results
+        """
+        name_key = _normalize_key(recruiting_search_name(name))
+        if not name_key:
+            return dict(RECRUITING_NOT_FOUND)
+
+        known_location = location if isinstance(location, str) or location is None else None
+        if known_location is None and isinstance(location, asyncio.Future) and location.done():
+            known_location = location.result()
+
+        if not force_refresh:
+            cached = self._cached(name_key, _normalize_key(known_location) if known_location else None)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return cached
+        self.stats["misses"] += 1
+        if not host_scheduler.available(RECRUITING_SEARCH_URL):
+            self.stats["unavailable"] += 1
+            return dict(RECRUITING_UNAVAILABLE)
+
+        async def search():
+            self.stats["searches"] += 1
+            return await self._in_lane(scrape_recruiting, name)
+
+        try:
+            found = await self._single_flight(("search", name_key), search)
+
+            if found is None:
+                # The search never loaded; try again next run
+                return dict(RECRUITING_FALLBACK)
+            if "player" in found:
+                result = found["player"]
+            elif found.get("candidates"):
+                if known_location is None and location is not None:
+                    known_location = await location
+                chosen = choose_recruiting_candidate(found["candidates"], name, known_location)
+
+                async def fetch_profile():
+                    self.stats["profile_fetches"] += 1
+                    return await self._in_lane(scrape_recruiting_profile, chosen["href"])
+
+                result = await self._single_flight(("profile", chosen["href"]), fetch_profile)
+            else:
+                result = dict(RECRUITING_NOT_FOUND)
+        except HostUnavailable:
+            # The site is down or throttling us: flag the row and don't cache it
+            self.stats["unavailable"] += 1
+            return dict(RECRUITING_UNAVAILABLE)
+
+        self._store(name_key, _normalize_key(known_location or ""), result)
+        return result
+
+    def summary(self) -> str:
+        return (
+            f"{self.stats['hits']} cached, {self.stats['searches']} searches, "
+            f"{self.stats['profile_fetches']} profile fetches, {self.stats['shared']} shared in-flight, "
+            f"{self.stats['unavailable']} skipped while the site was unavailable"
+        )
+
+
+_recruiting_index = None
+
+
+def get_recruiting_index():
+    """Return the process-wide RecruitingIndex."""
+    global _recruiting_index
+    if _recruiting_index is None:
+        _recruiting_index = RecruitingIndex()
+    return _recruiting_index
+
+
+# --- Adaptive scrape scheduler ---
+SCRAPE_MIN_CONCURRENCY = int(os.environ.get("SCRAPE_MIN_CONCURRENCY", "1"))
+SCRAPE_MAX_CONCURRENCY = int(os.environ.get("SCRAPE_MAX_CONCURRENCY", str(BROWSER_POOL_SIZE)))
+SCRAPE_INITIAL_CONCURRENCY = int(os.environ.get("SCRAPE_INITIAL_CONCURRENCY", "3"))
+SCRAPE_ERROR_RATE_HIGH = 0.3
+SCRAPE_LATENCY_SLOWDOWN = 2.0
+
+
+class AdaptiveScheduler:
+    """
+    Sliding-window runner: a new item starts as soon as any slot frees up.
+
+    The window size moves between min_concurrency and max_concurrency. It is
+    halved when the recent error rate is high or the memory governor reports
+    pressure, shrunk by one
+    when latency drifts well above the best latency seen, and grown by one
+    after a full window of healthy completions.
+    """
+
+    def __init__(self, min_concurrency: int = SCRAPE_MIN_CONCURRENCY,
+                 max_concurrency: int = SCRAPE_MAX_CONCURRENCY,
+                 initial: int = SCRAPE_INITIAL_CONCURRENCY, window: int = 10):
+        self.min_concurrency = max(1, int(min_concurrency))
+        self.max_concurrency = max(self.min_concurrency, int(max_concurrency))
+        self.concurrency = min(max(int(initial), self.min_concurrency), self.max_concurrency)
+        self.window = window
+        self.adjustments = []
+        self._latencies = deque(maxlen=window)
+        self._errors = deque(maxlen=window)
+        self._baseline = None
+        self._since_change = 0
+
+    def _set_concurrency(self, value, reason):
+        value = min(max(value, self.min_concurrency), self.max_concurrency)
+        if value != self.concurrency:
+            self.adjustments.append((time.time(), self.concurrency, value, reason))
+            self.concurrency = value
+        self._since_change = 0
+
+    def observe(self, elapsed: float, failed: bool):
+        """Feed one completion into the concurrency controller."""
+        self._latencies.append(elapsed)
+        self._errors.append(1 if failed else 0)
+        self._since_change += 1
+
+        if get_memory_governor().under_pressure():
+            self._set_concurrency(self.concurrency // 2, "memory")
+            return
+
+        # Give each setting a full window before judging it
+        if self._since_change < max(self.concurrency, 3):
+            return
+
+        error_rate = sum(self._errors) / len(self._errors)
+        latency = sorted(self._latencies)[len(self._latencies) // 2]
+        if error_rate >= SCRAPE_ERROR_RATE_HIGH:
+            self._set_concurrency(self.concurrency // 2, "errors")
+        elif self._baseline is not None and latency > self._baseline * SCRAPE_LATENCY_SLOWDOWN:
+            self._set_concurrency(self.concurrency - 1, "latency")
+        else:
+            self._set_concurrency(self.concurrency + 1, "healthy")
+
+        if error_rate < SCRAPE_ERROR_RATE_HIGH and (self._baseline is None or latency < self._baseline):
+            self._baseline = latency
+
+    async def run(self, items, worker, on_result=None, is_error=None):
+        """
+        Run worker(item) for every item and return the results in input order.
+
+        Args:
+            items (list): Inputs to process
+            worker: Async callable taking one item
+            on_result: Optional callback(index, result, completed, total) fired per item
+            is_error: Optional predicate marking a returned result as a failure
+        """
+        items = list(items)
+        results = [None] * len(items)
+        queue = iter(enumerate(items))
+        pending = set()
+        completed = 0
+
+        async def timed(index, item):
+            start = time.perf_counter()
+            try:
+                result = await worker(item)
+                failed = bool(is_error and is_error(result))
+            except Exception:
+                result, failed = None, True
+            return index, result, time.perf_counter() - start, failed
+
+        governor = get_memory_governor()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < self.concurrency:
+                # Near the memory ceiling only start more work once some finishes
+                if not governor.admit(len(pending)):
+                    break
+                try:
+                    index, item = next(queue)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(timed(index, item)))
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, result, elapsed, failed = task.result()
+                results[index] = result
+                completed += 1
+                self.observe(elapsed, failed)
+                if on_result:
+                    on_result(index, result, completed, len(items))
+
+        return results
+
+
+# --- Multi-process scraping ---
+SCRAPE_WORKERS = int(os.environ.get("SCRAPE_WORKERS", "1"))
+SCRAPE_WORKER_RESTARTS = 2
+# Name this file is imported under when a spawned process needs its functions
+SPAWN_MODULE = os.path.splitext(os.path.basename(__file__))[0]
+
+
+def spawnable(func):
+    """
+    Return func in a form spawned processes can unpickle. Functions pickle by
+    module and name, and under Streamlit this script runs as a fresh
+    __main__ on every rerun, so those are swapped for the same function from
+    the file imported under SPAWN_MODULE.
+    """
+    module = sys.modules.get(func.__module__)
+    if "streamlit" not in sys.modules and getattr(module, func.__name__, None) is func:
+        return func
+    if SPAWN_MODULE not in sys.modules:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        if script_dir not in sys.path:
+            # Spawned processes inherit sys.path, so they find the file too
+            sys.path.insert(0, script_dir)
+        importlib.import_module(SPAWN_MODULE)
+    return getattr(sys.modules[SPAWN_MODULE], func.__name__)
+
+
+def _shard_worker(shard_id, items, age_group, force_refresh, results, memory_share=None):
+    """
+    Worker process entry point: scrape (index, entrant) items on a private
+    event loop and browser pool, streaming each result to the coordinator.
+
+    memory_share is this worker's slice of the coordinator's memory ceiling.
+    """
+    if memory_share:
+        governor = get_memory_governor()
+        governor.ceiling = memory_share
+        governor.recycle_at = min(governor.recycle_at, memory_share / 2)
+
+    async def run():
+        try:
+            await get_standings_index().prepare(age_group)
+            await AdaptiveScheduler().run(
+                items,
+                lambda item: scrape_player(item[1]["profile"], age_group, force_refresh, item[1]["name"]),
+                on_result=lambda i, player, completed, total: results.put(("result", shard_id, items[i][0], player)),
+            )
+        finally:
+            await close_browser_pool()
+
+    asyncio.run(run())
+    results.put(("trace", shard_id, None, tracer.spans))
+    results.put(("done", shard_id, None, None))
+
+
+def _queue_get(q, timeout):
+    try:
+        return q.get(timeout=timeout)
+    except queue.Empty:
+        return None
+
+
+async def scrape_players_sharded(entrants, age_group, workers: int = SCRAPE_WORKERS,
+                                 force_refresh: bool = False, on_result=None):
+    """
+    Split entrants across worker processes, each with its own event loop and
+    browser pool, and merge the results back in input order.
+
+    A worker that dies has its unfinished players handed to a replacement
+    (up to SCRAPE_WORKER_RESTARTS times per shard); players that still could
+    not be scraped come back as None.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results_queue = ctx.Queue()
+    loop = asyncio.get_event_loop()
+    total = len(entrants)
+    results = [None] * total
+    received = set()
+    pending = {}
+    procs = {}
+    restarts = defaultdict(int)
+
+    def start(shard_id, indices):
+        pending[shard_id] = set(indices)
+        proc = ctx.Process(
+            target=spawnable(_shard_worker),
+            args=(shard_id, [(i, entrants[i]) for i in sorted(indices)], age_group, force_refresh, results_queue,
+                  memory_share),
+            daemon=True,
+        )
+        proc.start()
+        procs[shard_id] = proc
+
+    def handle(message):
+        kind, shard_id, index, player = message
+        if kind == "trace":
+            tracer.merge(player)
+        elif kind == "done":
+            pending.pop(shard_id, None)
+            procs.pop(shard_id).join()
+        elif index not in received:
+            received.add(index)
+            results[index] = player
+            pending.get(shard_id, set()).discard(index)
+            if on_result:
+                on_result(index, player, len(received), total)
+
+    # Interleave so every shard gets a similar mix of fast and slow profiles
+    workers = max(1, min(workers, total))
+    memory_share = get_memory_governor().ceiling / workers
+    for shard_id in range(workers):
+        start(shard_id, range(shard_id, total, workers))
+
+    try:
+        while pending:
+            message = await loop.run_in_executor(None, _queue_get, results_queue, 0.5)
+            if message:
+                handle(message)
+                continue
+
+            for shard_id, proc in list(procs.items()):
+                if proc.is_alive() or shard_id not in pending:
+                    continue
+                # Collect whatever the worker sent before it exited
+                while (message := _queue_get(results_queue, 0.1)) is not None:
+                    handle(message)
+                if shard_id not in pending:
+                    continue
+                procs.pop(shard_id).join()
+                remaining = pending.pop(shard_id) - received
+                if not remaining:
+                    continue
+                if restarts[shard_id] < SCRAPE_WORKER_RESTARTS:
+                    restarts[shard_id] += 1
+                    print(f"Worker {shard_id} died (exit code {proc.exitcode}); reassigning {len(remaining)} players")
+                    start(shard_id, remaining)
+                else:
+                    print(f"Worker {shard_id} died again; giving up on {len(remaining)} players")
+    finally:
+        for proc in procs.values():
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+        results_queue.close()
+
+    return results
+
+
+# --- Job journal ---
+JOURNAL_DB_PATH = os.path.join(CACHE_DIR, "jobs.sqlite3")
+# Journaled players are not resumed once the fastest-moving cached field would be stale
+JOURNAL_MAX_AGE = min(PLAYER_FIELD_TTLS.values())
+
+
+def job_key(tournament_url: str, age_group: str) -> str:
+    return f"{tournament_url.strip().lower()}|{age_group}"
+
+
+class JobJournal:
+    """
+    Durable record of each tournament scrape as it progresses.
+
+    Every completed player is written as soon as it arrives, so a run that
+    dies part way can be resumed and only scrape the players it is missing.
+    A job is marked complete once its report is written; starting a complete
+    job again, or one started more than `max_age` seconds ago, begins a fresh
+    run.
+    """
+
+    def __init__(self, path: str = JOURNAL_DB_PATH, max_age: float = JOURNAL_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_key TEXT PRIMARY KEY,
+                    tournament TEXT NOT NULL,
+                    age_group TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    total INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            # Journals from before the unused idx column was dropped only hold
+            # in-progress runs; start those over rather than migrate them
+            if "idx" in {row[1] for row in self._db.execute("PRAGMA table_info(job_results)")}:
+                self._db.execute("DROP TABLE job_results")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_results (
+                    job_key TEXT NOT NULL,
+                    profile TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    PRIMARY KEY (job_key, profile)
+                )
+                """
+            )
+
+    def start(self, tournament_url: str, age_group: str, total: int, fresh: bool = False):
+        """
+        Open (or resume) a job.
+
+        Args:
+            fresh (bool): Discard any recorded players and start over
+
+        Returns:
+            (key, {profile: player}) with the players already recorded
+        """
+        key = job_key(tournament_url, age_group)
+        now = time.time()
+        row = self._db.execute("SELECT status, created_at FROM jobs WHERE job_key = ?", (key,)).fetchone()
+        with self._db:
+            if fresh or row is None or row[0] == "complete" or now - row[1] > self.max_age:
+                self._db.execute("DELETE FROM job_results WHERE job_key = ?", (key,))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, 'running', ?, ?, ?)",
+                    (key, tournament_url, age_group, total, now, now),
+                )
+            else:
+                self._db.execute("UPDATE jobs SET total = ?, updated_at = ? WHERE job_key = ?", (total, now, key))
+        done = {
+            profile: json.loads(result)
+            for profile, result in self._db.execute(
+                "SELECT profile, result FROM job_results WHERE job_key = ?", (key,)
+            )
+        }
+        return key, done
+
+    def record(self, key: str, profile: str, player: dict):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO job_results VALUES (?, ?, ?, ?)",
+                (key, profile, json.dumps(player), time.time()),
+            )
+            self._db.execute("UPDATE jobs SET updated_at = ? WHERE job_key = ?", (time.time(), key))
+
+    def complete(self, key: str):
+        with self._db:
+            self._db.execute("UPDATE jobs SET status = 'complete', updated_at = ? WHERE job_key = ?", (time.time(), key))
+
+    def list_incomplete(self):
+        """Return dicts describing every job that has not finished and can still be resumed."""
+        rows = self._db.execute(
+            """
+            SELECT j.job_key, j.tournament, j.age_group, j.total, j.updated_at, COUNT(r.profile)
+            FROM jobs j LEFT JOIN job_results r ON r.job_key = j.job_key
+            WHERE j.status != 'complete' AND j.created_at >= ?
+            GROUP BY j.job_key ORDER BY j.updated_at DESC
+            """,
+            (time.time() - self.max_age,),
+        ).fetchall()
+        return [
+            {"key": key, "tournament": tournament, "age_group": age_group, "total": total,
+             "done": done, "updated_at": datetime.fromtimestamp(updated_at)}
+            for key, tournament, age_group, total, updated_at, done in rows
+        ]
+
+    def clear(self, key: str = None):
+        """Delete one job, or every incomplete job when key is None."""
+        with self._db:
+            if key is None:
+                keys = [row[0] for row in self._db.execute("SELECT job_key FROM jobs WHERE status != 'complete'")]
+            else:
+                keys = [key]
+            for k in keys:
+                self._db.execute("DELETE FROM job_results WHERE job_key = ?", (k,))
+                self._db.execute("DELETE FROM jobs WHERE job_key = ?", (k,))
+        return len(keys)
+
+
+_job_journal = None
+
+
+def get_job_journal():
+    """Return the process-wide JobJournal."""
+    global _job_journal
+    if _job_journal is None:
+        _job_journal = JobJournal()
+    return _job_journal
+
+
+# --- Entrant history ---
+@dataclass
+class EntrantChanges:
+    """What changed in an event's field since the previous analysis."""
+
+    since: Optional[datetime] = None
+    added: list = field(default_factory=list)
+    withdrawn: list = field(default_factory=list)
+    entered_cutoff: list = field(default_factory=list)
+    left_cutoff: list = field(default_factory=list)
+
+    def describe(self) -> str:
+        if self.since is None:
+            return "First analysis of this event."
+        parts = []
+        for label, names in (
+            ("added", self.added),
+            ("withdrawn", self.withdrawn),
+            ("now inside the cutoff", self.entered_cutoff),
+            ("now outside the cutoff", self.left_cutoff),
+        ):
+            if names:
+                parts.append(f"{len(names)} {label} ({', '.join(names)})")
+        changes = "; ".join(parts) if parts else "no changes to the field"
+        return f"Since {self.since:%Y-%m-%d %H:%M}: {changes}."
+
+
+class EntrantHistory:
+    """Last entrant list and cutoff of every (tournament, age group), for diffing runs."""
+
+    def __init__(self, path: str = JOURNAL_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entrant_snapshots (
+                    job_key TEXT PRIMARY KEY,
+                    entrants TEXT NOT NULL,
+                    selected TEXT NOT NULL,
+                    taken_at REAL NOT NULL
+                )
+                """
+            )
+        self.last_changes = {}
+
+    def previous(self, key: str):
+        row = self._db.execute(
+            "SELECT entrants, selected, taken_at FROM entrant_snapshots WHERE job_key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"entrants": json.loads(row[0]), "selected": json.loads(row[1]), "taken_at": row[2]}
+
+    def diff(self, key: str, entrants: list):
+        """Compare the current entrant list with the last snapshot."""
+        previous = self.previous(key)
+        changes = EntrantChanges()
+        if previous is not None:
+            changes.since = datetime.fromtimestamp(previous["taken_at"])
+            current = {entrant["profile"]: entrant["name"] for entrant in entrants}
+            changes.added = [name for profile, name in current.items() if profile not in previous["entrants"]]
+            changes.withdrawn = [name for profile, name in previous["entrants"].items() if profile not in current]
+        self.last_changes[key] = changes
+        return changes
+
+    def cutoff_changes(self, key: str, selected: list, names: dict = None):
+        """Fill in which players crossed the cutoff since the last snapshot, without storing anything."""
+        previous = self.previous(key)
+        changes = self.last_changes.setdefault(key, EntrantChanges())
+        if previous is not None:
+            names = names or {}
+            before, after = set(previous["selected"]), set(selected)
+            changes.entered_cutoff = [names.get(p, p) for p in selected if p not in before]
+            changes.left_cutoff = [
+                names.get(p, previous["entrants"].get(p, p)) for p in previous["selected"] if p not in after
+            ]
+        return changes
+
+    def save(self, key: str, entrants: list, selected: list):
+        """Store the field and its in-cutoff profiles as the snapshot the next run is diffed against."""
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entrant_snapshots VALUES (?, ?, ?, ?)",
+                (key, json.dumps({entrant["profile"]: entrant["name"] for entrant in entrants}),
+                 json.dumps(selected), time.time()),
+            )
+
+
+_entrant_history = None
+
+
+def get_entrant_history():
+    """Return the process-wide EntrantHistory."""
+    global _entrant_history
+    if _entrant_history is None:
+        _entrant_history = EntrantHistory()
+    return _entrant_history
+
+
+# --- Tournament metadata ---
+TOURNAMENT_DB_PATH = os.path.join(CACHE_DIR, "tournaments.sqlite3")
+TOURNAMENT_INFO_TTL = 6 * HOUR
+# Draw size when the event page does not give a number: nobody is cut
+UNKNOWN_DRAW_SIZE = 100000
+
+
+@dataclass
+class EventInfo:
+    """
+    One age group's event: its page, draw size and selection order (1 points,
+    2 WTN, None unpublished). available is False when the event page loaded
+    without any details, leaving the defaults in place.
+    """
+
+    age_group: str
+    url: Optional[str] = None
+    draw_size: int = UNKNOWN_DRAW_SIZE
+    sort_type: Optional[int] = None
+    selection: str = ""
+    available: bool = True
+
+
+@dataclass
+class TournamentInfo:
+    """Everything read from a tournament's overview, events and event pages."""
+
+    url: str
+    name: str
+    level: str
+    age_groups: list
+    events: dict = field(default_factory=dict)
+    fetched_at: float = 0.0
+
+    @property
+    def continue_age(self):
+        return self.level in ["Level 7", "Level 6"]
+
+    def as_json(self) -> str:
+        data = dict(self.__dict__)
+        data["events"] = {age: event.__dict__ for age, event in self.events.items()}
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, text: str):
+        data = json.loads(text)
+        data["events"] = {age: EventInfo(**event) for age, event in data["events"].items()}
+        return cls(**data)
+
+
+def tournament_overview_url(link: str) -> str:
+    """The cache key of a tournament: its lower-cased overview URL."""
+    return link.lower().replace("events", "overview")
+
+
+def parse_event_details(texts: list):
+    """Draw size and selection order from an event page's ._bodyXSmall_1iwqn_137 texts."""
+    try:
+        draw_size = int(texts[1])
+    except (IndexError, ValueError):
+        draw_size = UNKNOWN_DRAW_SIZE
+
+    selection = texts[5] if len(texts) > 5 else ""
+    lowered = selection.lower()
+    if "ranking" in lowered or "manual" in lowered:
+        sort_type = 1
+    elif "wtn" in lowered:
+        sort_type = 2
+    else:
+        # "N/A" or first come, first served: the caller has to choose one
+        sort_type = None
+    return draw_size, sort_type, selection
+
+
+async def fetch_tournament_info(url: str) -> TournamentInfo:
+    """
+    Read the overview, the events list and every event page on one leased page.
+
+    A page that times out raises Playwright's TimeoutError, so the directory
+    never stores a partial read. An overview without a name or level comes
+    back empty (and is not stored either); an event page without details
+    leaves its event unavailable.
+    """
+    async with get_browser_pool().lease() as page:
+        await page.goto(url, wait_until="domcontentloaded")
+        outcome = await wait_ready(page, "tournament_overview")
+        if outcome == "timeout":
+            raise playwright_errors.TimeoutError(f"Tournament overview did not load: {url}")
+        if outcome == "absent":
+            return TournamentInfo(url, "", "", [], {}, time.time())
+        name = (await page.locator(f"xpath={TOURNAMENT_NAME_XPATH}").inner_text(
+            timeout=READINESS_FIELD_TIMEOUT)).strip()
+        level = await page.locator(f"xpath={TOURNAMENT_LEVEL_XPATH}").inner_text(timeout=READINESS_FIELD_TIMEOUT)
+        age_groups = (await page.locator("._H6_1iwqn_128").all_inner_texts())[1:]
+
+        events_url = url.replace("overview", "events")
+        await page.goto(events_url, wait_until="domcontentloaded")
+        outcome = await wait_ready(page, "tournament_events")
+        if outcome == "timeout":
+            raise playwright_errors.TimeoutError(f"Tournament events did not load: {events_url}")
+        if outcome == "ready":
+            headers = await page.locator("._H6_1iwqn_128").all_inner_texts()
+            links = await extract_elements(page, "._link_19t7t_285")
+        else:
+            headers, links = [], []
+
+        # The first header is the section title; header i belongs to link i - 1
+        events = {}
+        for index, age_group in enumerate(headers[1:]):
+            href = links[index]["href"] if index < len(links) else None
+            if href and not href.startswith("http"):
+                href = USTA_BASE_URL + href
+            events[age_group] = EventInfo(age_group, href)
+
+        for event in events.values():
+            if not event.url:
+                continue
+            await page.goto(event.url, wait_until="domcontentloaded")
+            outcome = await wait_ready(page, "tournament_event")
+            if outcome == "timeout":
+                raise playwright_errors.TimeoutError(f"Event page did not load: {event.url}")
+            if outcome == "absent":
+                event.available = False
+                continue
+            texts = await page.locator("._bodyXSmall_1iwqn_137").all_inner_texts()
+            await capture_snapshot(page, "usta_event", event.url, tournament=url, age_group=event.age_group)
+            event.draw_size, event.sort_type, event.selection = parse_event_details(texts)
+
+    return TournamentInfo(url, name, level, age_groups, events, time.time())
+
+
+class TournamentDirectory:
+    """
+    Tournament metadata (name, level, age groups and every event's draw size
+    and selection order), fetched in one browser session per tournament and
+    kept on disk for TOURNAMENT_INFO_TTL, so the web app's "Find age groups"
+    and "Analyze tournament" steps and batch jobs share one fetch.
+    """
+
+    def __init__(self, path: str = TOURNAMENT_DB_PATH, ttl: float = TOURNAMENT_INFO_TTL):
+        self.path = path
+        self.ttl = ttl
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tournaments (url TEXT PRIMARY KEY, info TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+        self._inflight = {}
+        self.stats = {"hits": 0, "fetches": 0}
+
+    def cached(self, url: str):
+        row = self._db.execute(
+            "SELECT info FROM tournaments WHERE url = ? AND fetched_at > ?", (url, time.time() - self.ttl)
+        ).fetchone()
+        return TournamentInfo.from_json(row[0]) if row else None
+
+    async def get(self, link: str, force_refresh: bool = False) -> TournamentInfo:
+        """Return the tournament's metadata, fetching it at most once per TTL."""
+        url = tournament_overview_url(link)
+        if not force_refresh:
+            info = self.cached(url)
+            if info is not None:
+                self.stats["hits"] += 1
+                return info
+        if url not in self._inflight:
+            future = self._inflight[url] = asyncio.ensure_future(self._fetch(url))
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # Shielded so a cancelled caller does not cancel the fetch others wait on
+        return await asyncio.shield(self._inflight[url])
+
+    async def _fetch(self, url: str):
+        with tracer.span("tournament.metadata", url=url) as span:
+            info = await fetch_tournament_info(url)
+            span["events"] = len(info.events)
+        self.stats["fetches"] += 1
+        # Only a complete read is worth keeping
+        if info.name and info.level and info.age_groups:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tournaments VALUES (?, ?, ?)", (url, info.as_json(), info.fetched_at)
+                )
+        return info
+
+    def update_event(self, link: str, age_group: str, **fields) -> bool:
+        """Overwrite one stored event's fields (e.g. reparsed from a snapshot); False when not stored or unchanged."""
+        url = tournament_overview_url(link or "")
+        row = self._db.execute("SELECT info FROM tournaments WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return False
+        info = TournamentInfo.from_json(row[0])
+        if age_group not in info.events:
+            return False
+        updated = dataclasses.replace(info.events[age_group], **fields)
+        if updated == info.events[age_group]:
+            return False
+        info.events[age_group] = updated
+        with self._db:
+            self._db.execute("UPDATE tournaments SET info = ? WHERE url = ?", (info.as_json(), url))
+        return True
+
+    def invalidate(self, link: str = None):
+        with self._db:
+            if link is None:
+                self._db.execute("DELETE FROM tournaments")
+            else:
+                self._db.execute("DELETE FROM tournaments WHERE url = ?", (tournament_overview_url(link),))
+
+
+_tournament_directory = None
+
+
+def get_tournament_directory():
+    """Return the process-wide TournamentDirectory."""
+    global _tournament_directory
+    if _tournament_directory is None:
+        _tournament_directory = TournamentDirectory()
+    return _tournament_directory
+
+
+async def age_groups_level(tournament_link):
+    """[level, continue_age, age_groups] of a tournament, or [] when it cannot be read."""
+    try:
+        info = await get_tournament_directory().get(tournament_link)
+    except Exception:
+        return []
+    if not info.level or not info.age_groups:
+        return []
+    return [info.level, info.continue_age, info.age_groups]
+
+
+async def scrape_draw_size(link, selected_age_group):
+    """[draw_size, sort_type] of one event; sort_type is None when no selection order is published."""
+    info = await get_tournament_directory().get(link)
+    event = info.events.get(selected_age_group)
+    if event is None:
+        raise ValueError(f"{selected_age_group!r} is not one of {list(info.events)}")
+    return [event.draw_size, event.sort_type]
+
+
+# --- Player table ---
+# Where an unknown WTN sorts: the bottom of the 40-point scale
+MISSING_WTN = 40.0
+MISSING_RANKING_TEXT = "20,000"
+
+# (level, sort) -> (sort column, descending); other levels always use points, best first
+SORT_RULES = {
+    ("Level 7", 1): ("points", False),
+    ("Level 7", 2): ("wtn", True),
+    ("Level 6", 1): ("points", True),
+    ("Level 6", 2): ("wtn", False),
+}
+
+
+def parse_utr(text):
+    """UTR as a float; "12.xx" (hidden decimals) counts as 12.0, placeholders and "?" as NaN."""
+    import numpy as np
+
+    text = (text or "").strip().lower()
+    if text in PLAYER_FIELD_PLACEHOLDERS["UTR"]:
+        return np.nan
+    try:
+        return float(text[:-3] if text.endswith(".xx") else text)
+    except ValueError:
+        return np.nan
+
+
+class PlayerTable:
+    """
+    One field's players as typed columns.
+
+    Numbers are parsed once when the table is built; ordering, cutoff and
+    seeding work on the NumPy columns. Text columns are object arrays so one
+    index array reorders every column. Unknown values are NaN (wtn, utr) or
+    0 (points, ranking); failed marks players whose scrape failed.
+    """
+
+    __slots__ = ("name", "profile", "location", "district", "recruiting", "grade", "utr_text",
+                 "wtn", "points", "ranking", "utr", "failed")
+
+    # Column -> (player dict key, default)
+    TEXT_FIELDS = {
+        "name": ("Name", "Unknown"),
+        "profile": ("Profile", "Unknown"),
+        "location": ("Location", "Unknown"),
+        "district": ("District", "Unknown"),
+        "recruiting": ("Recruiting", "Unknown"),
+        "grade": ("Class", "Unknown"),
+        "utr_text": ("UTR", "0.xx"),
+    }
+
+    @classmethod
+    def from_players(cls, players: list):
+        """Build the table from scrape_player dicts, skipping failed (None) entries."""
+        import numpy as np
+
+        players = [player for player in players if player and isinstance(player, dict)]
+        table = cls()
+        for column, (key, default) in cls.TEXT_FIELDS.items():
+            values = np.empty(len(players), dtype=object)
+            values[:] = [player.get(key) or default for player in players]
+            setattr(table, column, values)
+
+        wtn_placeholders = PLAYER_FIELD_PLACEHOLDERS["WTN"]
+        ranking_placeholders = PLAYER_FIELD_PLACEHOLDERS["Ranking"]
+        wtn, points, ranking = [], [], []
+        for player in players:
+            text = str(player.get("WTN", ""))
+            try:
+                wtn.append(np.nan if text in wtn_placeholders else float(text))
+            except ValueError:
+                wtn.append(np.nan)
+            points.append(parse_int(str(player.get("Points", ""))) or 0)
+            text = str(player.get("Ranking", ""))
+            ranking.append(0 if text in ranking_placeholders else parse_int(text) or 0)
+        table.wtn = np.array(wtn, dtype=np.float64)
+        table.points = np.array(points, dtype=np.int64)
+        table.ranking = np.array(ranking, dtype=np.int64)
+        table.utr = np.array([parse_utr(text) for text in table.utr_text], dtype=np.float64)
+        table.failed = np.array([bool(player.get("Failed")) for player in players], dtype=bool)
+        return table
+
+    def __len__(self):
+        return len(self.wtn)
+
+
+@dataclass
+class FieldRanking:
+    """Selection order, cutoff and seeds of one event."""
+
+    order: "np.ndarray"  # table row of each position, in selection order
+    sort_type: str  # "points", "wtn", "mixed", or "" when entry order is kept
+    cutoff: int  # positions below this make the draw
+    seeds: "np.ndarray"  # seed of each position, 0 when unseeded
+
+
+def seed_count(draw: int) -> int:
+    """Seeds in a draw of this many players: half the largest power of two that fits."""
+    return 1 << (draw.bit_length() - 2) if draw >= 2 else 0
 
-# --- Session state for browser ---
-if "playwright_browser" not in st.session_state:
-    st.session_state.playwright_browser = None
-if "playwright_page" not in st.session_state:
-    st.session_state.playwright_page = None
 
+def rank_field(table: PlayerTable, tournament_level: str, sort, draw_size, field_size: int = None):
+    """
+    Order the field for the level and sort, cut it at the draw size and seed
+    the players inside the draw by WTN, lowest first. Ties keep entry order
+    and players without a WTN are never seeded.
 
-# Fix for Windows + Playwright async subprocesses
-if sys.platform.startswith("win"):
-    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    Args:
+        field_size (int): Entrant count the seeds are sized from; defaults to len(table)
+    """
+    import numpy as np
+
+    rows = np.arange(len(table))
+    level = next((level for level in ("Level 7", "Level 6") if level in tournament_level), None)
+    if level is None:
+        column, descending, sort_type = "points", True, "mixed"
+    elif (level, sort) in SORT_RULES:
+        column, descending = SORT_RULES[(level, sort)]
+        sort_type = column
+    else:
+        column, descending, sort_type = None, False, ""
 
+    if column is None:
+        order = rows
+    else:
+        key = table.points.astype(np.float64) if column == "points" else np.nan_to_num(table.wtn, nan=MISSING_WTN)
+        # lexsort is stable on its last key; rows breaks remaining ties by entry order
+        order = np.lexsort((rows, -key if descending else key))
 
-# Force install if missing
-if not os.path.exists(os.path.expanduser("~/.cache/ms-playwright")):
-    os.system("playwright install chromium")
+    draw_size = int(draw_size)
+    cutoff = min(draw_size, len(table))
+    seeds = np.zeros(len(order), dtype=np.int64)
+    in_draw = table.wtn[order[:cutoff]]
+    known = np.flatnonzero(~np.isnan(in_draw))
+    seeded = known[np.lexsort((known, in_draw[known]))][:seed_count(min(draw_size, field_size or len(table)))]
+    seeds[seeded] = np.arange(1, len(seeded) + 1)
+    return FieldRanking(order, sort_type, cutoff, seeds)
 
 
-async def setup_browser(retries: int = 3, timeout: int = 60000):
+# --- Progressive results ---
+# Seconds between live table updates while players are scraped
+PROGRESSIVE_REFRESH = 1.0
 
-    playwright = await async_playwright().start()
 
-    browser = await playwright.chromium.launch(
-        headless=True,
-        args=[
-            "--disable-blink-features=AutomationControlled",
-            "--disable-infobars",
-            "--no-sandbox",
-            "--disable-dev-shm-usage",
-            "--disable-gpu",
-            "--single-process",
-            "--disable-software-rasterizer",
-            "--window-size=1920,1080",
-            "--start-maximized",
-            "--ignore-certificate-errors",
-            "--disable-extensions",
-        ],
+def provisional_player(entrant: dict, age_group: str):
+    """
+    An entrant's best locally known record before it is scraped: cached
+    fields however old, points and rank from the loaded standings list, and
+    placeholders for the rest.
+    """
+    player = {**UNKNOWN_PLAYER, "Name": entrant["name"], "Profile": entrant["profile"]}
+    player.update(get_player_cache().peek(entrant["profile"]))
+    joined = get_standings_index().lookup(
+        age_group, entrant["profile"], entrant["name"], player.get("Location"), count=False
     )
+    if joined is not None:
+        player["Points"], player["Ranking"] = str(joined[0]), str(joined[1])
+    return player
 
 
-    context = await browser.new_context(
-        viewport={"width": 1920, "height": 1080},
-        user_agent=(
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/115.0.0.0 Safari/537.36"
-        ),
-        java_script_enabled=True,
-        device_scale_factor=1,
-        is_mobile=False,
-        has_touch=False,
-    )
+def cutoff_priority(table: PlayerTable, ranking: FieldRanking):
+    """
+    Per table row, how far its provisional position is from the draw
+    cutoff. Rows with nothing known (no points, no WTN) could land anywhere,
+    so they count as on the cutoff.
+    """
+    import numpy as np
 
-    page = await context.new_page()
+    positions = np.empty(len(table), dtype=np.float64)
+    positions[ranking.order] = np.arange(len(table))
+    distance = np.abs(positions - (ranking.cutoff - 0.5))
+    unknown = (table.points == 0) & np.isnan(table.wtn)
+    return np.where(unknown, 0.0, distance)
 
-    # Hide Playwrightautomation fingerprints
-    await page.add_init_script("""
-        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-        Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3]});
-        Object.defineProperty(navigator, 'languages', {get: () => ['en-US','en']});
-        window.chrome = { runtime: {} };
-    """)
 
-    async def goto_full(url: str, wait_for: str = None):
-        """
-        Navigate to a page with retries, scrolling, and optional selector wait.
-        
-        Args:
-            url (str): URL to visit
-            wait_for (str): CSS selector to wait for (optional)
-        """
-        if not url or not isinstance(url, str):
-            raise ValueError(f"Invalid URL passed to goto_full: {url}")
+# --- Field analytics ---
+ANALYTICS_DIR = os.path.join(CACHE_DIR, "analytics")
+# Segments (one per analysed field) merged into the base file once there are this many
+ANALYTICS_COMPACT_SEGMENTS = 64
+ANALYTICS_PERCENTILES = (10, 25, 50, 75, 90)
+# Star label -> stars; unknown ratings are -1
+STAR_CODES = {label: len(RECRUITING_STAR_LABELS) - 1 - i for i, (_, label) in enumerate(RECRUITING_STAR_LABELS)}
+STAR_LABELS = {code: label for label, code in STAR_CODES.items()}
 
-        if url.startswith("/"):
-            url = "https://playtennis.usta.com" + url
-        elif not url.startswith("http"):
-            url = "https://" + url.lstrip("/")
 
-        for attempt in range(retries):
-            try:
-                await asyncio.wait_for(
-                    page.goto(url, wait_until="domcontentloaded"),
-                    timeout=timeout / 1000
-                )
+class FieldFrame:
+    """
+    Player rows of many analysed fields as NumPy columns, and queries over them.
 
-                # ait for specific selector if provided
-                if wait_for:
-                    await page.wait_for_selector(wait_for, timeout=timeout)
-
-                # Small delay to let JS load
-                await asyncio.sleep(2)
-
-                # Scroll to bottom for dynamic content
-                last_height = 0
-                while True:
-                    await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
-                    await asyncio.sleep(1)
-                    new_height = await page.evaluate("document.body.scrollHeight")
-                    if new_height == last_height:
-                        break
-                    last_height = new_height
-
-                # Log partial HTML for debugging
-                html_preview = await page.content()
-                
-                # Break loop if selector exists or assume page loaded
-                if not wait_for or await page.query_selector(wait_for):
-                    break
+    rows: wtn, points, ranking, utr, stars, district, selected, position and
+    field (index into fields). fields: field_id, tournament, name, age_group,
+    level, draw_size and analyzed_at, one entry per field.
+    """
 
-            except (asyncio.TimeoutError, PlaywrightTimeoutError) as e:
-                await asyncio.sleep(3)  # wait before retry
+    def __init__(self, rows: dict, fields: dict):
+        self.rows = rows
+        self.fields = fields
 
-    # Attach helper function to page
-    page.goto_full = goto_full
+    def __len__(self):
+        return len(self.rows["field"])
 
-    return playwright, browser, context, page
+    @property
+    def field_count(self):
+        return len(self.fields["field_id"])
 
-async def age_groups_level(tournament_link):
-    playwright, browser, context, page = await setup_browser()
-    await page.goto(tournament_link.lower())
+    def subset(self, keep_fields, keep_rows=None):
+        """The frame restricted to a field mask (and optionally a row mask), fields renumbered."""
+        import numpy as np
 
-    try:
-        await page.wait_for_selector("._H6_1iwqn_128", timeout=10000)
-        age_groups = await page.locator("._H6_1iwqn_128").all_inner_texts()
+        keep_fields = np.asarray(keep_fields, dtype=bool)
+        renumber = np.cumsum(keep_fields) - 1
+        mask = keep_fields[self.rows["field"]]
+        if keep_rows is not None:
+            mask &= keep_rows
+        rows = {name: column[mask] for name, column in self.rows.items()}
+        rows["field"] = renumber[rows["field"]].astype(np.int32)
+        return FieldFrame(rows, {name: column[keep_fields] for name, column in self.fields.items()})
 
-        level_xpath = "/html/body/div[4]/div/div/div[2]/div[3]/div[1]/div[2]/div[2]/div/div/div[1]/div/div/div[1]/h6"
-        await page.wait_for_selector(f"xpath={level_xpath}", timeout=10000)
-        level = await page.locator(f"xpath={level_xpath}").inner_text()
+    def where(self, age_group=None, level=None, tournament=None, field_id=None, district=None,
+              since: datetime = None, until: datetime = None, selected: bool = None, exclude_field: str = None):
+        """Filter by field attributes, player district and whether players made the draw."""
+        import numpy as np
 
-        continue_age = level in ["Level 7", "Level 6"]
-        age_groups_final = age_groups[1:]
+        fields = self.fields
+        keep = np.ones(self.field_count, dtype=bool)
+        if age_group is not None:
+            keep &= fields["age_group"] == age_group
+        if level is not None:
+            keep &= np.char.find(fields["level"], level) >= 0
+        if tournament is not None:
+            keep &= fields["tournament"] == tournament.strip().lower()
+        if field_id is not None:
+            keep &= fields["field_id"] == field_id
+        if exclude_field is not None:
+            keep &= fields["field_id"] != exclude_field
+        if since is not None:
+            keep &= fields["analyzed_at"] >= since.timestamp()
+        if until is not None:
+            keep &= fields["analyzed_at"] < until.timestamp()
+        rows = None
+        if district is not None:
+            rows = self.rows["district"] == district
+        if selected is not None:
+            rows = (self.rows["selected"] == selected) if rows is None else rows & (self.rows["selected"] == selected)
+        return self.subset(keep, rows)
 
-        return [level, continue_age, age_groups_final]
-    except:
-        return []
-    finally:
-        await context.close()
-        await browser.close()
-        await playwright.stop()
+    def values(self, column: str):
+        """Known values of a column: NaN WTN/UTR and zero points/rankings are dropped."""
+        import numpy as np
 
+        values = self.rows[column]
+        if values.dtype.kind == "f":
+            return values[~np.isnan(values)]
+        return values[values > 0]
 
-def parse_wtn(wtn_str):
-    try:
-        return float(wtn_str)
-    except ValueError:
-        return 40.0
+    def percentiles(self, column: str, q=ANALYTICS_PERCENTILES):
+        """{q: value} of the column's known values; empty when there are none."""
+        import numpy as np
 
+        values = self.values(column)
+        if not len(values):
+            return {}
+        return dict(zip(q, np.percentile(values, q).tolist()))
 
-def sort_key(k):
-    try:
-        return float(k)
-    except ValueError:
-        return float('inf')
+    def histogram(self, column: str, bins=10):
+        """(counts, edges) of the column's known values, as numpy.histogram."""
+        import numpy as np
 
+        return np.histogram(self.values(column), bins=bins)
 
-async def scrape_recruiting(name, location, page):
-    player_rating = "Unknown"
-    player_year = "Unknown"
-    player_utr = "0.xx"
-    retries = 0
-    max_retries = 5   # prevent infinite loop
+    def utr_levels(self):
+        """(levels, counts) per whole UTR, plus the count of players without a UTR."""
+        import numpy as np
 
-    player_grades = ["Graduate","Senior","Junior","Sophomore","Freshman",
-                     "8th Grader","7th Grader","6th Grader"]
+        utr = self.rows["utr"]
+        known = ~np.isnan(utr)
+        levels, counts = np.unique(np.floor(utr[known]).astype(np.int64), return_counts=True)
+        return levels, counts, int(len(utr) - known.sum())
 
-    player_rating_xpath = "//*[@id='CenterColumn']/table[1]/tbody/tr/td[2]/table/tbody/tr[4]/td/img"
-    player_year_xpath = "//*[@id='CenterColumn']/table[1]/tbody/tr/td[2]/table/tbody/tr[3]/td[2]/div[3]"
+    def star_mix(self):
+        """{star label: players}, best rating first, "Unknown" last."""
+        import numpy as np
 
-    while (player_rating == "Unknown" or player_year == "Unknown" or player_utr == "0.xx") and retries < max_retries:
-        retries += 1
-        await page.goto("https://www.tennisrecruiting.net/player.asp")
+        codes, counts = np.unique(self.rows["stars"], return_counts=True)
+        mix = {STAR_LABELS.get(int(code), "Unknown"): int(count) for code, count in zip(codes[::-1], counts[::-1])}
+        return mix
 
-        await page.fill("input[name=f_playername]", name)
-        await page.keyboard.press("Enter")
+    def cutoff_strength(self, top_n: int = 8):
+        """
+        Per field: mean WTN of the top_n players and WTN of the last player
+        inside the draw, as {"field_id", "top_wtn", "cutoff_wtn"} dicts.
+        """
+        import numpy as np
 
-        try:
-            await page.wait_for_selector(f"xpath={player_rating_xpath}", timeout=10000)
-            player_rating = page.locator(f"xpath={player_rating_xpath}")
-        except:
-            player_rating = "Unknown"
+        field, position, wtn = self.rows["field"], self.rows["position"], self.rows["wtn"]
+        fields = self.field_count
+        known = ~np.isnan(wtn)
+        top = known & (position < top_n)
+        top_count = np.bincount(field[top], minlength=fields)
+        top_sum = np.bincount(field[top], weights=wtn[top], minlength=fields)
+        selected = np.bincount(field[self.rows["selected"]], minlength=fields)
+        cutoff_wtn = np.full(fields, np.nan)
+        last = position == selected[field] - 1
+        cutoff_wtn[field[last]] = wtn[last]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            top_wtn = top_sum / top_count
+        return [
+            {"field_id": field_id, "top_wtn": top, "cutoff_wtn": cutoff}
+            for field_id, top, cutoff in zip(self.fields["field_id"].tolist(), top_wtn.tolist(), cutoff_wtn.tolist())
+        ]
 
-        try:
-            await page.wait_for_selector("text=.xx", timeout=5000)
-            player_utr = await page.locator("text=.xx").nth(0).inner_text()
-        except:
-            player_utr = "0.xx"
+    def trend(self, column: str, q: float = 50, period: str = "M"):
+        """[(period, percentile q of the column)] by analysis date, oldest first; period is "D", "W" or "M"."""
+        import numpy as np
 
-        try:
-            await page.wait_for_selector(f"xpath={player_year_xpath}", timeout=5000)
-            player_year = await page.locator(f"xpath={player_year_xpath}").inner_text()
-            for grade in player_grades:
-                if grade in player_year:
-                    player_year = grade
-                    if "Provisional" in player_year:
-                        player_year = player_year + "?"
-                    break
-        except:
-            player_year = "Unknown"
+        stamps = self.fields["analyzed_at"].astype("datetime64[s]").astype(f"datetime64[{period}]")
+        row_periods = stamps[self.rows["field"]]
+        values = self.rows[column]
+        known = ~np.isnan(values) if values.dtype.kind == "f" else values > 0
+        trend = []
+        for each in np.unique(stamps):
+            selected = values[known & (row_periods == each)]
+            if len(selected):
+                trend.append((str(each), float(np.percentile(selected, q))))
+        return trend
 
-    # if rating never loads, return placeholder image
-    if player_rating == "Unknown":
-        return ["https://www.tennisrecruiting.net/img/record.gif", player_utr, player_year]
 
-    return [await player_rating.get_attribute("src"), player_utr, player_year]
+def empty_field_frame():
+    import numpy as np
 
+    rows = {
+        "wtn": np.empty(0), "points": np.empty(0, np.int64), "ranking": np.empty(0, np.int64),
+        "utr": np.empty(0), "stars": np.empty(0, np.int8), "district": np.empty(0, str),
+        "selected": np.empty(0, bool), "position": np.empty(0, np.int32), "field": np.empty(0, np.int32),
+    }
+    fields = {
+        "field_id": np.empty(0, str), "tournament": np.empty(0, str), "name": np.empty(0, str),
+        "age_group": np.empty(0, str), "level": np.empty(0, str), "draw_size": np.empty(0, np.int64),
+        "analyzed_at": np.empty(0),
+    }
+    return FieldFrame(rows, fields)
 
-async def scrape_usta(player_link, age_group, max_retries: int = 5):
-    retries = 0
-    while retries < max_retries:
-        retries += 1
-        playwright, browser, context, page = await setup_browser()   
-        
-        try:
-            await page.goto(player_link, wait_until="networkidle")
-            await page.wait_for_timeout(5000)  # give JS time to render
-        
-            try:
-                player_name_selector = "//*[@id='container-cdeaf649fc']/div/div[1]/div[1]/div/div/span/h3"
-                await page.wait_for_selector(f"xpath={player_name_selector}", timeout=10000)
-                locator = page.locator(player_name_selector)
-                player_name = await locator.text_content()
-                player_name = player_name.strip()
-            except:
-                player_name = "Unknown Player"
-            
-            try:
-                await page.wait_for_selector(".readonly-text__content", timeout=10000)
-                player_location = await page.locator(".readonly-text__content").nth(1).inner_text()
-                player_location = player_location.split('|')[1].split('Section:')[0].strip("\n")
-            except:
-                player_location = "Unknown"
 
-            try:
-                await page.wait_for_selector(".readonly-text__content", timeout=10000)
-                player_district = await page.locator(".readonly-text__content").nth(1).inner_text()
-                player_district = player_district.split("|")[2].split(": ")[1]
-            except:
-                player_district = "Unknown"
+def concat_field_frames(frames: list):
+    """One frame of all the given frames; a field analysed twice the same day keeps its latest analysis."""
+    import numpy as np
 
-            try:
-                player_wtn_xpath = "/html/body/div[5]/div/div[2]/div/div/div[3]/div/div/div[2]/div/div/div[2]/div/div[3]/div/div/div/div[2]/div/form/div[3]/div/div/div/div[1]/div/div[2]/div[1]/div/p"
-                await page.wait_for_selector(f"xpath={player_wtn_xpath}", timeout=10000)
-                player_wtn = await page.locator(f"xpath={player_wtn_xpath}").inner_text()
-            except:
-                player_wtn = "40.00"
+    frames = [frame for frame in frames if frame.field_count]
+    if not frames:
+        return empty_field_frame()
+    offsets = np.cumsum([0] + [frame.field_count for frame in frames[:-1]])
+    rows = {name: np.concatenate([frame.rows[name] for frame in frames]) for name in frames[0].rows}
+    rows["field"] = np.concatenate([frame.rows["field"] + offset for frame, offset in zip(frames, offsets)])
+    fields = {name: np.concatenate([frame.fields[name] for frame in frames]) for name in frames[0].fields}
+    combined = FieldFrame(rows, fields)
 
-            player_points = "0"
-            player_rank = "20000"
+    # Latest analysis per field_id wins
+    order = np.lexsort((-fields["analyzed_at"], fields["field_id"]))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = fields["field_id"][order][1:] != fields["field_id"][order][:-1]
+    keep = np.zeros(len(order), dtype=bool)
+    keep[order[first]] = True
+    return combined if keep.all() else combined.subset(keep)
 
-            try:
-                await page.goto(player_link + "&tab=rankings")
-                await page.wait_for_selector(".v-grid-cell__content", timeout=10000)
-                player_ranking_info = await page.locator(".v-grid-cell__content").all_inner_texts()  
-                player_data = []
-                i = 0
-                while i < len(player_ranking_info):
-                    player_data.append([
-                        player_ranking_info[i],
-                        player_ranking_info[i + 1],
-                        player_ranking_info[i + 2],
-                        player_ranking_info[i + 3],
-                        player_ranking_info[i + 4]
-                    ])
-                    i += 5
-                for player in player_data:
-                    if (age_group.split(" ")[1] + " National Standings List") in player[0]:
-                        player_points = player[1]
-                        player_rank = player[2]
-            except:
-                player_points = "0"
-                player_rank = "20,000"
 
-            try:
-                recruiting_rating = await scrape_recruiting(player_name, player_location, page)
-            except:
-                recruiting_rating = ["https://www.tennisrecruiting.net/img/record.gif","0.xx","Unknown"]
-
-            if "0star" in recruiting_rating[0]:
-                recruiting_rating[0] = "0 Star"
-            elif "1star" in recruiting_rating[0]:
-                recruiting_rating[0] = "1 Star"
-            elif "2star" in recruiting_rating[0]:
-                recruiting_rating[0] = "2 Star"
-            elif "3star" in recruiting_rating[0]:
-                recruiting_rating[0] = "3 Star"
-            elif "4star" in recruiting_rating[0]:
-                recruiting_rating[0] = "4 Star"
-            elif "5star" in recruiting_rating[0]:
-                recruiting_rating[0] = "5 Star"
-            elif "6star" in recruiting_rating[0]:
-                recruiting_rating[0] = "Blue Chip"
-            else:
-                recruiting_rating[0] = "Unknown"
+class AnalyticsStore:
+    """
+    Every analysed field, kept on disk as compressed .npz column files.
 
-            await context.close()
-            await browser.close()
-            await playwright.stop()
+    Each analysis writes one segment named after its field id (tournament,
+    age group and day), so re-running a field the same day replaces it.
+    Segments are merged into base.npz once there are
+    ANALYTICS_COMPACT_SEGMENTS of them. frame() loads everything into one
+    FieldFrame and keeps it until a file changes.
+    """
 
-            return [
-                player_name, player_location, player_district,
-                player_wtn, player_points, player_rank,
-                recruiting_rating[0], recruiting_rating[1], recruiting_rating[2]
-            ]
+    def __init__(self, path: str = ANALYTICS_DIR):
+        self.path = path
+        self.segments_dir = os.path.join(path, "segments")
+        os.makedirs(self.segments_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._frame = None
+        self._signature = None
 
-        except Exception as e:
-            try:
-                await context.close()
-                await browser.close()
-                await playwright.stop()
-            except:
-                pass
-            if retries >= max_retries:
-                return [
-                    "Unknown", "Unknown", "Unknown", "40.00", "0", "20,000",
-                    "Unknown", "0.xx", "Unknown"
-                ]
+    @property
+    def base_path(self):
+        return os.path.join(self.path, "base.npz")
 
-async def scrape_draw_size(link, selected_age_group):
-    playwright, browser, context, page = await setup_browser()
-    await page.goto(link)
+    def _files(self):
+        segments = sorted(
+            os.path.join(self.segments_dir, name) for name in os.listdir(self.segments_dir) if name.endswith(".npz")
+        )
+        return ([self.base_path] if os.path.exists(self.base_path) else []) + segments
 
-    tournament_groups_final = []
-    await page.wait_for_selector("._H6_1iwqn_128", timeout=10000)
-    tournament_age_groups = await page.locator("._H6_1iwqn_128").all_inner_texts()
+    @staticmethod
+    def _write(path: str, frame: FieldFrame):
+        # Write beside the target and rename, so readers never see a partial file
+        import numpy as np
 
-    await page.wait_for_selector("._link_19t7t_285", timeout=10000)
-    links = await page.query_selector_all("._link_19t7t_285")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f, **{f"row_{name}": column for name, column in frame.rows.items()},
+                **{f"field_{name}": column for name, column in frame.fields.items()},
+            )
+        os.replace(tmp, path)
 
-    for age_group in tournament_age_groups:
-        tournament_groups_final.append(age_group)
+    @staticmethod
+    def _read(path: str):
+        import numpy as np
 
-    tournament_link_final = await links[tournament_groups_final.index(selected_age_group) - 1].get_attribute("href")
-    if tournament_link_final and not tournament_link_final.startswith("http"):
-        tournament_link_final = "https://playtennis.usta.com" + tournament_link_final
-    await page.goto(tournament_link_final)
+        with np.load(path) as data:
+            rows = {name[4:]: data[name] for name in data.files if name.startswith("row_")}
+            fields = {name[6:]: data[name] for name in data.files if name.startswith("field_")}
+        return FieldFrame(rows, fields)
 
-    await page.wait_for_selector("._bodyXSmall_1iwqn_137", timeout=10000)
-    tournament_draw_temp = await page.locator("._bodyXSmall_1iwqn_137").all_inner_texts()
+    def record(self, field_key: str, tournament: str, name: str, age_group: str, level: str, draw_size: int,
+               table: PlayerTable, ranking: FieldRanking, analyzed_at: float = None) -> str:
+        """Store one analysed field in selection order and return its field id."""
+        import numpy as np
 
-    try:
-        tournament_draw_size = int(tournament_draw_temp[1])
-    except:
-        tournament_draw_size = 100000
+        analyzed_at = analyzed_at or time.time()
+        field_id = f"{field_key}|{datetime.fromtimestamp(analyzed_at):%Y-%m-%d}"
+        order = ranking.order
+        positions = np.arange(len(order), dtype=np.int32)
+        frame = FieldFrame(
+            {
+                "wtn": table.wtn[order],
+                "points": table.points[order],
+                "ranking": table.ranking[order],
+                "utr": table.utr[order],
+                "stars": np.array([STAR_CODES.get(label, -1) for label in table.recruiting[order]], dtype=np.int8),
+                "district": table.district[order].astype(str),
+                "selected": positions < ranking.cutoff,
+                "position": positions,
+                "field": np.zeros(len(order), dtype=np.int32),
+            },
+            {
+                "field_id": np.array([field_id]),
+                "tournament": np.array([tournament.strip().lower()]),
+                "name": np.array([name]),
+                "age_group": np.array([age_group]),
+                "level": np.array([level or ""]),
+                "draw_size": np.array([int(draw_size)], dtype=np.int64),
+                "analyzed_at": np.array([analyzed_at]),
+            },
+        )
+        segment = hashlib.sha1(field_id.encode("utf-8")).hexdigest()[:16] + ".npz"
+        with self._lock:
+            self._write(os.path.join(self.segments_dir, segment), frame)
+            if len(self._files()) > ANALYTICS_COMPACT_SEGMENTS:
+                self._compact()
+        return field_id
 
-    sort_type = tournament_draw_temp[5]
-    if "ranking" in sort_type.lower():
-        sort_type = 1
-    elif "wtn" in sort_type.lower():
-        sort_type = 2
-    elif "manual" in sort_type.lower():
-        sort_type = 1
-    elif ("n/a" == sort_type.lower()) or ("first" in sort_type.lower()):
-        print("1.Points\n2.WTN")
-        sort_type = str(input("Choose a selection type: "))
-        if sort_type == "1":
-            sort_type = 1
-        elif sort_type == "2":
-            sort_type = 2
+    def _compact(self):
+        files = self._files()
+        merged = concat_field_frames([self._read(path) for path in files])
+        self._write(self.base_path, merged)
+        for path in files:
+            if path != self.base_path:
+                os.remove(path)
 
-    await context.close()
-    await browser.close()
-    await playwright.stop()
+    def frame(self) -> FieldFrame:
+        """Every stored field, loaded once and reused until the files change."""
+        with self._lock:
+            files = self._files()
+            signature = [(path, os.stat(path).st_mtime_ns) for path in files]
+            if signature != self._signature:
+                self._frame = concat_field_frames([self._read(path) for path in files])
+                self._signature = signature
+            return self._frame
 
-    return [tournament_draw_size, sort_type]
+    def query(self, **filters) -> FieldFrame:
+        """frame().where(**filters)"""
+        return self.frame().where(**filters)
 
 
-async def scrape_player(player_link, age_group):
-    try:
-        player_info = await scrape_usta(player_link, age_group)
-        return {
-            "Name": player_info[0],
-            "Profile": player_link,
-            "Location": player_info[1],
-            "District": player_info[2],
-            "WTN": player_info[3],
-            "Points": player_info[4],
-            "Ranking": player_info[5],
-            "Recruiting": player_info[6],
-            "Class": player_info[8],
-            "UTR": player_info[7],
-        }
-    except:
-        return {
-            "Name": "Unknown",
-            "Profile": "",
-            "Location": "Unknown",
-            "District": "Unknown",
-            "WTN": "40.00",
-            "Points": "0",
-            "Ranking": "20,000",
-            "Recruiting": "Unknown",
-            "Class": "Unknown",
-            "UTR": "0.xx",
-        }
+_analytics_store = None
 
 
-def sort_players(player_data, tournament_level, sort):
-    sort_type = ""
-    if "Level 7" in tournament_level:
-        if sort == 1:
-            sort_type = "points"
-            player_data = sorted(player_data,key=lambda x: float(x["Points"].replace(",", "")) if x["Points"].replace(",", "").isdigit() else 0)
-        elif sort == 2:
-            sort_type = "wtn"
-            player_data = sorted(player_data, key=lambda x: parse_wtn(x["WTN"]), reverse=True)
-    elif "Level 6" in tournament_level:
-        if sort == 1:
-            sort_type = "points"
-            player_data = sorted(player_data,key=lambda x: float(x["Points"].replace(",", "")) if x["Points"].replace(",", "").isdigit() else 0, reverse=True)
-        elif sort == 2:
-            sort_type = "wtn"
-            player_data = sorted(player_data, key=lambda x: parse_wtn(x["WTN"]))
-    else:
-        sort_type = "mixed"
-        player_data = sorted(player_data,key=lambda x: float(x["Points"].replace(",", "")) if x["Points"].replace(",", "").isdigit() else 0, reverse=True)
+def get_analytics_store():
+    """Return the process-wide AnalyticsStore."""
+    global _analytics_store
+    if _analytics_store is None:
+        _analytics_store = AnalyticsStore()
+    return _analytics_store
 
-    return [player_data, sort_type]
 
+def format_wtn(value):
+    import numpy as np
 
-async def scrape_tournament_data(tournament_url, age_group, draw_size, sort, tournament_level):
-    playwright, browser, context, page = await setup_browser()
-    tournament_url = tournament_url.lower()
-    await page.goto(tournament_url)
-    tournament_name = await page.locator("//*[@id='tournaments']/div/div/div/div[1]/div/div[1]/h1").inner_text()
-
-    await page.goto(tournament_url.replace("overview", "players"))
-    await page.wait_for_selector("._alignLeft_1nqit_268", timeout=10000)
-    players_list = await page.query_selector_all("._alignLeft_1nqit_268")
-
-    player_links = []
-    for player_row in players_list:
-        text = await player_row.inner_text()
-        if age_group in text:
-            link = await players_list[players_list.index(player_row) - 1].query_selector("a")
-            href = await link.get_attribute('href')
-            player_links.append(href)
-    
-    if not player_links:
-        print("No player links found. Exiting.")
-        return
+    return "-" if value is None or np.isnan(value) else f"{value:.2f}"
 
-    print("Found", len(player_links), "players. Starting information search...")
 
-    # Create a progress bar in Streamlit
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+def field_summary(store: AnalyticsStore, field_id: str):
+    """
+    The PDF's summary lines (ReportLab markup) for one stored field: its UTR
+    levels, WTN spread, recruiting stars and cutoff, compared with every other
+    stored field of the same age group.
+    """
+    import numpy as np
 
-    total_players = len(player_links)
-    results = []
+    this = store.query(field_id=field_id)
+    if not len(this):
+        return []
+    age_group = str(this.fields["age_group"][0])
+    others = store.query(age_group=age_group, exclude_field=field_id)
+    total = len(this)
+    lines = []
 
-    # Helper to run tasks in batches
-    async def gather_in_batches(tasks, batch_size=3):
-        nonlocal results
-        for i in range(0, len(tasks), batch_size):
-            batch = tasks[i:i + batch_size]
-            batch_results = await asyncio.gather(*batch)
-            results.extend(batch_results)
+    levels, counts, unknown = this.utr_levels()
+    # Players without a UTR are listed as 0.xx, the placeholder the report has always shown
+    by_level = {0: unknown} if unknown else {}
+    for level, count in zip(levels.tolist(), counts.tolist()):
+        by_level[level] = by_level.get(level, 0) + count
+    for level, count in sorted(by_level.items()):
+        pct = round(100 * count / total, 2)
+        if count == 1:
+            lines.append(f" - There is <b>{count}</b> UTR rated <b>{level}.xx</b> in this tournament (<b>{pct}%</b>).")
+        else:
+            lines.append(f" - There are <b>{count}</b> UTRs rated <b>{level}.xx</b> in this tournament (<b>{pct}%</b>).")
 
-            # Update progress bar
-            progress = min(int((len(results) / total_players) * 100), 100)
-            progress_bar.progress(progress)
-            status_text.text(f"Scraped {len(results)} of {total_players} players...")
+    wtn = this.percentiles("wtn")
+    if wtn:
+        line = (f" - WTN: median <b>{format_wtn(wtn[50])}</b>, best quarter under <b>{format_wtn(wtn[25])}</b>, "
+                f"10th percentile <b>{format_wtn(wtn[10])}</b>.")
+        other_wtn = others.percentiles("wtn")
+        if other_wtn:
+            line += f" Across {others.field_count} other {escape(age_group)} fields the median is {format_wtn(other_wtn[50])}."
+        lines.append(line)
 
-        return results
+    stars = {label: count for label, count in this.star_mix().items() if label != "Unknown"}
+    if stars:
+        lines.append(" - Recruiting: " + ", ".join(f"<b>{count}</b> {label}" for label, count in stars.items()) + ".")
 
-    # Create tasks
-    tasks = [scrape_player(link, age_group) for link in player_links]
+    strength = this.cutoff_strength()[0]
+    if not np.isnan(strength["cutoff_wtn"]):
+        line = (f" - The last player in the draw has a WTN of <b>{format_wtn(strength['cutoff_wtn'])}</b>; "
+                f"the top 8 average <b>{format_wtn(strength['top_wtn'])}</b>.")
+        cutoffs = [row["cutoff_wtn"] for row in others.cutoff_strength() if not np.isnan(row["cutoff_wtn"])]
+        if cutoffs:
+            line += f" Typical {escape(age_group)} cutoff: {format_wtn(float(np.median(cutoffs)))}."
+        lines.append(line)
+    return lines
 
-    # Run tasks in batches
-    player_data = await gather_in_batches(tasks, batch_size=3)
 
-    # Finalize progress bar
-    progress_bar.progress(100)
-    status_text.text("✅ All player data collected!")
+def reset_run_stats():
+    """Zero the per-run counters of every scraping subsystem."""
+    route_stats.reset()
+    wait_stats.reset()
+    tracer.reset()
+    get_memory_governor().reset_stats()
+    get_player_cache().reset_stats()
+    get_standings_index().reset_stats()
+    get_recruiting_index().reset_stats()
+    host_scheduler.reset_stats()
 
-    # Filter out failed scrapes
-    player_data = [data for data in player_data if data is not None]
 
-    # Sort players
-    player_data = sort_players(player_data, tournament_level, sort)
-    sort_type = player_data[1]
-    player_data = player_data[0]
+def run_stats_summary() -> str:
+    return "\n".join([
+        "Player cache: " + get_player_cache().summary(),
+        "Request routing: " + route_stats.summary(),
+        "Standings: " + get_standings_index().summary(),
+        "Recruiting: " + get_recruiting_index().summary(),
+        "Hosts:\n" + host_scheduler.summary(),
+        "Page readiness waits:\n" + wait_stats.summary(),
+        "Memory: " + get_memory_governor().summary(),
+        "Snapshots: " + get_snapshot_store().summary(),
+        "Stage timings:\n" + tracer.summary(),
+        "Startup: " + startup_summary(),
+    ])
 
-    print("Completed. Analyzing data...")
 
-    # Close browser + playwright
-    await context.close()
-    await browser.close()
-    await playwright.stop()
-
-    player_names = []
-    player_profiles = []
-    player_locations = []
-    player_districts = []
-    player_seeds = []
-    player_wtns = []
-    player_points = []
-    player_rankings = []
-    player_recruiting = []
-    player_year = []
-    player_utr = []
-    row_colors = []
-    counts = 0
-
-    for player in player_data:
-        if player and isinstance(player, dict):
-            try:
-                player["Points"] = f'{int(player["Points"]):,}'
-            except:
-                player["Points"] = "0"
+# --- Report rendering ---
+# Data exports written next to every PDF (parquet needs pyarrow)
+REPORT_EXPORTS = [
+    kind.strip() for kind in os.environ.get("REPORT_EXPORTS", "csv,jsonl,parquet").split(",") if kind.strip()
+]
+# "thread", or "process" to render outside this interpreter's GIL (batch mode)
+REPORT_EXECUTOR = os.environ.get("REPORT_EXECUTOR", "thread")
+REPORT_WORKERS = 2
+# From this many rows the PDF uses a LongTable, which splits across pages incrementally
+REPORT_LONG_TABLE_ROWS = 500
+REPORT_PARQUET_BATCH = 1000
+REPORT_COLUMNS = ["No", "Name", "Profile", "Location", "District", "Seed", "WTN", "Points", "Ranking",
+                  "Recruiting", "Class", "UTR", "Selected", "Failed"]
 
-            try:
-                player["Ranking"] = f'{int(player["Ranking"]):,}'
-            except:
-                player["Ranking"] = "20,000"
-
-            player_names.append(player.get("Name", "Unknown"))
-            player_profiles.append(player.get("Profile", "Unknown"))
-            player_locations.append(player.get("Location", "Unknown"))
-            player_districts.append(player.get("District", "Unknown"))
-            player_wtns.append(player.get("WTN", "N/A"))
-            player_points.append(player["Points"])
-            player_rankings.append(player["Ranking"])
-            player_recruiting.append(player["Recruiting"])
-            player_year.append(player["Class"])
-            player_utr.append(player["UTR"])
-            if int(counts) > int(draw_size) - 1:
-                row_colors.append('lightcoral')
-            else:
-                row_colors.append('white')
-            counts += 1
 
-    seeds_temp = []
-    seeds_final = []
-    num_seeds = 0
-    total_players = min(int(draw_size),len(player_links))
+def build_report_rows(table: PlayerTable, ranking: FieldRanking):
+    """
+    The report's player table as plain dicts (REPORT_COLUMNS), in selection
+    order, with display formatting applied.
+    """
+    import numpy as np
 
-    while pow(2,num_seeds) <= total_players:
-        num_seeds += 1
-    num_seeds = pow(2,num_seeds - 2)
-    
-    for i in player_wtns[:total_players]:
-        seeds_temp.append(i)
+    rows = []
+    for position, row in enumerate(ranking.order.tolist()):
+        wtn, ranking_value, seed = table.wtn[row], int(table.ranking[row]), int(ranking.seeds[position])
+        rows.append({
+            "No": position + 1,
+            "Name": table.name[row],
+            "Profile": table.profile[row],
+            "Location": table.location[row],
+            "District": table.district[row],
+            "Seed": seed or "-",
+            "WTN": f"{MISSING_WTN if np.isnan(wtn) else wtn:.2f}",
+            "Points": f"{int(table.points[row]):,}",
+            "Ranking": f"{ranking_value:,}" if ranking_value else MISSING_RANKING_TEXT,
+            "Recruiting": table.recruiting[row],
+            "Class": table.grade[row],
+            "UTR": table.utr_text[row],
+            "Selected": position < ranking.cutoff,
+            "Failed": bool(table.failed[row]),
+        })
+    return rows
 
-    # ensure num_seeds is an integer, default to full list if missing/invalid
-    try:
-        num_seeds = int(num_seeds)
-    except (ValueError, TypeError):
-        num_seeds = len(seeds_temp)
 
-    seeds_temp.sort()
-    seeds_temp = seeds_temp[0:num_seeds]
+def export_values(row: dict):
+    """A report row with numbers as numbers and placeholders as None, for data exports."""
+    values = dict(row)
+    try:
+        values["WTN"] = None if row["WTN"] in PLAYER_FIELD_PLACEHOLDERS["WTN"] else float(row["WTN"])
+    except ValueError:
+        values["WTN"] = None
+    values["Points"] = parse_int(row["Points"])
+    values["Ranking"] = None if row["Ranking"] in PLAYER_FIELD_PLACEHOLDERS["Ranking"] else parse_int(row["Ranking"])
+    values["Seed"] = row["Seed"] if isinstance(row["Seed"], int) else None
+    return values
 
-    for i in player_wtns[:total_players]:
-        if i in seeds_temp:
-            seeds_final.append(seeds_temp.index(i) + 1)
-        else:
-            seeds_final.append("-")
 
-    while len(seeds_final) < len(player_names):
-        seeds_final.append("-")
+def render_pdf(path: str, title: str, subtitle: str, rows: list, draw_size: int, summary: list = ()):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter, landscape
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import HRFlowable, LongTable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
-    today_str = datetime.today().strftime("%Y-%m-%d")
-    safe_name = "".join(c if c.isalnum() or c in " -" else "-" for c in tournament_name)
-    filename = f"{safe_name}_{today_str}_{sort_type}.pdf"
-    pdf_dir = "C:/Users/shaur/Downloads"
-    os.makedirs(pdf_dir, exist_ok=True)
-    pdf_path = os.path.join(pdf_dir, filename)
-    doc = SimpleDocTemplate(pdf_path, pagesize=landscape(letter))
+    doc = SimpleDocTemplate(path, pagesize=landscape(letter))
 
     elements = []
     styles = getSampleStyleSheet()
-    elements.append(Paragraph(f"<b>{tournament_name}</b>", styles['Title']))
+    elements.append(Paragraph(f"<b>{escape(title)}</b>", styles['Title']))
+    elements.append(Paragraph(escape(subtitle), styles['Normal']))
     elements.append(Spacer(1, 12))
     table_data = [["No", "Name", "Location", "District", "Seed", "WTN", "Points", "Ranking", "Recruiting", "Grade", "UTR"]]
 
@@ -609,34 +4141,33 @@ async def scrape_tournament_data(tournament_url, age_group, draw_size, sort, tou
         wordWrap='LTR',   # disables breaking for CJK and forces LTR text
     )
 
-    for i in range(len(player_names)):
+    for row in rows:
+        name = escape(row["Name"]) + (" <i>(not scraped)</i>" if row.get("Failed") else "")
         # Make player name clickable if link exists
-        if i < len(player_profiles) and player_profiles[i]:
-            name_with_link = Paragraph(
-                f'<a href="{player_profiles[i]}"><u>{player_names[i]}</u></a>',
-                link_style
-            )
+        if row["Profile"]:
+            href = escape(row["Profile"], {'"': "&quot;"})
+            name_with_link = Paragraph(f'<a href="{href}"><u>{name}</u></a>', link_style)
         else:
-            name_with_link = Paragraph(player_names[i], styles['Normal'])
+            name_with_link = Paragraph(name, styles['Normal'])
 
-        row = [
-            str(i + 1),
+        table_data.append([
+            str(row["No"]),
             name_with_link,
-            player_locations[i],
-            player_districts[i],
-            str(seeds_final[i]),
-            player_wtns[i],
-            player_points[i],
-            player_rankings[i],
-            player_recruiting[i],
-            player_year[i],
-            player_utr[i]
-        ]
-        table_data.append(row)
+            row["Location"],
+            row["District"],
+            str(row["Seed"]),
+            row["WTN"],
+            row["Points"],
+            row["Ranking"],
+            row["Recruiting"],
+            row["Class"],
+            row["UTR"],
+        ])
 
     # Example column widths (adjust as needed)
     col_widths = [20, 110, 120, 110, 40, 40, 40, 40, 50, 75, 30]  # first value = "No" column width
-    table = Table(table_data, repeatRows=1, colWidths=col_widths)
+    table_class = LongTable if len(rows) >= REPORT_LONG_TABLE_ROWS else Table
+    table = table_class(table_data, repeatRows=1, colWidths=col_widths)
     table_style = TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.green),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -647,69 +4178,335 @@ async def scrape_tournament_data(tournament_url, age_group, draw_size, sort, tou
         ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
     ])
 
-    for idx in range(1, len(table_data)):
-        if idx > int(draw_size):
-            table_style.add('BACKGROUND', (0, idx), (-1, idx), colors.lightcoral)
+    # Everyone past the draw size is below the cutoff
+    if len(table_data) - 1 > draw_size:
+        table_style.add('BACKGROUND', (0, draw_size + 1), (-1, -1), colors.lightcoral)
 
     table.setStyle(table_style)
-    utr_counter = defaultdict(int)
-    utr_placeholders = set()
 
-    for each_utr in player_utr:
-        each_utr = each_utr.strip()
+    elements.append(Spacer(1, 12))
+    elements.append(Paragraph("<br/>".join(summary), styles['Normal']))
+    unavailable = sum(row["Recruiting"] == RECRUITING_UNAVAILABLE["Recruiting"] for row in rows)
+    if unavailable:
+        elements.append(Paragraph(
+            f"<i>tennisrecruiting.net was unavailable during this run: recruiting data is missing "
+            f"for {unavailable} players.</i>", styles['Normal']))
+    failed = sum(bool(row.get("Failed")) for row in rows)
+    if failed:
+        elements.append(Paragraph(
+            f"<i>{failed} players could not be scraped and are listed with placeholder values.</i>",
+            styles['Normal']))
+    elements.append(Spacer(1, 12))
+    elements.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=colors.grey, spaceBefore=12, spaceAfter=12, dash=3))
+    elements.append(table)
+    with tracer.span("pdf.build", rows=len(rows)):
+        doc.build(elements)
+    return path
+
+
+def write_csv(path: str, rows: list):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(export_values(row))
+    return path
 
-        if each_utr == "?":
-            key = "? UTR"
-        elif re.match(r"^\d+\.xx$", each_utr):
-            key = each_utr.split('.')[0] + ".0"
-            utr_placeholders.add(key)
+
+def write_jsonl(path: str, rows: list):
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(export_values(row)) + "\n")
+    return path
+
+
+def write_parquet(path: str, rows: list):
+    """Write rows in batches with pyarrow; None when pyarrow is not installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("pyarrow is not installed; skipping the Parquet export")
+        return None
+
+    schema = pa.schema([
+        ("No", pa.int32()), ("Name", pa.string()), ("Profile", pa.string()), ("Location", pa.string()),
+        ("District", pa.string()), ("Seed", pa.int32()), ("WTN", pa.float64()), ("Points", pa.int64()),
+        ("Ranking", pa.int64()), ("Recruiting", pa.string()), ("Class", pa.string()), ("UTR", pa.string()),
+        ("Selected", pa.bool_()), ("Failed", pa.bool_()),
+    ])
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, len(rows), REPORT_PARQUET_BATCH):
+            batch = [export_values(row) for row in rows[start:start + REPORT_PARQUET_BATCH]]
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    return path
+
+
+REPORT_WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "parquet": write_parquet}
+
+
+def render_report(stem: str, title: str, subtitle: str, rows: list, draw_size: int, exports=REPORT_EXPORTS,
+                  summary: list = ()):
+    """
+    Write the PDF and the requested data exports as <stem>.<format>.
+
+    Runs in a worker thread or process (see get_report_executor).
+
+    Returns:
+        {format: path} of the files written, "pdf" first
+    """
+    written = {"pdf": render_pdf(stem + ".pdf", title, subtitle, rows, draw_size, summary)}
+    for kind in exports:
+        writer = REPORT_WRITERS.get(kind)
+        if writer is None:
+            print(f"Unknown report export {kind!r}; expected one of {sorted(REPORT_WRITERS)}")
+            continue
+        path = writer(f"{stem}.{kind}", rows)
+        if path:
+            written[kind] = path
+    return written
+
+
+def report_exports(pdf_path: str):
+    """The data exports that were written alongside a PDF, as {format: path}."""
+    stem = os.path.splitext(pdf_path)[0]
+    return {kind: f"{stem}.{kind}" for kind in REPORT_WRITERS if os.path.exists(f"{stem}.{kind}")}
+
+
+_report_executor = None
+
+
+def get_report_executor():
+    """Return the process-wide executor that renders reports."""
+    global _report_executor
+    if _report_executor is None:
+        if REPORT_EXECUTOR == "process":
+            _report_executor = concurrent.futures.ProcessPoolExecutor(
+                REPORT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
         else:
-            key = each_utr
+            _report_executor = concurrent.futures.ThreadPoolExecutor(REPORT_WORKERS, thread_name_prefix="report")
+    return _report_executor
 
-        utr_counter[key] += 1
 
-    utrs_sorted = sorted(utr_counter.items(), key=lambda x: sort_key(x[0]))
-    utr_summary_lines = []
-    total = len(player_utr)
+async def scrape_tournament_data(tournament_url, age_group, draw_size, sort, tournament_level,
+                                 force_refresh: bool = False, output_dir: str = None, progress=None,
+                                 workers: int = SCRAPE_WORKERS, on_table=None):
+    """
+    Scrape every entrant of one event and write the PDF report.
 
-    for utr_val, count in utrs_sorted:
-        display_val = f"{utr_val.split('.')[0]}.xx" if utr_val in utr_placeholders else utr_val
-        pct = round(100 * count / total, 2)
+    Args:
+        output_dir (str): Report directory, defaults to REPORT_DIR
+        progress: Optional callback(completed, total, message)
+        workers (int): Worker processes to shard players across; 1 scrapes in-process
+        on_table: Optional callback(rows, final) with the ranked report rows,
+            first from locally known data, then at most every
+            PROGRESSIVE_REFRESH seconds as players arrive, and once at the end
 
-        if count == 1:
-            utr_summary_text = f" - There is <b>{count}</b> UTR rated <b>{display_val}</b> in this tournament (<b>{pct}%</b>)."
-            utr_summary_lines.append(utr_summary_text)
+    Returns:
+        Path of the PDF, or None when the event has no entrants
+    """
+    import numpy as np
+
+    tournament_url = tournament_url.lower()
+    standings = get_standings_index()
+    report_progress = progress or (lambda completed, total, message: None)
+
+    # Only hold the lease for the entrant list so player tasks get every slot
+    tournament_name = (await get_tournament_directory().get(tournament_url)).name
+    with tracer.span("tournament.entrants", url=tournament_url, age_group=age_group) as span:
+        async with get_browser_pool().lease() as page:
+            players_url = tournament_url.replace("overview", "players")
+            await page.goto(players_url, wait_until="domcontentloaded")
+            outcome = await wait_ready(page, "tournament_players")
+            if outcome == "timeout":
+                raise playwright_errors.TimeoutError(f"Players list did not load: {players_url}")
+            # "absent": the event has no entrants yet
+            entrants = await extract_entrants(page, age_group) if outcome == "ready" else []
+        span["players"] = len(entrants)
+
+    player_links = [entrant["profile"] for entrant in entrants]
+    
+    if not player_links:
+        print("No player links found. Exiting.")
+        return
+
+    print("Found", len(player_links), "players. Starting information search...")
+
+    # One standings list for the whole field; players missing from it fall
+    # back to their own rankings tab
+    with tracer.span("standings.prepare", age_group=age_group):
+        await standings.prepare(age_group)
+
+    total_players = len(player_links)
+
+    # Resume from the journal: only players it has no result for are scraped.
+    # A forced refresh starts the job over instead.
+    journal = get_job_journal()
+    journal_key, journaled = journal.start(tournament_url, age_group, total_players, fresh=force_refresh)
+    todo = [entrant for entrant in entrants if entrant["profile"] not in journaled]
+
+    # Diff against the previous run; players with fresh cached data are not
+    # rescraped, so only new entrants and stale profiles hit the network
+    history = get_entrant_history()
+    changes = history.diff(journal_key, entrants)
+    print(changes.describe())
+    cached = {}
+    if not force_refresh:
+        player_cache = get_player_cache()
+        for entrant in todo:
+            player = player_cache.get(entrant["profile"])
+            if player is not None:
+                cached[entrant["profile"]] = player
+        todo = [entrant for entrant in todo if entrant["profile"] not in cached]
+
+    already_done = total_players - len(todo)
+    if already_done:
+        print(f"Reusing {already_done} of {total_players} players from the journal and cache.")
+    report_progress(already_done, total_players, f"Found {total_players} players...")
+
+    # Rank the field on what is already known: shown straight away, and the
+    # players closest to the cutoff are scraped first since they decide the draw
+    current = {
+        entrant["profile"]: journaled.get(entrant["profile"]) or cached.get(entrant["profile"])
+        or provisional_player(entrant, age_group)
+        for entrant in entrants
+    }
+    last_published = [0.0]
+
+    def publish(force: bool = False):
+        if on_table is None or not force and time.time() - last_published[0] < PROGRESSIVE_REFRESH:
+            return
+        last_published[0] = time.time()
+        table = PlayerTable.from_players([current[entrant["profile"]] for entrant in entrants])
+        on_table(build_report_rows(table, rank_field(table, tournament_level, sort, draw_size, total_players)), False)
+
+    with tracer.span("prioritize", players=len(todo)):
+        todo_profiles = {entrant["profile"] for entrant in todo}
+        provisional = PlayerTable.from_players([current[entrant["profile"]] for entrant in entrants])
+        priority = cutoff_priority(provisional, rank_field(provisional, tournament_level, sort, draw_size, total_players))
+        todo = [entrants[row] for row in np.argsort(priority, kind="stable").tolist()
+                if entrants[row]["profile"] in todo_profiles]
+    publish(force=True)
+
+    def player_done(index, result, completed, total):
+        if result and not result.get("Failed"):
+            journal.record(journal_key, todo[index]["profile"], result)
+            current[todo[index]["profile"]] = result
+            publish()
+        completed += already_done
+        report_progress(completed, total_players, f"Scraped {completed} of {total_players} players...")
+
+    with tracer.span("players", age_group=age_group, players=len(todo), workers=workers):
+        if workers > 1:
+            scraped = await scrape_players_sharded(
+                todo, age_group, workers, force_refresh, on_result=player_done
+            )
         else:
-            utr_summary_text = f" - There are <b>{count}</b> UTRs rated <b>{display_val}</b> in this tournament (<b>{pct}%</b>)."
-            utr_summary_lines.append(utr_summary_text)
+            scheduler = AdaptiveScheduler()
 
-    utr_summary_text = "<br/>".join(utr_summary_lines)
-    elements.append(Spacer(1, 12))
-    elements.append(Paragraph(utr_summary_text, styles['Normal']))
-    elements.append(Spacer(1, 12))
-    elements.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=colors.grey, spaceBefore=12, spaceAfter=12, dash=3))
-    elements.append(table)
-    doc.build(elements)
-    print(f"PDF saved to: {pdf_path}")
-    return pdf_path
+            # Sliding window: a slow profile only holds its own slot
+            scraped = await scheduler.run(
+                todo,
+                lambda entrant: scrape_player(
+                    entrant["profile"], age_group, force_refresh, entrant["name"], check_cache=False
+                ),
+                on_result=player_done,
+                is_error=lambda player: not player or player.get("Failed"),
+            )
+            print("Scheduler concurrency changes:", len(scheduler.adjustments), "final:", scheduler.concurrency)
+
+    report_progress(total_players, total_players, "✅ All player data collected!")
+
+    scraped_by_profile = {entrant["profile"]: player for entrant, player in zip(todo, scraped)}
+    player_data = [
+        journaled.get(entrant["profile"])
+        or cached.get(entrant["profile"])
+        or scraped_by_profile.get(entrant["profile"])
+        or failed_player(entrant["name"], entrant["profile"])
+        for entrant in entrants
+    ]
+
+    # Parse once into typed columns, failed players included so they stay
+    # visible, then order, cut and seed the field in one pass
+    table = PlayerTable.from_players(player_data)
+    with tracer.span("sort", players=len(table)):
+        ranking = rank_field(table, tournament_level, sort, draw_size, len(player_links))
+    sort_type = ranking.sort_type
+
+    print("Completed. Analyzing data...")
+
+    selected = table.profile[ranking.order[:ranking.cutoff]].tolist()
+    changes = history.cutoff_changes(journal_key, selected, dict(zip(table.profile.tolist(), table.name.tolist())))
+    print(changes.describe())
+
+    rows = build_report_rows(table, ranking)
+    if on_table is not None:
+        on_table(rows, True)
+
+    # Add the field to the analytics store; the PDF summary compares it with the others
+    with tracer.span("analytics", players=len(table)):
+        analytics = get_analytics_store()
+        field_id = analytics.record(journal_key, tournament_url, tournament_name, age_group, tournament_level,
+                                    draw_size, table, ranking)
+        summary = field_summary(analytics, field_id)
+
+    today_str = datetime.today().strftime("%Y-%m-%d")
+    safe_name = "".join(c if c.isalnum() or c in " -" else "-" for c in tournament_name)
+    report_dir = output_dir or REPORT_DIR
+    os.makedirs(report_dir, exist_ok=True)
+    stem = os.path.join(report_dir, f"{safe_name}_{today_str}_{sort_type}")
+
+    # Rendering is CPU-bound; keep it off the event loop
+    render = spawnable(render_report) if REPORT_EXECUTOR == "process" else render_report
+    with tracer.span("report", rows=len(rows), formats=",".join(REPORT_EXPORTS)):
+        reports = await asyncio.get_event_loop().run_in_executor(
+            get_report_executor(), render,
+            stem, tournament_name, changes.describe(), rows, int(draw_size), REPORT_EXPORTS, summary,
+        )
+    # Only a run that produced its report becomes the baseline for the next diff
+    history.save(journal_key, entrants, selected)
+    journal.complete(journal_key)
+    for kind, path in reports.items():
+        print(f"{kind.upper()} saved to: {path}")
+    return reports["pdf"]
         
 nest_asyncio.apply()  # allow nested event loops in Streamlit
 
+SORT_CHOICES = {"Tournament default": None, "Points": 1, "WTN": 2}
+
+
 async def main():
+    import streamlit as st
+
     st.title("USTA Tennis Tournament Analyzer")
+    manager = get_job_manager()
 
     # Input from user
     tournament_link = st.text_input("Enter the tournament link:")
 
+    # Interrupted runs resume automatically when analysed again
+    incomplete = get_job_journal().list_incomplete()
+    if incomplete:
+        with st.sidebar.expander(f"Incomplete analyses ({len(incomplete)})"):
+            for job in incomplete:
+                st.write(f"{job['age_group']}: {job['done']}/{job['total']} players ({job['tournament']})")
+            st.caption("Analyze the same tournament and age group again to resume.")
+            if st.button("Clear incomplete analyses"):
+                get_job_journal().clear()
+                st.rerun()
+
     # Initialize session state
     if "age_groups_final" not in st.session_state:
         st.session_state.age_groups_final = []
     if "age_options" not in st.session_state:
         st.session_state.age_options = None
+    if "job_id" not in st.session_state:
+        st.session_state.job_id = None
 
     # Button to fetch age groups
     if st.button("Find age groups:"):
-        age_options = await age_groups_level(tournament_link)
+        age_options = manager.age_groups(tournament_link)
         st.session_state.age_groups_final = age_options[-1]  # store age groups
         st.session_state.age_options = age_options  # store full options
 
@@ -719,30 +4516,476 @@ async def main():
             "Select an age group:", st.session_state.age_groups_final
         )
         st.write("You selected:", selected_age_group)
+        sort_choice = st.radio("Selection order:", list(SORT_CHOICES), horizontal=True)
+        force_refresh = st.checkbox("Ignore cached player data (force refresh)")
 
-        # Analyze tournament
+        # Analyze tournament in the background; an identical analysis already
+        # in flight is joined instead of scraped twice
         if st.button("Analyze tournament"):
-            sort = await scrape_draw_size(
-                tournament_link.replace("overview", "events"), selected_age_group
+            st.session_state.job_id = manager.submit(
+                tournament_link, selected_age_group, SORT_CHOICES[sort_choice], force_refresh
             )
 
-            pdf_path = await scrape_tournament_data(
-                tournament_link.lower(),
-                selected_age_group,
-                sort[0],
-                sort[1],
-                st.session_state.age_options[0]  # use session state
+    show_timings = st.sidebar.checkbox("Show live stage timings")
+    with st.sidebar.expander("Startup timings"):
+        st.caption("Server start: " + manager.startup_summary())
+        # Streamlit re-executes the whole script on every interaction
+        st.caption("This script run: " + startup_summary())
+
+    # Every analysis of this app, from any session, can be picked up here
+    jobs = manager.jobs()
+    if jobs:
+        with st.sidebar.expander(f"Analyses ({len(jobs)})"):
+            for job in jobs:
+                done = f" {job.completed}/{job.total}" if job.total and not job.finished else ""
+                if st.button(f"{job.age_group}: {job.status}{done}", key=f"job-{job.id}", help=job.url):
+                    st.session_state.job_id = job.id
+
+    job = manager.get(st.session_state.job_id) if st.session_state.job_id else None
+    if job is None:
+        return
+
+    st.subheader(f"{job.age_group} analysis")
+    if job.requests > 1:
+        st.caption(f"Shared by {job.requests} requests for this event.")
+    st.progress(min(int((job.completed / job.total) * 100), 100) if job.total else 0)
+    st.text(job.message)
+    if job.rows:
+        show_player_table(st, job.rows, job.provisional)
+    if show_timings:
+        st.dataframe(manager.stage_stats(), use_container_width=True)
+
+    # Poll until the job finishes; the scrape itself never runs in this script
+    if not job.finished:
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
+
+    if job.status == "failed":
+        st.error(f"Analysis failed: {job.error}")
+    if job.memory:
+        st.caption("Memory: " + job.memory)
+    if job.changes:
+        st.info(job.changes)
+
+    # Make PDF downloadable
+    if job.pdf and os.path.exists(job.pdf):
+        with open(job.pdf, "rb") as f:
+            st.download_button(
+                label="Download Tournament PDF",
+                data=f,
+                file_name=os.path.basename(job.pdf),
+                mime="application/pdf"
             )
+        for kind, path in job.exports.items():
+            with open(path, "rb") as f:
+                st.download_button(
+                    label=f"Download player table ({kind.upper()})",
+                    data=f,
+                    file_name=os.path.basename(path),
+                    key=f"export-{kind}",
+                )
+    st.download_button(
+        label="Download timing trace",
+        data=json.dumps(manager.chrome_trace(), default=str),
+        file_name="tournament-trace.json",
+        mime="application/json",
+        help="Open in chrome://tracing or ui.perfetto.dev",
+    )
 
-            # Make PDF downloadable
-            if pdf_path and os.path.exists(pdf_path):
-                with open(pdf_path, "rb") as f:
-                    st.download_button(
-                        label="Download Tournament PDF",
-                        data=f,
-                        file_name=os.path.basename(pdf_path),
-                        mime="application/pdf"
-                    )
+PLAYER_TABLE_COLUMNS = ["No", "Name", "Location", "District", "Seed", "WTN", "Points", "Ranking",
+                        "Recruiting", "Class", "UTR", "Failed"]
+
+
+def show_player_table(st, rows: list, provisional: bool):
+    """The ranked field with everyone below the cutoff shaded, as in the PDF."""
+    import pandas as pd
+
+    selected = sum(row["Selected"] for row in rows)
+    if provisional:
+        st.caption(f"Provisional ranking from the data known so far; the draw takes the first {selected}. "
+                   "Updates as players are scraped, closest to the cutoff first.")
+    failed = sum(bool(row.get("Failed")) for row in rows)
+    if failed and not provisional:
+        st.warning(f"{failed} players could not be scraped; they are flagged in the Failed column.")
+    frame = pd.DataFrame(rows, columns=PLAYER_TABLE_COLUMNS)
+    frame["Seed"] = frame["Seed"].astype(str)
+    shade = [not row["Selected"] for row in rows]
+    st.dataframe(
+        frame.style.apply(lambda row: ["background-color: lightcoral" if shade[row.name] else ""] * len(row), axis=1),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+async def run_app():
+    # The browser pool belongs to the job manager's thread and outlives
+    # script runs, so there is nothing to close here
+    await main()
+
+
+# --- Headless batch mode ---
+@dataclass
+class BatchJob:
+    """One (tournament, age group) analysis; sort overrides the event's selection order."""
+
+    url: str
+    age_group: str
+    sort: Optional[int] = None
+
+
+def parse_sort(value):
+    """Accept 1/2, "points"/"wtn" or empty for the event's own selection order."""
+    if value in (None, ""):
+        return None
+    value = str(value).strip().lower()
+    if value in ("1", "points", "ranking"):
+        return 1
+    if value in ("2", "wtn"):
+        return 2
+    raise ValueError(f"Unknown sort override: {value}")
+
+
+def load_jobs(path: str):
+    """Read jobs from a JSON list of {url, age_group, sort} or a CSV with those columns."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+    return [BatchJob(row["url"].strip(), row["age_group"].strip(), parse_sort(row.get("sort"))) for row in rows]
+
+
+async def run_job(job: BatchJob, output_dir: str, force_refresh: bool = False, workers: int = SCRAPE_WORKERS,
+                  progress=None, on_table=None):
+    """Analyze one tournament event end to end and return the PDF path."""
+    label = f"{job.age_group} @ {job.url}"
+
+    def show_progress(completed, total, message):
+        print(f"[{label}] {message}")
+
+    show_progress = progress or show_progress
+    level_info = await age_groups_level(job.url)
+    if not level_info:
+        raise RuntimeError(f"Could not read tournament level: {job.url}")
+    if job.age_group not in level_info[2]:
+        raise ValueError(f"{job.age_group!r} is not one of {level_info[2]}")
+
+    draw_size, sort_type = await scrape_draw_size(job.url.replace("overview", "events"), job.age_group)
+    if draw_size == UNKNOWN_DRAW_SIZE:
+        show_progress(0, 0, "The event page lists no draw size; every entrant is treated as selected.")
+    sort_type = job.sort or sort_type
+    if sort_type is None:
+        show_progress(0, 0, "No published selection order; sorting by points.")
+        sort_type = 1
+
+    return await scrape_tournament_data(
+        job.url, job.age_group, draw_size, sort_type, level_info[0],
+        force_refresh=force_refresh, output_dir=output_dir, progress=show_progress, workers=workers,
+        on_table=on_table,
+    )
+
+
+async def run_batch(jobs: list, output_dir: str, concurrency: int = 2, force_refresh: bool = False,
+                    workers: int = SCRAPE_WORKERS):
+    """
+    Run many jobs in one process sharing the browser pool and caches.
+
+    Returns:
+        list of (job, pdf_path or exception) in input order
+    """
+    lane = asyncio.Semaphore(max(1, concurrency))
+    reset_run_stats()
+
+    async def guarded(job):
+        async with lane:
+            try:
+                return job, await run_job(job, output_dir, force_refresh, workers)
+            except Exception as e:
+                return job, e
+
+    try:
+        return await asyncio.gather(*(guarded(job) for job in jobs))
+    finally:
+        await close_browser_pool()
+
+
+# --- Background jobs ---
+# Analyses run at once by the app; further requests queue behind them
+JOB_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", "2"))
+# Finished jobs (and their downloads) stay listed this long
+JOB_RETENTION = 6 * HOUR
+JOB_POLL_INTERVAL = 1.0
+# Launch the browser as soon as the app starts instead of on the first analysis
+PREWARM_BROWSER = os.environ.get("PREWARM_BROWSER", "1").lower() not in ("0", "false", "no")
+
+
+@dataclass
+class AnalysisJob:
+    """Status of one queued, running or finished analysis."""
+
+    id: str
+    url: str
+    age_group: str
+    sort: Optional[int] = None
+    force_refresh: bool = False
+    status: str = "queued"  # queued, running, done, failed
+    completed: int = 0
+    total: int = 0
+    message: str = "Waiting for a free worker..."
+    # How many requests were merged into this job
+    requests: int = 1
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    # Ranked report rows, provisional until the last player is in
+    rows: list = field(default_factory=list)
+    provisional: bool = True
+    pdf: Optional[str] = None
+    exports: dict = field(default_factory=dict)
+    changes: Optional[str] = None
+    memory: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+
+class JobManager:
+    """
+    Runs analyses on a background thread with its own event loop.
+
+    The thread owns the browser pool and every cache, so Streamlit reruns
+    never block on a scrape and never tear the browser down. Requests for a
+    tournament, age group and sort order that is already queued or running
+    are merged into that job; finished jobs are kept for JOB_RETENTION so any
+    session can poll them and download the report.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self._lock = threading.Lock()
+        self._jobs = {}
+        # (job_key, sort) -> id of the queued or running job
+        self._active = {}
+        self._running = 0
+        self._lane = asyncio.Semaphore(max(1, workers))
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="analysis-jobs", daemon=True)
+        self._thread.start()
+        if PREWARM_BROWSER:
+            asyncio.run_coroutine_threadsafe(self._prewarm(), self._loop)
+
+    async def _prewarm(self):
+        """Check the Chromium install and open the browser and a first context in the background."""
+        started = time.perf_counter()
+        try:
+            async with get_browser_pool().lease():
+                pass
+        except Exception as e:
+            print(f"Browser prewarm failed: {e}")
+            return
+        startup_phase("browser prewarm", started)
+
+    def call(self, coro, timeout: float = None):
+        """Run a coroutine on the job loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def age_groups(self, link: str, timeout: float = None):
+        """
+        [level, continue_age, age_groups] of a tournament, read on the job loop.
+
+        Streamlit runs every rerun in a fresh module, so callers must not pass
+        in their own age_groups_level: it would lease from that rerun's pool
+        instead of the one this manager owns.
+        """
+        return self.call(age_groups_level(link), timeout)
+
+    def submit(self, url: str, age_group: str, sort: int = None, force_refresh: bool = False) -> str:
+        """Queue an analysis, or join the identical one in flight. Returns the job ID."""
+        url = url.strip().lower()
+        key = (job_key(url, age_group), sort)
+        with self._lock:
+            self._prune()
+            job_id = self._active.get(key)
+            if job_id is not None:
+                self._jobs[job_id].requests += 1
+                return job_id
+            job = AnalysisJob(uuid.uuid4().hex[:12], url, age_group, sort, force_refresh)
+            self._jobs[job.id] = job
+            self._active[key] = job.id
+        asyncio.run_coroutine_threadsafe(self._run(key, job), self._loop)
+        return job.id
+
+    def get(self, job_id: str):
+        """A snapshot of the job, or None when it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dataclasses.replace(job) if job else None
+
+    def jobs(self):
+        """Snapshots of every retained job, newest first."""
+        with self._lock:
+            self._prune()
+            return sorted((dataclasses.replace(job) for job in self._jobs.values()),
+                          key=lambda job: job.created_at, reverse=True)
+
+    def stage_stats(self):
+        return tracer.stats()
 
-# ✅ Run without asyncio.run()
-asyncio.get_event_loop().run_until_complete(main())
+    def startup_summary(self) -> str:
+        """Startup phases of the script run that created the manager, including the prewarm."""
+        return startup_summary()
+
+    def chrome_trace(self):
+        return tracer.chrome_trace()
+
+    def _update(self, job: AnalysisJob, **changes):
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    async def _run(self, key, job: AnalysisJob):
+        async with self._lane:
+            # Stats are process-wide: start them fresh when nothing else is running
+            if self._running == 0:
+                reset_run_stats()
+            self._running += 1
+            self._update(job, status="running", message="Reading the event...")
+
+            def show_progress(completed, total, message):
+                self._update(job, completed=completed, total=total or job.total, message=message)
+
+            def show_table(rows, final):
+                self._update(job, rows=rows, provisional=not final)
+
+            outcome = {}
+            try:
+                pdf = await run_job(BatchJob(job.url, job.age_group, job.sort), REPORT_DIR, job.force_refresh,
+                                    progress=show_progress, on_table=show_table)
+                changes = get_entrant_history().last_changes.get(key[0])
+                outcome = dict(
+                    status="done", pdf=pdf, exports=report_exports(pdf) if pdf else {},
+                    changes=changes.describe() if changes else None,
+                    message="✅ Report ready" if pdf else "No players found for this event.",
+                )
+                print(run_stats_summary())
+            except Exception as e:
+                outcome = dict(status="failed", error=str(e) or type(e).__name__, message="❌ Analysis failed")
+            finally:
+                self._running -= 1
+                # Publish the result in one step so pollers never see a half-finished job
+                with self._lock:
+                    self._active.pop(key, None)
+                self._update(job, memory=get_memory_governor().summary(), finished_at=time.time(),
+                             **(outcome or {"status": "failed", "message": "❌ Analysis cancelled"}))
+
+
+def _create_job_manager():
+    return JobManager()
+
+
+def get_job_manager():
+    """
+    Return the JobManager shared by every session of the app.
+
+    Streamlit re-executes this script (and so resets its globals) on every
+    interaction, so the manager is kept in Streamlit's resource cache.
+    """
+    import streamlit as st
+    return st.cache_resource(show_spinner=False)(_create_job_manager)()
+
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Analyze USTA tournaments without the Streamlit UI.",
+    )
+    parser.add_argument("--jobs-file", help="JSON or CSV file of jobs (url, age_group, sort)")
+    parser.add_argument(
+        "--job", nargs="+", action="append", default=[], metavar="ARG",
+        help="URL AGE_GROUP [SORT]; may be repeated",
+    )
+    parser.add_argument("--output-dir", default=REPORT_DIR, help=f"Report directory (default: {REPORT_DIR})")
+    parser.add_argument("--concurrency", type=int, default=2, help="Jobs analysed at once (default: 2)")
+    parser.add_argument("--force-refresh", action="store_true", help="Ignore cached player data")
+    parser.add_argument(
+        "--workers", type=int, default=SCRAPE_WORKERS,
+        help=f"Worker processes per job, each with its own browser (default: {SCRAPE_WORKERS})",
+    )
+    parser.add_argument("--trace", metavar="PATH", help="Write a Chrome trace of the run's stages to PATH")
+    parser.add_argument(
+        "--reparse", action="store_true",
+        help="Re-derive cached players, recruiting results and events from stored page snapshots and exit",
+    )
+    parser.add_argument("--list-jobs", action="store_true", help="List incomplete (resumable) jobs and exit")
+    parser.add_argument(
+        "--clear-jobs", nargs="?", const="all", metavar="KEY",
+        help="Delete one incomplete job by key, or all of them, and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.reparse:
+        start = time.perf_counter()
+        parsed, failed = reparse_snapshots(workers=args.workers if args.workers > 1 else None)
+        if not parsed:
+            return 1
+        counts = apply_reparsed(parsed)
+        print(f"Reparsed {sum(len(pages) for pages in parsed.values())} snapshots in {time.perf_counter() - start:.1f}s: "
+              f"{counts['players']} players, {counts['recruiting']} recruiting results, {counts['events']} events updated")
+        if sum(failed.values()):
+            print("Could not parse " + ", ".join(f"{count} {kind}" for kind, count in failed.items() if count)
+                  + " snapshots")
+        return 0
+    if args.list_jobs:
+        for job in get_job_journal().list_incomplete():
+            print(f"{job['key']}  {job['done']}/{job['total']} players  last update {job['updated_at']:%Y-%m-%d %H:%M}")
+        return 0
+    if args.clear_jobs:
+        cleared = get_job_journal().clear(None if args.clear_jobs == "all" else args.clear_jobs)
+        print(f"Cleared {cleared} job(s)")
+        return 0
+
+    jobs = load_jobs(args.jobs_file) if args.jobs_file else []
+    for values in args.job:
+        if len(values) not in (2, 3):
+            parser.error("--job takes URL AGE_GROUP [SORT]")
+        jobs.append(BatchJob(values[0], values[1], parse_sort(values[2] if len(values) == 3 else None)))
+    if not jobs:
+        parser.error("no jobs given (use --job or --jobs-file)")
+
+    # Container shutdowns send SIGTERM; exit and take this process's browsers with it
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    start = time.perf_counter()
+    try:
+        results = asyncio.get_event_loop().run_until_complete(
+            run_batch(jobs, args.output_dir, args.concurrency, args.force_refresh, args.workers)
+        )
+    except (SystemExit, KeyboardInterrupt):
+        get_memory_governor().kill_orphans(include_own=True)
+        raise
+
+    failures = 0
+    for job, outcome in results:
+        if isinstance(outcome, Exception):
+            failures += 1
+            print(f"FAILED {job.age_group} @ {job.url}: {outcome}")
+        else:
+            print(f"OK     {job.age_group} @ {job.url}: {outcome}")
+    print(run_stats_summary())
+    if args.trace:
+        print(f"Trace written to {tracer.export(args.trace)}")
+    print(f"{len(jobs) - failures}/{len(jobs)} jobs finished in {time.perf_counter() - start:.1f}s")
+    return 1 if failures else 0
+
+
+startup_phase("definitions", _startup_mark)
+
+if __name__ == "__main__":
+    if "streamlit" in sys.modules:
+        # ✅ Run without asyncio.run()
+        asyncio.get_event_loop().run_until_complete(run_app())
+    else:
+        sys.exit(cli())
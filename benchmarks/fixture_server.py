@@ -0,0 +1,376 @@
+"""
+Local stand-in for playtennis.usta.com and tennisrecruiting.net.
+
+Serves synthetic pages shaped like the real ones: the same class names,
+ids and XPath positions TournamentPlayersV9 reads, so the full pipeline
+runs against it unchanged once USTA_BASE_URL and RECRUITING_BASE_URL
+point here. Every response can be delayed and a share of them failed.
+Run one FixtureServer per site (section="usta" and section="recruiting")
+so the two are separate hosts to the scraper, as in production.
+
+USTA pages (prefix /):
+    /tournaments/bench-<size>/overview     name, level, age groups
+    /tournaments/bench-<size>/events       age groups and event links
+    /tournaments/bench-<size>/events/<n>   draw size and selection order
+    /tournaments/bench-<size>/players      entrant list
+    /profile?uaid=<id>[&tab=rankings]      player profile / rankings tab
+    /standings/<age>                       national standings list
+
+tennisrecruiting pages (prefix /recruiting):
+    /recruiting/player.asp                 search form
+    /recruiting/player.asp?f_playername=   search result
+    /recruiting/player.asp?id=<id>         player page
+"""
+
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+import random
+import threading
+import time
+
+# Positional XPaths the scraper reads; the pages below are built to match them
+TOURNAMENT_LEVEL_XPATH = "/html/body/div[4]/div/div/div[2]/div[3]/div[1]/div[2]/div[2]/div/div/div[1]/div/div/div[1]/h6"
+USTA_WTN_XPATH = "/html/body/div[5]/div/div[2]/div/div/div[3]/div/div/div[2]/div/div/div[2]/div/div[3]/div/div/div/div[2]/div/form/div[3]/div/div/div/div[1]/div/div[2]/div[1]/div/p"
+
+# Paths of the tennisrecruiting stand-in; everything else is USTA
+RECRUITING_PREFIX = "/recruiting/"
+SECTIONS = ("all", "usta", "recruiting")
+
+AGE_GROUPS = ["Boys 12s", "Boys 14s", "Boys 16s", "Boys 18s"]
+FIRST_NAMES = ["Alex", "Ben", "Caleb", "Dylan", "Ethan", "Felix", "Gavin", "Henry", "Isaac", "Jack",
+               "Kai", "Liam", "Mason", "Noah", "Owen", "Parker", "Quinn", "Ryan", "Sam", "Tyler"]
+LAST_NAMES = ["Adams", "Brooks", "Carter", "Diaz", "Evans", "Foster", "Garcia", "Hayes", "Ito", "Jones",
+              "Kim", "Lopez", "Miller", "Nguyen", "Ortiz", "Patel", "Reed", "Smith", "Turner", "Young"]
+CITIES = [("Atlanta, GA", "Southern", "Georgia"), ("Austin, TX", "Texas", "Texas"),
+          ("Boca Raton, FL", "Florida", "Florida"), ("Irvine, CA", "Southern California", "Orange County"),
+          ("Naperville, IL", "Midwest", "Northern Illinois"), ("Scarsdale, NY", "Eastern", "Metro")]
+STARS = ["6star", "5star", "4star", "3star", "2star", "1star", "0star"]
+GRADES = ["Senior", "Junior", "Sophomore", "Freshman", "8th Grader"]
+
+
+@dataclass
+class FixturePlayer:
+    uaid: int
+    first: str
+    last: str
+    city: str
+    section: str
+    district: str
+    wtn: float
+    points: int
+    rank: int
+    stars: str
+    grade: str
+    utr: str
+    # "found", "ambiguous" (a same-name decoy elsewhere) or "missing"
+    recruiting: str
+
+    @property
+    def name(self):
+        return f"{self.first} {self.last}"
+
+
+def make_players(count: int, seed: int = 7):
+    """A deterministic field of players, best ranked first."""
+    rng = random.Random(seed)
+    players = []
+    for i in range(count):
+        city, section, district = CITIES[i % len(CITIES)]
+        if i % 5 == 4:
+            recruiting = "missing"
+        elif i % 7 == 3:
+            recruiting = "ambiguous"
+        else:
+            recruiting = "found"
+        players.append(FixturePlayer(
+            uaid=2000000000 + i,
+            first=FIRST_NAMES[i % len(FIRST_NAMES)],
+            # Unique surnames so the recruiting search resolves one player per name
+            last=f"{LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}{i // 400 or ''}",
+            city=city,
+            section=section,
+            district=district,
+            wtn=round(rng.uniform(4.0, 30.0), 2),
+            points=max(0, 4000 - i * 7 + rng.randint(-20, 20)),
+            rank=i + 1,
+            stars=STARS[min(len(STARS) - 1, i // 60)],
+            grade=GRADES[i % len(GRADES)],
+            utr=f"{max(1.0, 13.0 - i / 60):.0f}.xx",
+            recruiting=recruiting,
+        ))
+    return players
+
+
+def xpath_chain(xpath: str, leaf: str) -> str:
+    """
+    Nested markup that an absolute /html/body/... XPath resolves to.
+
+    Each step like div[4] gets three empty div siblings in front of it, so
+    the chain must be the only thing under <body> using those tags.
+    """
+    steps = xpath.split("/")[3:]
+    html = leaf
+    for step in reversed(steps):
+        tag, _, index = step.partition("[")
+        position = int(index.rstrip("]")) if index else 1
+        html = f"<{tag}></{tag}>" * (position - 1) + f"<{tag}>{html}</{tag}>"
+    return html
+
+
+def page(title: str, body: str) -> str:
+    return f"<!DOCTYPE html><html><head><title>{escape(title)}</title></head><body>{body}</body></html>"
+
+
+class FixtureSite:
+    """The synthetic tournaments, players and pages, keyed by draw size."""
+
+    def __init__(self, sizes, age_group: str = "Boys 14s", seed: int = 7):
+        self.sizes = sorted(set(sizes))
+        self.age_group = age_group
+        self.players = make_players(max(self.sizes), seed)
+        self.by_uaid = {player.uaid: player for player in self.players}
+        self.by_name = {player.name.lower(): player for player in self.players}
+        self.base_url = ""
+
+    def tournament_url(self, size: int) -> str:
+        return f"{self.base_url}/tournaments/bench-{size}/overview"
+
+    def profile_url(self, player) -> str:
+        return f"{self.base_url}/profile?uaid={player.uaid}"
+
+    def field(self, size: int):
+        # Entry order is not ranking order, like a real entrant list
+        players = list(self.players[:size])
+        random.Random(size).shuffle(players)
+        return players
+
+    # --- USTA ---
+    def overview(self, size: int) -> str:
+        groups = "".join(f'<h6 class="_H6_1iwqn_128">{g}</h6>' for g in ["Events"] + AGE_GROUPS)
+        return page(f"Benchmark Open {size}", (
+            '<main id="tournaments"><div><div><div><div><div><div>'
+            f"<h1>Benchmark Open {size}</h1>"
+            "</div></div></div></div></div></div></main>"
+            + xpath_chain(TOURNAMENT_LEVEL_XPATH, "Level 6")
+            + f"<aside>{groups}</aside>"
+        ))
+
+    def events(self, size: int) -> str:
+        groups = "".join(f'<h6 class="_H6_1iwqn_128">{g}</h6>' for g in ["Events"] + AGE_GROUPS)
+        links = "".join(
+            f'<a class="_link_19t7t_285" href="/tournaments/bench-{size}/events/{i}">View {g}</a>'
+            for i, g in enumerate(AGE_GROUPS)
+        )
+        return page("Events", f"<aside>{groups}</aside><nav>{links}</nav>")
+
+    def event(self, size: int, index: int) -> str:
+        selection = "Ranking" if index % 2 else "WTN"
+        cells = ["Draw size", str(size), "Format", "Singles", "Selection process", selection]
+        return page("Event", "".join(f'<span class="_bodyXSmall_1iwqn_137">{c}</span>' for c in cells))
+
+    def entrants(self, size: int) -> str:
+        rows = "".join(
+            "<tr>"
+            f'<td class="_alignLeft_1nqit_268"><a href="{self.profile_url(p)}">{escape(p.last)}, {escape(p.first)}</a></td>'
+            f'<td class="_alignLeft_1nqit_268">{self.age_group} Singles</td>'
+            "</tr>"
+            for p in self.field(size)
+        )
+        return page("Players", f"<table><tbody>{rows}</tbody></table>")
+
+    def profile(self, player) -> str:
+        name = (
+            '<section id="container-cdeaf649fc"><div><div><div><div><div><span>'
+            f"<h3>{escape(player.name)}</h3>"
+            "</span></div></div></div></div></div></section>"
+        )
+        details = (
+            f'<p class="readonly-text__content">{player.uaid}</p>'
+            f'<p class="readonly-text__content">Junior | {player.city} Section: {player.section}'
+            f" | District: {player.district}</p>"
+        )
+        return page(player.name, xpath_chain(USTA_WTN_XPATH, f"{player.wtn:.2f}") + name + f"<aside>{details}</aside>")
+
+    def rankings(self, player) -> str:
+        list_name = self.age_group.split(" ")[1] + " National Standings List"
+        slug = self.age_group.lower().replace(" ", "-")
+        rows = [
+            [f'<a href="/standings/{slug}">{list_name}</a>', f"{player.points:,}", str(player.rank), "", ""],
+            ["12s National Standings List", "0", "", "", ""],
+        ]
+        cells = "".join(f'<div class="v-grid-cell__content">{c}</div>' for row in rows for c in row)
+        return page(player.name, f"<section>{cells}</section>")
+
+    def standings(self) -> str:
+        rows = "".join(
+            f'<tr><td>{p.rank}</td><td><a href="{self.profile_url(p)}">{escape(p.name)}</a></td>'
+            f"<td>{p.points:,}</td></tr>"
+            for p in self.players
+        )
+        return page("Standings", f"<table><tr><th>Rank</th><th>Player Name</th><th>Points</th></tr>{rows}</table>")
+
+    # --- tennisrecruiting ---
+    def search_form(self) -> str:
+        return page("Player search", (
+            '<form method="get" action="/recruiting/player.asp">'
+            '<input type="text" name="f_playername"></form>'
+        ))
+
+    def recruiting_player(self, player, decoy: bool = False) -> str:
+        stars = "0star" if decoy else player.stars
+        return page(player.name, (
+            '<div id="CenterColumn"><table><tbody><tr><td></td><td><table><tbody>'
+            f"<tr><td>{escape(player.name)}</td></tr>"
+            f"<tr><td>{player.section}</td></tr>"
+            f"<tr><td></td><td><div></div><div></div><div>Class of 20XX ({player.grade})</div></td></tr>"
+            f'<tr><td><img src="/recruiting/img/{stars}.gif"></td></tr>'
+            f"<tr><td><span>{player.utr}</span></td></tr>"
+            "</tbody></table></td></tr></tbody></table></div>"
+        ))
+
+    def search_result(self, query: str) -> str:
+        player = self.by_name.get(" ".join(query.lower().split()))
+        if player is None or player.recruiting == "missing":
+            return page("Search", "<p>No players matched your search.</p>")
+        if player.recruiting == "found":
+            return self.recruiting_player(player)
+        decoy_city = CITIES[(self.players.index(player) + 1) % len(CITIES)][0]
+        rows = (
+            f'<tr><td><a href="/recruiting/player.asp?id={player.uaid}">{escape(player.name)}</a></td>'
+            f"<td>{player.city}</td></tr>"
+            f'<tr><td><a href="/recruiting/player.asp?id={-player.uaid}">{escape(player.name)}</a></td>'
+            f"<td>{decoy_city}</td></tr>"
+        )
+        return page("Search", f"<table><tbody>{rows}</tbody></table>")
+
+    def route(self, path: str, query: dict):
+        """Return (status, html) for a request path."""
+        parts = [part for part in path.split("/") if part]
+        if parts[:1] == ["tournaments"] and len(parts) >= 3 and parts[1].startswith("bench-"):
+            size = int(parts[1][len("bench-"):])
+            if size not in self.sizes:
+                return 404, page("Not found", "")
+            if parts[2] == "overview":
+                return 200, self.overview(size)
+            if parts[2] == "players":
+                return 200, self.entrants(size)
+            if parts[2] == "events" and len(parts) == 3:
+                return 200, self.events(size)
+            if parts[2] == "events":
+                return 200, self.event(size, int(parts[3]))
+        if parts == ["profile"]:
+            player = self.by_uaid.get(int(query.get("uaid", ["0"])[0]))
+            if player is None:
+                return 404, page("Not found", "")
+            return 200, self.rankings(player) if query.get("tab") == ["rankings"] else self.profile(player)
+        if parts[:1] == ["standings"]:
+            return 200, self.standings()
+        if parts == ["recruiting", "player.asp"]:
+            if "id" in query:
+                uaid = int(query["id"][0])
+                player = self.by_uaid.get(abs(uaid))
+                if player is None:
+                    return 404, page("Not found", "")
+                return 200, self.recruiting_player(player, decoy=uaid < 0)
+            if "f_playername" in query:
+                return 200, self.search_result(query["f_playername"][0])
+            return 200, self.search_form()
+        return 404, page("Not found", "")
+
+
+class FaultInjector:
+    """Per-request latency and failures, reproducible from a seed."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, failure_rate: float = 0.0,
+                 stall_rate: float = 0.0, stall_ms: float = 15000, seed: int = 7):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """Return (delay seconds, fail) for the next request."""
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            if self._rng.random() < self.stall_rate:
+                delay += self.stall_ms
+            fail = self._rng.random() < self.failure_rate
+        return max(0.0, delay) / 1000, fail
+
+
+class FixtureServer:
+    """
+    ThreadingHTTPServer for a FixtureSite, run on a background thread.
+
+    `section` limits it to the USTA or the tennisrecruiting pages; other
+    paths get a 404. The USTA (or "all") server's URL is the site's base URL.
+    """
+
+    def __init__(self, site: FixtureSite, faults: FaultInjector = None, host: str = "127.0.0.1", port: int = 0,
+                 section: str = "all"):
+        if section not in SECTIONS:
+            raise ValueError(f"section must be one of {SECTIONS}, not {section!r}")
+        self.site = site
+        self.section = section
+        self.faults = faults or FaultInjector()
+        self.stats = {"requests": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                delay, fail = server.faults.draw()
+                if delay:
+                    time.sleep(delay)
+                url = urlsplit(self.path)
+                if fail:
+                    status, html = 503, page("Service Unavailable", "<p>Try again later.</p>")
+                elif not server.serves(url.path):
+                    status, html = 404, page("Not found", "")
+                else:
+                    status, html = server.site.route(url.path, parse_qs(url.query))
+                with server._stats_lock:
+                    server.stats["requests"] += 1
+                    server.stats["failed"] += fail
+                body = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self._httpd.server_address[1]}"
+        if section != "recruiting":
+            site.base_url = self.base_url
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def serves(self, path: str) -> bool:
+        if self.section == "all":
+            return True
+        return path.startswith(RECRUITING_PREFIX) == (self.section == "recruiting")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,97 @@
+"""
+Record trimmed real pages as parser fixtures.
+
+The benchmark's fixture server builds its pages by hand. To keep them honest,
+pages captured from the live sites are checked in under benchmarks/recorded/
+and the tests parse both with the scraper's offline parsers. Run a real
+analysis with page snapshots on, then export the newest snapshot of each kind:
+
+    SNAPSHOT_PAGES=1 python TournamentPlayersV9.py --job <overview url> "Boys 14s"
+    python benchmarks/record_fixtures.py
+
+Each page is trimmed (scripts, styles, inline SVG, comments and unused
+attributes removed) and the player's name, location and district are
+replaced with placeholders. A page is only written when the trimmed,
+redacted copy still parses to the same values as the redacted original.
+Next to <kind>.html goes <kind>.json with the URL, the snapshot metadata and
+those values, which the tests compare against.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import lxml.html
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recorded")
+
+# Elements the parsers never read; none of them are positional XPath steps
+DROP_TAGS = ("script", "style", "noscript", "svg", "link", "meta", "iframe", "template")
+KEEP_ATTRIBUTES = {"id", "class", "href", "src", "role"}
+# Parsed fields holding personal details, and what replaces them in the page
+REDACT_FIELDS = {"name": "Jordan Sample", "location": "Springfield, ST", "district": "Sample District"}
+
+
+def redact(html: str, parsed: dict) -> str:
+    for field, placeholder in REDACT_FIELDS.items():
+        value = parsed.get(field)
+        if isinstance(value, str) and value.strip():
+            html = html.replace(value.strip(), placeholder)
+    return html
+
+
+def trim(html: str) -> str:
+    doc = lxml.html.fromstring(html)
+    for element in doc.xpath("|".join(f"//{tag}" for tag in DROP_TAGS) + "|//comment()"):
+        element.drop_tree()
+    for element in doc.iter():
+        if isinstance(element.tag, str):
+            for attribute in set(element.attrib) - KEEP_ATTRIBUTES:
+                del element.attrib[attribute]
+    return lxml.html.tostring(doc, encoding="unicode", doctype="<!DOCTYPE html>")
+
+
+def record(app, kind: str, out_dir: str):
+    """Export the newest snapshot of a kind; returns the written path or None."""
+    store = app.get_snapshot_store()
+    rows = sorted(store.latest(kind), key=lambda row: row[4], reverse=True)
+    if not rows:
+        print(f"{kind}: no snapshots (run an analysis with SNAPSHOT_PAGES=1 first)")
+        return None
+    _, digest, url, meta, _ = rows[0]
+    parse = app.SNAPSHOT_PARSERS[kind]
+    original = store.read(digest)
+    redacted = redact(original, parse(lxml.html.fromstring(original), url, meta))
+    expected = parse(lxml.html.fromstring(redacted), url, meta)
+    trimmed = trim(redacted)
+    if parse(lxml.html.fromstring(trimmed), url, meta) != expected:
+        print(f"{kind}: trimming changed what the parser reads; not recorded")
+        return None
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{kind}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(trimmed)
+    with open(os.path.join(out_dir, f"{kind}.json"), "w", encoding="utf-8") as f:
+        json.dump({"url": url, "meta": meta, "expected": expected}, f, indent=2, sort_keys=True)
+    print(f"{kind}: {len(original):,} -> {len(trimmed):,} bytes, written to {path}")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export trimmed page snapshots as parser fixtures.")
+    parser.add_argument("--out", default=RECORDED_DIR, help="Fixture directory (default: benchmarks/recorded)")
+    parser.add_argument("--kinds", nargs="+", help="Snapshot kinds to export (default: every parsed kind)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, REPO_ROOT)
+    import TournamentPlayersV9 as app
+
+    kinds = args.kinds or list(app.SNAPSHOT_PARSERS)
+    written = [record(app, kind, args.out) for kind in kinds]
+    return 0 if all(written) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Offline scraping benchmark.
+
+Starts the fixture server, points TournamentPlayersV9 at it and runs the
+full pipeline (tournament level, draw size, every entrant, PDF) once per
+draw size, each in a fresh process with an empty cache:
+
+    python benchmarks/run_benchmarks.py --sizes 32 128 512 --latency-ms 80 --failure-rate 0.02
+
+Reports wall time, players/min, p50/p95 per-player latency (from the
+workers' player spans with --workers > 1), peak RSS of the run (Python plus
+Chromium) and browser launches.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import psutil
+
+from fixture_server import FaultInjector, FixtureServer, FixtureSite
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_PREFIX = "BENCH_RESULT "
+RSS_SAMPLE_INTERVAL = 0.2
+
+
+class PeakRss:
+    """Samples the RSS of this process and its descendants on a thread."""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self):
+        process = psutil.Process()
+        total = 0
+        for proc in [process] + process.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak = max(self.peak, total)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self.sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def percentile(values: list, fraction: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+async def run_pipeline(app, url: str, age_group: str, output_dir: str, workers: int, latencies: list):
+    """One end-to-end analysis, as run_job does it. Returns (players, pdf path)."""
+    app.reset_run_stats()
+    level_info = await app.age_groups_level(url)
+    if not level_info:
+        raise RuntimeError(f"Could not read tournament level: {url}")
+    draw_size, sort_type = await app.scrape_draw_size(url.replace("overview", "events"), age_group)
+    pdf = await app.scrape_tournament_data(
+        url, age_group, draw_size, sort_type or 1, level_info[0], output_dir=output_dir, workers=workers,
+    )
+    if workers > 1:
+        # Sharded players are scraped in worker processes; their spans are merged into this tracer
+        latencies.extend(record["duration"] for record in app.tracer.spans
+                         if record["name"] == "player" and record["pid"] != os.getpid())
+    return len(latencies), pdf
+
+
+def run_one(args):
+    """Child process: run the pipeline for one size and print its measurements."""
+    sys.path.insert(0, REPO_ROOT)
+    import TournamentPlayersV9 as app
+
+    # Time every player scrape in this process; with --workers > 1 they come
+    # from the workers' "player" spans instead (see run_pipeline)
+    latencies = []
+    scrape_player = app.scrape_player
+
+    async def timed_scrape_player(*a, **kw):
+        start = time.perf_counter()
+        try:
+            return await scrape_player(*a, **kw)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    app.scrape_player = timed_scrape_player
+
+    results = []
+    loop = asyncio.get_event_loop()
+    for run in range(args.passes):
+        latencies.clear()
+        with PeakRss() as rss:
+            start = time.perf_counter()
+            scraped, pdf = loop.run_until_complete(
+                run_pipeline(app, args.url, args.age_group, args.output_dir, args.workers, latencies)
+            )
+            wall = time.perf_counter() - start
+        pool = app.get_browser_pool()
+        results.append({
+            "size": args.run_one,
+            "pass": run + 1,
+            "wall_s": round(wall, 2),
+            "scraped": scraped,
+            "players_per_min": round(args.run_one / wall * 60, 1),
+            "p50_s": percentile(latencies, 0.50),
+            "p95_s": percentile(latencies, 0.95),
+            "peak_rss_mb": round(rss.peak / 2 ** 20, 1),
+            "browser_launches": pool.launches,
+            "contexts_created": pool.contexts_created,
+            "pdf": pdf,
+            "stages": app.tracer.stats(),
+        })
+        if args.trace_dir:
+            app.tracer.export(os.path.join(args.trace_dir, f"trace-{args.run_one}-pass{run + 1}.json"))
+    loop.run_until_complete(app.close_browser_pool())
+    for result in results:
+        print(RESULT_PREFIX + json.dumps(result), flush=True)
+    return 0
+
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def print_table(results: list):
+    header = ["size", "pass", "wall", "players/min", "p50", "p95", "peak RSS", "launches"]
+    rows = [[
+        str(r["size"]), str(r["pass"]), format_seconds(r["wall_s"]), f"{r['players_per_min']:.1f}",
+        format_seconds(r["p50_s"]), format_seconds(r["p95_s"]), f"{r['peak_rss_mb']:.0f} MB",
+        str(r["browser_launches"]),
+    ] for r in results]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local fixture server.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 128, 512], help="Draw sizes to run")
+    parser.add_argument("--age-group", default="Boys 14s")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Added to every response (default: 50)")
+    parser.add_argument("--jitter-ms", type=float, default=25, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of responses that are HTTP 503")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="Share of responses delayed by --stall-ms")
+    parser.add_argument("--stall-ms", type=float, default=15000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=1, help="SCRAPE_WORKERS for the pipeline")
+    parser.add_argument("--passes", type=int, default=1, help="Runs per size; later passes measure a warm cache")
+    parser.add_argument("--json", help="Also write the results (with per-stage timings) to this file")
+    parser.add_argument("--trace-dir", help="Write a Chrome trace per size and pass to this directory")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    parser.add_argument("--run-one", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one:
+        return run_one(args)
+
+    site = FixtureSite(args.sizes, args.age_group, args.seed)
+    faults = FaultInjector(args.latency_ms, args.jitter_ms, args.failure_rate, args.stall_rate,
+                           args.stall_ms, args.seed)
+    results = []
+    # USTA and tennisrecruiting on separate ports, so each gets its own host limits
+    with FixtureServer(site, faults, section="usta") as server, \
+            FixtureServer(site, faults, section="recruiting") as recruiting_server, \
+            tempfile.TemporaryDirectory() as scratch:
+        for size in site.sizes:
+            work_dir = os.path.join(scratch, str(size))
+            env = dict(
+                os.environ,
+                USTA_BASE_URL=server.base_url,
+                RECRUITING_BASE_URL=recruiting_server.base_url + "/recruiting",
+                TOURNAMENT_CACHE_DIR=os.path.join(work_dir, "cache"),
+                TOURNAMENT_REPORT_DIR=os.path.join(work_dir, "reports"),
+            )
+            os.makedirs(env["TOURNAMENT_REPORT_DIR"])
+            command = [
+                sys.executable, os.path.abspath(__file__), "--run-one", str(size),
+                "--url", site.tournament_url(size), "--age-group", args.age_group,
+                "--output-dir", env["TOURNAMENT_REPORT_DIR"],
+                "--workers", str(args.workers), "--passes", str(args.passes),
+            ]
+            if args.trace_dir:
+                os.makedirs(args.trace_dir, exist_ok=True)
+                command += ["--trace-dir", os.path.abspath(args.trace_dir)]
+            print(f"Running draw size {size}...", flush=True)
+            child = subprocess.run(command, env=env, capture_output=True, text=True)
+            if args.verbose or child.returncode:
+                sys.stdout.write(child.stdout)
+                sys.stderr.write(child.stderr)
+            if child.returncode:
+                print(f"Draw size {size} failed with exit code {child.returncode}")
+                continue
+            for line in child.stdout.splitlines():
+                if line.startswith(RESULT_PREFIX):
+                    results.append(json.loads(line[len(RESULT_PREFIX):]))
+
+        for label, fixture in (("USTA", server), ("recruiting", recruiting_server)):
+            print(f"Fixture server ({label}): {fixture.stats['requests']} requests, {fixture.stats['failed']} failed")
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": {k: v for k, v in vars(args).items() if k not in ("run_one", "url", "output_dir")},
+                       "results": results}, f, indent=2)
+    return 0 if len(results) == len(site.sizes) * args.passes else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
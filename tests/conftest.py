@@ -0,0 +1,27 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "TournamentPlayersV9.py")
+
+
+@pytest.fixture
+def load_app(tmp_path, monkeypatch):
+    """Execute the app script as a fresh module, the way each Streamlit rerun does."""
+    monkeypatch.setenv("TOURNAMENT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("TOURNAMENT_REPORT_DIR", str(tmp_path / "reports"))
+    monkeypatch.setenv("PREWARM_BROWSER", "0")
+    loaded = []
+
+    def load(name: str = "tournament_app"):
+        spec = importlib.util.spec_from_file_location(f"{name}_{len(loaded)}", APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        loaded.append(module)
+        return module
+
+    yield load
+    for module in loaded:
+        sys.modules.pop(module.__name__, None)
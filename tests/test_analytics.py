@@ -0,0 +1,16 @@
+def test_utr_summary_keeps_the_baseline_wording(load_app, tmp_path):
+    app = load_app()
+    utrs = ["12.xx", "12.xx", "9.xx", "0.xx", "0.xx", "?"]
+    table = app.PlayerTable.from_players([
+        {**app.UNKNOWN_PLAYER, "Name": f"p{i}", "Profile": f"/profile/{i}", "UTR": utr} for i, utr in enumerate(utrs)
+    ])
+    ranking = app.rank_field(table, "Level 6", 1, 8)
+    store = app.AnalyticsStore(str(tmp_path / "analytics"))
+    field_id = store.record("key", "https://example.test/t/1", "Open", "Boys' 16", "Level 6", 8, table, ranking)
+
+    utr_lines = [line for line in app.field_summary(store, field_id) if "UTR" in line]
+    assert utr_lines == [
+        " - There are <b>3</b> UTRs rated <b>0.xx</b> in this tournament (<b>50.0%</b>).",
+        " - There is <b>1</b> UTR rated <b>9.xx</b> in this tournament (<b>16.67%</b>).",
+        " - There are <b>2</b> UTRs rated <b>12.xx</b> in this tournament (<b>33.33%</b>).",
+    ]
@@ -0,0 +1,39 @@
+def entrants(*people):
+    return [{"profile": f"https://example.test/p/{name.lower()}", "name": name} for name in people]
+
+
+def profile(name):
+    return f"https://example.test/p/{name.lower()}"
+
+
+def test_first_run_has_nothing_to_diff(load_app):
+    history = load_app().EntrantHistory(":memory:")
+    changes = history.diff("job", entrants("Ann", "Bea"))
+    assert changes.since is None
+    assert changes.describe() == "First analysis of this event."
+
+
+def test_diff_reports_added_withdrawn_and_cutoff_moves(load_app):
+    history = load_app().EntrantHistory(":memory:")
+    history.diff("job", entrants("Ann", "Bea", "Cat"))
+    history.save("job", entrants("Ann", "Bea", "Cat"), [profile("Ann"), profile("Bea")])
+
+    # Cat withdraws, Dee enters; Ann and Bea are unchanged but Dee takes Bea's spot
+    field = entrants("Ann", "Bea", "Dee")
+    changes = history.diff("job", field)
+    assert (changes.added, changes.withdrawn) == (["Dee"], ["Cat"])
+    history.cutoff_changes("job", [profile("Ann"), profile("Dee")], {p["profile"]: p["name"] for p in field})
+    assert (changes.entered_cutoff, changes.left_cutoff) == (["Dee"], ["Bea"])
+
+
+def test_unsaved_run_is_not_the_next_baseline(load_app):
+    history = load_app().EntrantHistory(":memory:")
+    history.save("job", entrants("Ann"), [profile("Ann")])
+
+    # A run that fails before its report only computes changes
+    history.diff("job", entrants("Ann", "Bea"))
+    history.cutoff_changes("job", [profile("Bea")])
+
+    changes = history.diff("job", entrants("Ann", "Bea"))
+    assert changes.added == ["Bea"]
+    assert history.previous("job")["selected"] == [profile("Ann")]
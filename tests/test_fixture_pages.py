@@ -0,0 +1,87 @@
+import glob
+import json
+import os
+
+import pytest
+
+lxml_html = pytest.importorskip("lxml.html")
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+RECORDED = sorted(glob.glob(os.path.join(BENCHMARKS_DIR, "recorded", "*.html")))
+
+
+@pytest.fixture
+def benchmarks(monkeypatch):
+    monkeypatch.syspath_prepend(BENCHMARKS_DIR)
+    import fixture_server
+    import record_fixtures
+
+    return fixture_server, record_fixtures
+
+
+def synthetic_pages(fixture_server):
+    site = fixture_server.FixtureSite([32], "Boys 14s")
+    player = site.players[0]
+    return player, {
+        "usta_profile": (site.profile(player), {}),
+        "usta_rankings": (site.rankings(player), {"age_group": "Boys 14s"}),
+        "recruiting_profile": (site.recruiting_player(player), {}),
+        "usta_event": (site.event(32, 0), {}),
+    }
+
+
+def parse(app, kind, html, meta, url="https://example.test/recruiting/player.asp?id=1"):
+    return app.SNAPSHOT_PARSERS[kind](lxml_html.fromstring(html), url, meta)
+
+
+def test_synthetic_pages_parse_like_real_ones(load_app, benchmarks):
+    app = load_app()
+    player, pages = synthetic_pages(benchmarks[0])
+    profile = parse(app, "usta_profile", *pages["usta_profile"])
+    assert (profile["name"], profile["location"].strip(), profile["district"], profile["wtn"]) == (
+        player.name, player.city, player.district, player.wtn)
+    rankings = parse(app, "usta_rankings", *pages["usta_rankings"])
+    assert (rankings["points"], rankings["rank"]) == (player.points, player.rank)
+    recruiting = parse(app, "recruiting_profile", *pages["recruiting_profile"])
+    assert (recruiting["UTR"], recruiting["Class"]) == (player.utr, player.grade)
+    assert parse(app, "usta_event", *pages["usta_event"]) == {"draw_size": 32, "sort_type": 2, "selection": "WTN"}
+
+
+@pytest.mark.skipif(not RECORDED, reason="no real pages recorded yet (see benchmarks/record_fixtures.py)")
+@pytest.mark.parametrize("path", RECORDED, ids=os.path.basename)
+def test_recorded_pages_still_parse(load_app, benchmarks, path):
+    app = load_app()
+    kind = os.path.basename(path)[:-len(".html")]
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    with open(path[:-len(".html")] + ".json", encoding="utf-8") as f:
+        recorded = json.load(f)
+    assert parse(app, kind, html, recorded["meta"], recorded["url"]) == recorded["expected"]
+
+    # Every field the real page yields, the synthetic one must yield too
+    _, pages = synthetic_pages(benchmarks[0])
+    synthetic = parse(app, kind, *pages[kind])
+    for key, value in recorded["expected"].items():
+        if value is not None and key not in ("profile", "status"):
+            assert synthetic[key] is not None, f"synthetic {kind} page lacks {key}"
+
+
+def test_recording_trims_and_redacts_snapshots(load_app, benchmarks, tmp_path):
+    app = load_app()
+    fixture_server, record_fixtures = benchmarks
+    player, pages = synthetic_pages(fixture_server)
+    html = pages["usta_profile"][0].replace("<head>", "<head><script>track()</script><style>p{}</style>")
+    app.get_snapshot_store().put("usta_profile", "https://example.test/profile?uaid=1", html,
+                                 "https://example.test/profile?uaid=1")
+
+    path = record_fixtures.record(app, "usta_profile", str(tmp_path))
+
+    with open(path, encoding="utf-8") as f:
+        trimmed = f.read()
+    assert "<script" not in trimmed and "<style" not in trimmed
+    assert player.name not in trimmed and player.city not in trimmed
+    with open(tmp_path / "usta_profile.json", encoding="utf-8") as f:
+        expected = json.load(f)["expected"]
+    assert expected["name"] == record_fixtures.REDACT_FIELDS["name"]
+    assert expected["wtn"] == player.wtn
+    assert parse(app, "usta_profile", trimmed, {}) == expected
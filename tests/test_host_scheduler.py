@@ -0,0 +1,39 @@
+import asyncio
+
+
+def test_retried_timeouts_are_counted(load_app, monkeypatch):
+    app = load_app()
+    monkeypatch.setattr(app, "backoff_delay", lambda attempt: 0)
+    outcomes = [app.PlaywrightTimeoutError("slow"), app.PlaywrightTimeoutError("slow"), None]
+
+    async def goto(url, **kwargs):
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+        return None
+
+    app.tracer.reset()
+    asyncio.new_event_loop().run_until_complete(app.host_scheduler.navigate(goto, "https://example.test/page"))
+
+    (row,) = app.tracer.stats()
+    assert row["stage"] == "goto"
+    assert (row["count"], row["retries"], row["timeouts"], row["errors"]) == (3, 2, 2, 0)
+    assert "3 spans" in app.tracer.summary() and "2 timeouts" in app.tracer.summary()
+
+
+def test_retried_errors_are_counted(load_app, monkeypatch):
+    app = load_app()
+    monkeypatch.setattr(app, "backoff_delay", lambda attempt: 0)
+    outcomes = [app.PlaywrightError("net::ERR_CONNECTION_RESET"), None]
+
+    async def goto(url, **kwargs):
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+        return None
+
+    app.tracer.reset()
+    asyncio.new_event_loop().run_until_complete(app.host_scheduler.navigate(goto, "https://example.test/page"))
+
+    (row,) = app.tracer.stats()
+    assert (row["count"], row["timeouts"], row["errors"]) == (2, 0, 1)
@@ -0,0 +1,42 @@
+def test_partial_journal_resumes_with_recorded_players(load_app, tmp_path):
+    app = load_app()
+    path = str(tmp_path / "jobs.sqlite3")
+    journal = app.JobJournal(path)
+    key, done = journal.start("https://example.test/t/1", "Boys' 16", 3)
+    assert done == {}
+    journal.record(key, "p1", {"Name": "One"})
+    journal.record(key, "p2", {"Name": "Two"})
+
+    # A new process picks up where the interrupted run stopped
+    resumed = app.JobJournal(path)
+    [job] = resumed.list_incomplete()
+    assert (job["key"], job["done"], job["total"]) == (key, 2, 3)
+    assert resumed.start("https://example.test/t/1", "Boys' 16", 3) == (key, {"p1": {"Name": "One"}, "p2": {"Name": "Two"}})
+
+
+def test_force_refresh_and_completed_jobs_start_over(load_app, tmp_path):
+    app = load_app()
+    journal = app.JobJournal(str(tmp_path / "jobs.sqlite3"))
+    key, _ = journal.start("https://example.test/t/1", "Boys' 16", 2)
+    journal.record(key, "p1", {"Name": "One"})
+
+    assert journal.start("https://example.test/t/1", "Boys' 16", 2, fresh=True) == (key, {})
+    journal.record(key, "p1", {"Name": "One"})
+    journal.complete(key)
+    assert journal.list_incomplete() == []
+    assert journal.start("https://example.test/t/1", "Boys' 16", 2) == (key, {})
+
+
+def test_journal_from_before_idx_was_dropped_starts_over(load_app, tmp_path):
+    app = load_app()
+    path = str(tmp_path / "jobs.sqlite3")
+    old = app.sqlite3.connect(path)
+    old.execute("CREATE TABLE job_results (job_key TEXT, profile TEXT, idx INTEGER, result TEXT, recorded_at REAL)")
+    old.execute("INSERT INTO job_results VALUES ('k', 'p1', 0, '{}', 0)")
+    old.commit()
+    old.close()
+
+    journal = app.JobJournal(path)
+    key, _ = journal.start("https://example.test/t/1", "Boys' 16", 1)
+    journal.record(key, "p1", {"Name": "One"})
+    assert journal.start("https://example.test/t/1", "Boys' 16", 1)[1] == {"p1": {"Name": "One"}}
@@ -0,0 +1,42 @@
+import asyncio
+
+
+def test_reruns_share_the_managers_browser_pool(load_app):
+    first = load_app()
+    leased = []
+
+    async def fetch_tournament_info(url):
+        leased.append(first.get_browser_pool())
+        return first.TournamentInfo(url, "Open", "Level 5", ["Boys' 16"], fetched_at=first.time.time())
+
+    first.fetch_tournament_info = fetch_tournament_info
+    manager = first.JobManager(workers=1)
+    try:
+        # Each rerun executes the script again, with its own globals, but reuses the cached manager
+        for link in ("https://example.test/a/overview", "https://example.test/b/overview"):
+            rerun = load_app()
+            assert manager.age_groups(link, timeout=10) == ["Level 5", False, ["Boys' 16"]]
+            assert rerun._browser_pool is None
+        assert len(leased) == 2
+        assert leased[0] is leased[1]
+        assert leased[0]._loop is manager._loop
+    finally:
+        manager._loop.call_soon_threadsafe(manager._loop.stop)
+
+
+def test_replaced_pool_is_closed(load_app):
+    app = load_app()
+    old_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(old_loop)
+    old = app.get_browser_pool()
+
+    new_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(new_loop)
+    try:
+        new = app.get_browser_pool()
+        assert new is not old
+        assert old._closed
+    finally:
+        asyncio.set_event_loop(None)
+        old_loop.close()
+        new_loop.close()
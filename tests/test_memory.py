@@ -0,0 +1,30 @@
+import os
+
+
+class FakeProcess:
+    def __init__(self, marker):
+        self.marker = marker
+        self.killed = False
+
+    def children(self, recursive=False):
+        return []
+
+    def kill(self):
+        self.killed = True
+
+
+def test_own_and_orphaned_browser_kills_are_counted_apart(load_app, monkeypatch):
+    app = load_app()
+    own = FakeProcess(f"{os.getpid()}.1.1")
+    orphan = FakeProcess("999999999.1.1")
+    live = FakeProcess(f"{os.getppid()}.1.1")
+    monkeypatch.setattr(app.psutil, "process_iter", lambda: [own, orphan, live])
+    monkeypatch.setattr(app.psutil, "pid_exists", lambda pid: pid != 999999999)
+    monkeypatch.setattr(app.psutil, "wait_procs", lambda procs, timeout=None: (procs, []))
+    monkeypatch.setattr(app, "browser_owner_marker", lambda proc: proc.marker)
+    governor = app.MemoryGovernor(ceiling_mb=1024)
+
+    assert governor.kill_orphans() == 1
+    assert (orphan.killed, own.killed, live.killed) == (True, False, False)
+    assert governor.kill_orphans(include_own=True) == 2
+    assert (governor.stats["orphans_killed"], governor.stats["own_killed"]) == (2, 1)
@@ -0,0 +1,76 @@
+import asyncio
+
+PROFILE = "https://example.test/profile?uaid=1"
+PLAYER = {
+    "Name": "Jane Doe", "Location": "Austin, TX", "District": "Texas", "WTN": "12.50", "Points": "300",
+    "Ranking": "42", "Recruiting": "4 Star", "Class": "Junior", "UTR": "9.xx",
+}
+
+
+def test_fresh_stale_and_missing_fields(load_app):
+    app = load_app()
+    cache = app.PlayerCache(":memory:")
+    now = 1_000_000.0
+    cache.put(PROFILE, PLAYER, now=now)
+
+    fresh, stale = cache.lookup(PROFILE, now=now + app.HOUR)
+    assert fresh == PLAYER and stale == set()
+
+    # WTN, points and ranking expire after three days; the rest later
+    fresh, stale = cache.lookup(PROFILE, now=now + 4 * app.DAY)
+    assert stale == {"WTN", "Points", "Ranking"}
+    assert set(fresh) == set(PLAYER) - stale
+
+    fresh, stale = cache.lookup("https://example.test/profile?uaid=2", now=now)
+    assert fresh == {} and stale == set(app.PLAYER_FIELD_TTLS)
+
+
+def test_get_counts_hits_misses_and_stale(load_app):
+    app = load_app()
+    cache = app.PlayerCache(":memory:")
+    cache.put(PROFILE, PLAYER)
+    cache.put("https://example.test/profile?uaid=2", PLAYER, now=0.0)
+
+    assert cache.get(PROFILE) == {"Profile": PROFILE, **PLAYER}
+    assert cache.get("https://example.test/profile?uaid=2") is None
+    assert cache.get("https://example.test/profile?uaid=3") is None
+    assert cache.stats == {"hits": 1, "misses": 1, "stale": 1, "writes": 2}
+
+
+def test_transient_fields_expire_early(load_app):
+    app = load_app()
+    cache = app.PlayerCache(":memory:")
+    cache.put(PROFILE, {**PLAYER, "Recruiting": "Unavailable"}, now=0.0, transient={"Recruiting"})
+
+    _, stale = cache.lookup(PROFILE, now=app.PLAYER_PLACEHOLDER_TTL + 1)
+    assert stale == {"Recruiting"}
+
+
+def test_partial_rescrape_only_refreshes_stale_fields(load_app, monkeypatch):
+    app = load_app()
+    cache = app.get_player_cache()
+    written_at = app.time.time() - 4 * app.DAY
+    cache.put(PROFILE, PLAYER, now=written_at)
+    scraped = []
+
+    async def scrape_usta(player_link, age_group, max_retries=2):
+        scraped.append("usta")
+        status = {key: app.FIELD_OK for key in app.USTA_FIELD_STATUS.values()}
+        return ["Jane Doe", "Austin, TX", "Texas", "11.75", "450", "30"], status
+
+    async def lookup(name, location=None, force_refresh=False):
+        scraped.append("recruiting")
+        return dict(app.RECRUITING_NOT_FOUND)
+
+    monkeypatch.setattr(app, "scrape_usta", scrape_usta)
+    monkeypatch.setattr(app.get_recruiting_index(), "lookup", lookup)
+
+    player = asyncio.new_event_loop().run_until_complete(app.scrape_player(PROFILE, "Boys' 16", name="Doe, Jane"))
+
+    # The stale USTA fields were rescraped; the fresh recruiting fields were kept
+    assert scraped == ["usta"]
+    assert (player["WTN"], player["Points"], player["Ranking"]) == ("11.75", "450", "30")
+    assert (player["Recruiting"], player["UTR"]) == ("4 Star", "9.xx")
+    entries = cache.entries(PROFILE)
+    assert entries["WTN"][1] > written_at
+    assert entries["Recruiting"] == ("4 Star", written_at)
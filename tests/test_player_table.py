@@ -0,0 +1,35 @@
+import asyncio
+
+
+def test_failed_scrape_keeps_the_entrant_name(load_app, monkeypatch):
+    app = load_app()
+
+    async def scrape_usta(player_link, age_group, max_retries=2):
+        await asyncio.sleep(0)
+        raise RuntimeError("profile page crashed")
+
+    async def lookup(name, location=None, force_refresh=False):
+        return dict(app.RECRUITING_NOT_FOUND)
+
+    monkeypatch.setattr(app, "scrape_usta", scrape_usta)
+    monkeypatch.setattr(app.get_recruiting_index(), "lookup", lookup)
+
+    player = asyncio.new_event_loop().run_until_complete(
+        app.scrape_player("/profile/1", "Boys' 16", name="Doe, Jane", check_cache=False)
+    )
+
+    assert player["Name"] == "Doe, Jane" and player["Profile"] == "/profile/1" and player["Failed"]
+    assert app.get_player_cache().peek("/profile/1") == {}
+
+
+def test_failed_players_are_flagged_in_report_rows(load_app):
+    app = load_app()
+    players = [
+        {**app.UNKNOWN_PLAYER, "Name": "Roe, Ann", "Profile": "/profile/2", "WTN": "12.50", "Points": "300"},
+        app.failed_player("Doe, Jane", "/profile/1"),
+    ]
+    table = app.PlayerTable.from_players(players)
+    rows = app.build_report_rows(table, app.rank_field(table, "Level 6", 1, 32))
+
+    assert [(row["Name"], row["Failed"]) for row in rows] == [("Roe, Ann", False), ("Doe, Jane", True)]
+    assert app.export_values(rows[1])["Failed"] is True
@@ -0,0 +1,70 @@
+def make_table(app, players):
+    """A PlayerTable from (name, wtn, points) tuples, in entry order."""
+    return app.PlayerTable.from_players([
+        {**app.UNKNOWN_PLAYER, "Name": name, "Profile": f"/profile/{name}", "WTN": wtn, "Points": points}
+        for name, wtn, points in players
+    ])
+
+
+def ordered_names(table, ranking):
+    return [table.name[row] for row in ranking.order.tolist()]
+
+
+def test_level_7_keeps_the_baseline_sort_directions(load_app):
+    app = load_app()
+    table = make_table(app, [("a", "20.00", "100"), ("b", "10.00", "300"), ("c", "40.00", "200")])
+
+    # Level 7 "points" runs lowest first and "WTN" highest first, as the original script did
+    points = app.rank_field(table, "Level 7", 1, 8)
+    assert (points.sort_type, ordered_names(table, points)) == ("points", ["a", "c", "b"])
+    wtn = app.rank_field(table, "Level 7", 2, 8)
+    assert (wtn.sort_type, ordered_names(table, wtn)) == ("wtn", ["c", "a", "b"])
+
+
+def test_level_6_and_other_levels(load_app):
+    app = load_app()
+    table = make_table(app, [("a", "20.00", "100"), ("b", "10.00", "300"), ("c", "15.00", "200")])
+
+    assert ordered_names(table, app.rank_field(table, "Level 6", 1, 8)) == ["b", "c", "a"]
+    assert ordered_names(table, app.rank_field(table, "Level 6", 2, 8)) == ["b", "c", "a"]
+    mixed = app.rank_field(table, "Level 4", 2, 8)
+    assert (mixed.sort_type, ordered_names(table, mixed)) == ("mixed", ["b", "c", "a"])
+    # No published order and none chosen: entry order
+    kept = app.rank_field(table, "Level 6", None, 8)
+    assert (kept.sort_type, ordered_names(table, kept)) == ("", ["a", "b", "c"])
+
+
+def test_ties_keep_entry_order(load_app):
+    app = load_app()
+    table = make_table(app, [("a", "12.00", "300"), ("b", "11.00", "200"), ("c", "12.00", "200"),
+                             ("d", "13.00", "200")])
+
+    assert ordered_names(table, app.rank_field(table, "Level 6", 1, 8)) == ["a", "b", "c", "d"]
+    ranking = app.rank_field(table, "Level 6", 1, 4)
+    # Two seeds in a draw of four: b, then a over c on equal WTN because a is selected first
+    assert ranking.seeds.tolist() == [2, 1, 0, 0]
+    assert ordered_names(table, app.rank_field(table, "Level 6", 2, 8)) == ["b", "a", "c", "d"]
+
+
+def test_missing_wtn_sorts_as_40_and_is_never_seeded(load_app):
+    app = load_app()
+    table = make_table(app, [("a", "40.00", "0"), ("b", "9.00", "0"), ("c", "n/a", "0"), ("d", "15.00", "0")])
+
+    ranking = app.rank_field(table, "Level 6", 2, 4)
+    assert ordered_names(table, ranking) == ["b", "d", "a", "c"]
+    # A draw of four has two seeds; only players with a WTN can get them
+    assert ranking.seeds.tolist() == [1, 2, 0, 0]
+
+
+def test_cutoff_and_seeds_follow_the_draw(load_app):
+    app = load_app()
+    players = [(f"p{i}", f"{30 - i}.00", str(1000 - i)) for i in range(10)]
+    table = make_table(app, players)
+
+    ranking = app.rank_field(table, "Level 6", 1, 6)
+    assert ranking.cutoff == 6
+    # Seeds only go to players inside the draw, best (lowest) WTN first
+    assert ranking.seeds.tolist() == [0, 0, 0, 0, 2, 1, 0, 0, 0, 0]
+    assert [app.seed_count(n) for n in (1, 2, 3, 4, 7, 8, 16, 32)] == [0, 1, 1, 2, 2, 4, 8, 16]
+    # A draw larger than the field selects everyone
+    assert app.rank_field(table, "Level 6", 1, 64).cutoff == 10
@@ -0,0 +1,25 @@
+import pytest
+
+lxml_html = pytest.importorskip("lxml.html")
+
+
+def empty_state_matches(app, kind, html):
+    """Whether any of the page kind's XPath empty-state markers matches the document."""
+    doc = lxml_html.fromstring(html)
+    return any(doc.xpath(sel[len("xpath="):]) for sel in app.READINESS_SPECS[kind].get("absent", [])
+               if sel.startswith("xpath="))
+
+
+def test_empty_state_markers(load_app):
+    app = load_app()
+    assert empty_state_matches(app, "recruiting_search", "<html><body><p>No players matched your search.</p></body></html>")
+    assert empty_state_matches(app, "tournament_players", "<html><body><div><span>There are No Results</span></div></body></html>")
+    assert not empty_state_matches(
+        app, "tournament_players",
+        "<html><body><script>var label = 'no players';</script><table><tr><td>Doe, Jane</td></tr></table></body></html>",
+    )
+
+
+def test_every_absent_list_is_populated(load_app):
+    app = load_app()
+    assert all(spec["absent"] for spec in app.READINESS_SPECS.values() if "absent" in spec)
@@ -0,0 +1,47 @@
+import asyncio
+import contextlib
+
+
+class FlakySearchPage:
+    """Stands in for a page whose first search lands on an error page without a search box."""
+
+    def __init__(self, app):
+        self.app = app
+        self.fills = 0
+        self.keyboard = self
+
+    async def goto(self, url, **kwargs):
+        return None
+
+    async def fill(self, selector, value):
+        self.fills += 1
+        if self.fills == 1:
+            raise self.app.PlaywrightTimeoutError("Timeout 30000ms exceeded")
+
+    @contextlib.asynccontextmanager
+    async def expect_navigation(self, **kwargs):
+        yield
+
+    async def press(self, key):
+        return None
+
+    async def evaluate(self, script, *args):
+        return []
+
+
+def test_search_is_retried_when_the_form_never_loads(load_app, monkeypatch):
+    app = load_app()
+    monkeypatch.setattr(app, "backoff_delay", lambda attempt: 0)
+
+    async def wait_ready(page, kind, timeout=None):
+        return "absent"
+
+    monkeypatch.setattr(app, "wait_ready", wait_ready)
+    page = FlakySearchPage(app)
+    app.tracer.reset()
+
+    result = asyncio.new_event_loop().run_until_complete(app.scrape_recruiting("Doe, Jane", page))
+
+    assert result == {}
+    assert page.fills == 2
+    assert [span["tags"]["outcome"] for span in app.tracer.spans] == ["timeout", "absent"]
@@ -0,0 +1,12 @@
+def test_route_summary_labels_bytes_saved_as_an_estimate(load_app):
+    app = load_app()
+    stats = app.RouteStats()
+    stats.record("continue", "document")
+    stats.record("abort", "image")
+    stats.record("stub", "script")
+
+    assert stats.bytes_saved_estimate == app.ROUTE_ESTIMATED_BYTES["image"] + app.ROUTE_ESTIMATED_BYTES["script"]
+    assert stats.summary() == (
+        "2 of 3 requests saved (66.7%: 1 aborted, 1 stubbed), "
+        "~0.1 MB not downloaded (estimated from typical sizes per type)"
+    )
@@ -0,0 +1,35 @@
+import asyncio
+
+
+def test_memory_pressure_comes_from_the_governor(load_app, monkeypatch):
+    app = load_app()
+    governor = app.get_memory_governor()
+    usage = {"bytes": 0}
+    monkeypatch.setattr(governor, "sample", lambda force=False: usage["bytes"])
+    scheduler = app.AdaptiveScheduler(min_concurrency=1, max_concurrency=8, initial=4)
+
+    scheduler.observe(0.1, failed=False)
+    assert scheduler.concurrency == 4
+
+    usage["bytes"] = governor.ceiling
+    scheduler.observe(0.1, failed=False)
+    assert scheduler.concurrency == 2
+    assert scheduler.adjustments[-1][1:] == (4, 2, "memory")
+
+
+def test_initial_concurrency_is_configurable(load_app, monkeypatch):
+    monkeypatch.setenv("SCRAPE_INITIAL_CONCURRENCY", "2")
+    monkeypatch.setenv("SCRAPE_MAX_CONCURRENCY", "6")
+    app = load_app()
+    assert app.AdaptiveScheduler().concurrency == 2
+
+
+def test_run_keeps_input_order(load_app):
+    app = load_app()
+
+    async def worker(item):
+        await asyncio.sleep(0.01 * (5 - item))
+        return item * 10
+
+    results = asyncio.new_event_loop().run_until_complete(app.AdaptiveScheduler(initial=3).run(range(5), worker))
+    assert results == [0, 10, 20, 30, 40]
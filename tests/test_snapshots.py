@@ -0,0 +1,50 @@
+def test_snapshots_are_off_by_default(load_app, monkeypatch):
+    monkeypatch.delenv("SNAPSHOT_PAGES", raising=False)
+    assert load_app().SNAPSHOT_PAGES is False
+
+
+def profile_snapshot(app, wtn, location="Austin, TX"):
+    status = {key: app.FIELD_OK for key in ("name", "location", "district", "wtn")}
+    return {"name": "Jane Doe", "location": location, "district": "Texas", "wtn": wtn, "status": status}
+
+
+def test_reparse_only_overwrites_older_changed_fields(load_app):
+    app = load_app()
+    cache = app.get_player_cache()
+    link = "https://example.test/profile?uaid=1"
+    cache.put(link, {"Name": "Jane Doe", "Location": "Austin, TX", "District": "Texas", "WTN": "12.00"}, now=100.0)
+    cache.put(link, {"District": "Texas North"}, now=300.0)
+
+    parsed = {"usta_profile": {link: (profile_snapshot(app, 11.5), link, {}, 200.0)}}
+    counts = app.apply_reparsed(parsed)
+
+    entries = cache.entries(link)
+    assert counts["players"] == 1
+    # Changed and older than the snapshot: rewritten with the snapshot's time
+    assert entries["WTN"] == ("11.50", 200.0)
+    # Newer than the snapshot: kept
+    assert entries["District"] == ("Texas North", 300.0)
+    # Unchanged: keeps its own time
+    assert entries["Name"] == ("Jane Doe", 100.0)
+
+
+def test_reparse_joins_recruiting_pages_through_the_public_lookup(load_app):
+    app = load_app()
+    link = "https://example.test/profile?uaid=1"
+    recruiting_url = "https://example.test/recruiting/player.asp?id=1"
+    app.get_player_cache().put(link, {"Name": "Jane Doe", "Location": "Austin, TX"}, now=100.0)
+    index = app.get_recruiting_index()
+    index._store("jane doe", "austin tx", {"Recruiting": "4 Star", "UTR": "9.xx", "Class": "Junior",
+                                           "profile": recruiting_url})
+    assert index.cached("Doe, Jane", "Austin, TX")["profile"] == recruiting_url
+
+    parsed = {
+        "usta_profile": {link: (profile_snapshot(app, 12.0), link, {}, 200.0)},
+        "recruiting_profile": {recruiting_url: (
+            {"Recruiting": "5 Star", "UTR": "10.xx", "Class": "Junior", "profile": recruiting_url},
+            recruiting_url, {}, 250.0)},
+    }
+    counts = app.apply_reparsed(parsed)
+
+    assert counts["recruiting"] == 1
+    assert app.get_player_cache().entries(link)["Recruiting"] == ("5 Star", 250.0)
@@ -0,0 +1,18 @@
+import concurrent.futures
+import multiprocessing
+import pickle
+import sys
+
+
+def test_rerun_functions_reach_spawned_processes(load_app, monkeypatch):
+    app = load_app()
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.delitem(sys.modules, app.SPAWN_MODULE, raising=False)
+
+    # Like a Streamlit rerun, the module is not importable under its own name
+    target = app.spawnable(app.parse_snapshots)
+    assert target.__module__ == app.SPAWN_MODULE
+    pickle.dumps(target)
+
+    with concurrent.futures.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        assert pool.submit(target, "usta_profile", [], app.SNAPSHOT_DIR).result(timeout=60) == []
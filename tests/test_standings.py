@@ -0,0 +1,45 @@
+HEADER = {"cells": ["Rank", "Player Name", "City", "Section", "Points"], "href": None}
+
+
+def row(rank, name, city, points, href=None):
+    return {"cells": [str(rank), name, city, "Texas", str(points)], "href": href}
+
+
+def test_rows_key_on_uaid_and_name_with_city(load_app):
+    app = load_app()
+    table = app.parse_standings_rows({"rows": [
+        HEADER,
+        row(1, "Jane Doe", "Austin, TX", 900, href="/profile?uaid=111"),
+        row(2, "Jane Doe", "Dallas, TX", 800),
+    ]})
+    assert table == {
+        "uaid:111": (900, 1),
+        "name:jane doe|austin": (900, 1),
+        "name:jane doe|dallas": (800, 2),
+    }
+
+
+def test_rows_without_link_or_city_are_dropped(load_app):
+    app = load_app()
+    header = {"cells": ["Rank", "Player Name", "Points"], "href": None}
+    table = app.parse_standings_rows({"rows": [
+        header,
+        {"cells": ["1", "Jane Doe", "900"], "href": "/profile?uaid=111"},
+        {"cells": ["2", "John Roe", "800"], "href": None},
+    ]})
+    assert table == {"uaid:111": (900, 1)}
+
+
+def test_lookup_never_joins_on_a_bare_name(load_app):
+    app = load_app()
+    index = app.StandingsIndex(":memory:")
+    age_group = "Girls' 14"
+    index._tables[app.standings_list_key(age_group)] = app.parse_standings_rows({"rows": [
+        HEADER, row(1, "Jane Doe", "Austin, TX", 900), row(2, "Jane Doe", "Dallas, TX", 800),
+    ]})
+
+    assert index.lookup(age_group, "https://example.test/profile?uaid=9", "Jane Doe", "Dallas, TX") == (800, 2)
+    # Namesakes without a city to tell them apart fall back to their rankings tab
+    assert index.lookup(age_group, "https://example.test/profile?uaid=9", "Jane Doe") is None
+    assert index.lookup(age_group, "https://example.test/profile?uaid=9", "Jane Doe", "Unknown") is None
+    assert index.stats["joined"] == 1
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+from conftest import APP_PATH
+
+
+def test_chromium_flag_is_only_set_after_a_successful_install(load_app, monkeypatch, tmp_path):
+    app = load_app()
+    monkeypatch.setattr(app, "playwright_browsers_path", lambda: str(tmp_path / "browsers"))
+    exit_codes = [1, 0]
+    installs = []
+
+    def run(args, check=False):
+        installs.append(args)
+        return subprocess.CompletedProcess(args, exit_codes.pop(0))
+
+    monkeypatch.setattr(app.subprocess, "run", run)
+    monkeypatch.setenv(app.CHROMIUM_CHECKED_ENV, "")
+    try:
+        app.ensure_chromium()
+        assert not os.environ.get(app.CHROMIUM_CHECKED_ENV)
+        app.ensure_chromium()
+        assert os.environ.get(app.CHROMIUM_CHECKED_ENV) == "1"
+        assert len(installs) == 2
+    finally:
+        os.environ.pop(app.CHROMIUM_CHECKED_ENV, None)
+
+
+def test_heavy_modules_are_not_imported_at_startup(tmp_path):
+    script = (
+        "import importlib.util, sys\n"
+        f"spec = importlib.util.spec_from_file_location('tournament_app', {APP_PATH!r})\n"
+        "module = importlib.util.module_from_spec(spec)\n"
+        "spec.loader.exec_module(module)\n"
+        "print(','.join(name for name in ('playwright.async_api', 'numpy', 'streamlit', 'reportlab') "
+        "if name in sys.modules))\n"
+    )
+    env = dict(os.environ, TOURNAMENT_CACHE_DIR=str(tmp_path / "cache"), PREWARM_BROWSER="0")
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+    assert result.stdout.strip() == ""
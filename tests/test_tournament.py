@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+
+import pytest
+
+
+class FakePool:
+    def __init__(self, page):
+        self.page = page
+
+    @contextlib.asynccontextmanager
+    async def lease(self, *args, **kwargs):
+        yield self.page
+
+
+class FakePage:
+    url = "https://example.test/tournaments/1/players"
+
+    async def goto(self, url, **kwargs):
+        return None
+
+
+def run_entrants_step(app, monkeypatch, outcome):
+    async def get(link, force_refresh=False):
+        return app.TournamentInfo(link, "Open", "Level 6", ["Boys' 16"])
+
+    async def wait_ready(page, kind, timeout=None):
+        return outcome
+
+    async def extract_entrants(page, age_group=None):
+        raise AssertionError("an empty or unloaded list must not be read")
+
+    monkeypatch.setattr(app.get_tournament_directory(), "get", get)
+    monkeypatch.setattr(app, "get_browser_pool", lambda: FakePool(FakePage()))
+    monkeypatch.setattr(app, "wait_ready", wait_ready)
+    monkeypatch.setattr(app, "extract_entrants", extract_entrants)
+    return asyncio.new_event_loop().run_until_complete(
+        app.scrape_tournament_data("https://example.test/tournaments/1/overview", "Boys' 16", 32, None, "Level 6")
+    )
+
+
+def test_event_without_entrants_takes_the_empty_path(load_app, monkeypatch):
+    app = load_app()
+    assert run_entrants_step(app, monkeypatch, "absent") is None
+
+
+def test_players_list_timeout_raises(load_app, monkeypatch):
+    app = load_app()
+    with pytest.raises(app.PlaywrightTimeoutError):
+        run_entrants_step(app, monkeypatch, "timeout")
+
+
+class FakeLocator:
+    def __init__(self, texts):
+        self.texts = texts
+
+    async def inner_text(self, timeout=None):
+        assert timeout is not None, "field reads must not fall back to Playwright's 30s default"
+        return self.texts[0]
+
+    async def all_inner_texts(self):
+        return self.texts
+
+
+class FakeTournamentPage(FakePage):
+    TEXTS = {
+        "tournament_overview": {"name": ["Open"], "level": ["Level 6"], "headers": ["Events", "Boys' 16", "Boys' 18"]},
+        "tournament_events": {"headers": ["Events", "Boys' 16", "Boys' 18"]},
+        "tournament_event": {"details": ["Draw size", "32", "Format", "Singles", "Selection", "WTN"]},
+    }
+
+    def __init__(self):
+        self.kind = None
+
+    def locator(self, selector):
+        texts = self.TEXTS[self.kind]
+        if "xpath" in selector:
+            return FakeLocator(texts["name" if "h1" in selector else "level"])
+        return FakeLocator(texts["details" if "bodyXSmall" in selector else "headers"])
+
+
+def fetch_info(app, monkeypatch, outcomes, through_directory=False):
+    page = FakeTournamentPage()
+
+    async def wait_ready(page, kind, timeout=None):
+        page.kind = kind
+        return outcomes[kind].pop(0) if isinstance(outcomes[kind], list) else outcomes[kind]
+
+    async def extract_elements(page, selector, link_selector="a"):
+        return [{"href": "/events/16", "text": ""}, {"href": "/events/18", "text": ""}]
+
+    async def capture_snapshot(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(app, "get_browser_pool", lambda: FakePool(page))
+    monkeypatch.setattr(app, "wait_ready", wait_ready)
+    monkeypatch.setattr(app, "extract_elements", extract_elements)
+    monkeypatch.setattr(app, "capture_snapshot", capture_snapshot)
+    url = "https://example.test/tournaments/1/overview"
+    fetch = app.get_tournament_directory().get(url) if through_directory else app.fetch_tournament_info(url)
+    return asyncio.new_event_loop().run_until_complete(fetch)
+
+
+def test_event_page_without_details_is_unavailable(load_app, monkeypatch):
+    app = load_app()
+    info = fetch_info(app, monkeypatch, {
+        "tournament_overview": "ready", "tournament_events": "ready", "tournament_event": ["ready", "absent"],
+    })
+    boys_16, boys_18 = info.events["Boys' 16"], info.events["Boys' 18"]
+    assert (boys_16.available, boys_16.draw_size, boys_16.sort_type) == (True, 32, 2)
+    assert (boys_18.available, boys_18.draw_size) == (False, app.UNKNOWN_DRAW_SIZE)
+
+
+def test_timed_out_event_page_is_not_cached(load_app, monkeypatch):
+    app = load_app()
+    with pytest.raises(app.PlaywrightTimeoutError):
+        fetch_info(app, monkeypatch, {
+            "tournament_overview": "ready", "tournament_events": "ready", "tournament_event": "timeout",
+        }, through_directory=True)
+    assert app.get_tournament_directory().cached("https://example.test/tournaments/1/overview") is None